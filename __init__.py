@@ -9,54 +9,710 @@ bl_info = {
 }
 
 import bpy
+import hashlib
+import json
 import math
 import os
+import random
+import re
+import time
+from collections import OrderedDict
 import bpy.utils.previews
+from bpy.app.handlers import persistent
+import numpy as np
 
 # Import functions from external file
 from . import interpolation_functions
+from .curve_cache import curve_cache
+from .curve_kernel import (KEYFRAME_ARRAY_ATTRIBUTES, HANDLE_VECTOR, INTERPOLATION_LINEAR, BakeSettings,
+                           CurveBaker, float_curve_points)
+from .curve_drivers import DriverCurve, driver_segments, get_curve_lut
+from .node_compiler import T, UnsupportedExpression, shaped_expression
+from .curve_library import CurveLibrary
 INTERPOLATION_FUNCTIONS = interpolation_functions.INTERPOLATION_FUNCTIONS
 CATEGORIES = interpolation_functions.CATEGORIES
+safe_name = interpolation_functions.safe_name
 
-# Preview collection for icons
+# Category colors for visual distinction
+CATEGORY_ICONS = {
+    "SMOOTH & CLASSIC": 'COLORSET_01_VEC',
+    "ELASTIC & SPRINGY": 'COLORSET_03_VEC',
+    "BOUNCY & OVERSHOOT": 'COLORSET_02_VEC',
+    "EXPONENTIAL & POWER": 'COLORSET_06_VEC',
+    "RHYTHMIC & WAVES": 'COLORSET_04_VEC',
+    "ORGANIC & NATURAL": 'COLORSET_14_VEC',
+    "GLITCHY & DIGITAL": 'COLORSET_09_VEC',
+    "EXTREME & WILD": 'COLORSET_01_VEC',
+    "MECHANICAL & ROBOTIC": 'COLORSET_15_VEC',
+    "COMPLEX STORIES": 'COLORSET_08_VEC',
+}
+
+# Preview collection for icons, created on first use
 preview_collections = {}
 
+# Names of loaded icons, least recently drawn first
+loaded_previews = OrderedDict()
+
+# Icons kept loaded when no preferences are available
+DEFAULT_PREVIEW_CACHE_SIZE = 150
+
+# When an icon was last drawn, for dropping icons once the UI goes idle
+preview_state = {"last_used": 0.0}
+
+# Seconds between idle checks
+PREVIEW_IDLE_CHECK_INTERVAL = 30.0
+
+# Atlas written by generate_interp_previews.py, read once on first use
+PREVIEW_ATLAS_MANIFEST = "previews_atlas.json"
+preview_atlas = {"icons": None, "pixels": None}
+
+# Small icons are letterboxed into a square of this size
+PREVIEW_ICON_SIZE = 32
+
 # Get addon directory for preview images
 def get_addon_dir():
     return os.path.dirname(os.path.realpath(__file__))
 
-def load_preview_icons():
-    """Load preview icons using Blender's preview system"""
-    pcoll = bpy.utils.previews.new()
+def load_preview_atlas():
+    """Read the atlas manifest and pixels (RGBA bytes, bottom row first as Blender stores them)"""
+    preview_dir = os.path.join(get_addon_dir(), "interp_previews")
+    preview_atlas["icons"] = {}
     
-    addon_dir = get_addon_dir()
-    preview_dir = os.path.join(addon_dir, "interp_previews")
+    try:
+        with open(os.path.join(preview_dir, PREVIEW_ATLAS_MANIFEST), encoding="utf-8") as f:
+            manifest = json.load(f)
+        image = bpy.data.images.load(os.path.join(preview_dir, manifest["image"]), check_existing=False)
+    except (OSError, ValueError, KeyError, RuntimeError) as e:
+        print(f"Could not load interpolation previews: {e}")
+        return
     
-    if os.path.exists(preview_dir):
-        for name in INTERPOLATION_FUNCTIONS.keys():
-            # Remove the return marker for filename
-            safe_name = name.replace(" ↺", "").replace(" ", "_").replace("+", "plus").replace("/", "_")
-            img_path = os.path.join(preview_dir, f"{safe_name}.png")
-            
-            if os.path.exists(img_path):
-                pcoll.load(safe_name, img_path, 'IMAGE')
+    try:
+        width, height = image.size
+        pixels = np.empty(width * height * 4, dtype=np.float32)
+        image.pixels.foreach_get(pixels)
+    finally:
+        bpy.data.images.remove(image)
+    
+    preview_atlas["pixels"] = np.round(pixels * 255).astype(np.uint8).reshape(height, width, 4)
+    preview_atlas["icons"] = manifest["icons"]
+
+def atlas_tile(rect):
+    """Pixels of one atlas tile, rect is [x, y, width, height] from the top left"""
+    pixels = preview_atlas["pixels"]
+    x, y, width, height = rect
+    bottom = pixels.shape[0] - y - height
+    return pixels[bottom:bottom + height, x:x + width]
+
+def get_preview_icon(name):
+    """Icon id for a function's preview, creating it from the atlas on first use (0 if there is none)
+
+    Only called while drawing, so nothing is loaded until a category is
+    expanded, a search shows results or the operator dialog opens.
+    """
+    entry = function_index.get(name)
+    if entry is None:
+        return 0
+    
+    preview_state["last_used"] = time.monotonic()
+    
+    if entry["icon_id"]:
+        loaded_previews.move_to_end(name)
+        return entry["icon_id"]
+    
+    if preview_atlas["icons"] is None:
+        load_preview_atlas()
+    icon = preview_atlas["icons"].get(name)
+    if icon is None:
+        return 0
+    
+    pcoll = preview_collections.get("main")
+    if pcoll is None:
+        pcoll = preview_collections["main"] = bpy.utils.previews.new()
+    
+    tile = atlas_tile(icon["rect"])
+    height, width = tile.shape[:2]
+    preview = pcoll.new(entry["safe_name"])
+    preview.image_size = (width, height)
+    preview.image_pixels_float.foreach_set((tile / 255.0).astype(np.float32).ravel())
+    
+    # Small icon: nearest-neighbour downscale, centered vertically
+    size = PREVIEW_ICON_SIZE
+    icon_height = max(1, round(size * height / width))
+    rows = ((np.arange(icon_height) + 0.5) * height / icon_height).astype(int)
+    cols = ((np.arange(size) + 0.5) * width / size).astype(int)
+    small = np.zeros((size, size, 4), dtype=np.float32)
+    top = (size - icon_height) // 2
+    small[top:top + icon_height] = tile[rows][:, cols] / 255.0
+    preview.icon_size = (size, size)
+    preview.icon_pixels_float.foreach_set(small.ravel())
     
-    preview_collections["main"] = pcoll
+    entry["icon_id"] = preview.icon_id
+    loaded_previews[name] = None
+    
+    # Drop the least recently drawn icons over the cap
+    prefs = get_addon_preferences()
+    max_icons = prefs.preview_cache_size if prefs else DEFAULT_PREVIEW_CACHE_SIZE
+    while len(loaded_previews) > max_icons:
+        old_name, _ = loaded_previews.popitem(last=False)
+        old_entry = function_index[old_name]
+        del pcoll[old_entry["safe_name"]]
+        old_entry["icon_id"] = 0
+    
+    return entry["icon_id"]
+
+# Name -> safe name, icon and category, built once at register time
+function_index = {}
+
+# (category, color icon, function names) in display order
+category_index = []
+
+# Last search, so redraws with the same query don't filter again
+search_results = {"query": None, "names": []}
+
+def build_function_index():
+    """Build the name/icon/category index the sidebar draws from
+
+    Icons start out unloaded, get_preview_icon fills them in when drawn.
+    """
+    function_index.clear()
+    category_index.clear()
+    search_results["query"] = None
+    
+    for category_name, function_list in CATEGORIES.items():
+        names = [name for name in function_list if name in INTERPOLATION_FUNCTIONS]
+        category_index.append((category_name, CATEGORY_ICONS.get(category_name, 'DOT'), names))
+        
+        for name in names:
+            file_name = safe_name(name)
+            function_index[name] = {
+                "safe_name": file_name,
+                "category": category_name,
+                "icon_id": 0,
+                "search_text": name.lower(),
+            }
+
+def fuzzy_match(query, text):
+    """True if every query word starts a word of text and its other letters follow in order
+
+    "eio sin" matches "ease inout sine", "bnc" matches "bounce out".
+    """
+    for word in query.lower().split():
+        for start in range(len(text)):
+            if text[start] != word[0] or (start and text[start - 1] != " "):
+                continue
+            position = start + 1
+            for char in word[1:]:
+                position = text.find(char, position) + 1
+                if position == 0:
+                    break
+            else:
+                break
+        else:
+            return False
+    return True
+
+def search_functions(query):
+    """Function names matching a search query, in category order"""
+    if query != search_results["query"]:
+        search_results["names"] = [name for name, entry in function_index.items()
+                                   if fuzzy_match(query, entry["search_text"])]
+        search_results["query"] = query
+    return search_results["names"]
 
 def unload_preview_icons():
-    """Unload preview icons"""
+    """Unload preview icons, they are loaded again the next time they are drawn"""
     for pcoll in preview_collections.values():
         bpy.utils.previews.remove(pcoll)
     preview_collections.clear()
+    loaded_previews.clear()
+    preview_atlas["icons"] = None
+    preview_atlas["pixels"] = None
+    
+    for entry in function_index.values():
+        entry["icon_id"] = 0
 
-class ANIM_OT_apply_interpolation(bpy.types.Operator):
-    """Apply custom interpolation between selected keyframes"""
-    bl_idname = "anim.apply_interpolation"
-    bl_label = "Apply Interpolation"
-    bl_options = {'REGISTER', 'UNDO'}
+def unload_idle_previews():
+    """Timer: drop loaded icons once nothing has drawn them for a while"""
+    prefs = get_addon_preferences()
+    if prefs and prefs.unload_idle_previews and loaded_previews:
+        if time.monotonic() - preview_state["last_used"] > prefs.preview_idle_minutes * 60:
+            unload_preview_icons()
+    return PREVIEW_IDLE_CHECK_INTERVAL
+
+def read_keyframe_arrays(fcurve):
+    """Read all keyframes of an fcurve into numpy arrays, sorted by frame
+
+    Returns None when fewer than 2 keyframes are selected (nothing to bake).
+    """
+    keyframe_points = fcurve.keyframe_points
+    count = len(keyframe_points)
+    
+    # Cheap check first, most fcurves of a big action have nothing selected
+    selected = np.empty(count, dtype=bool)
+    keyframe_points.foreach_get("select_control_point", selected)
+    if np.count_nonzero(selected) < 2:
+        return None
+    
+    keys = {}
+    for attr, (dtype, width) in KEYFRAME_ARRAY_ATTRIBUTES.items():
+        array = np.empty(count * width, dtype=dtype)
+        keyframe_points.foreach_get(attr, array)
+        keys[attr] = array.reshape(count, width) if width > 1 else array
+    
+    # Fcurves are normally kept sorted, this just makes sure of it
+    order = np.argsort(keys["co"][:, 0], kind='stable')
+    if np.any(order != np.arange(count)):
+        keys = {attr: array[order] for attr, array in keys.items()}
+    
+    return keys
+
+def write_keyframe_arrays(fcurve, keys):
+    """Replace all keyframes of an fcurve in one go, then update it once"""
+    keyframe_points = fcurve.keyframe_points
+    count = len(keys["co"])
+    
+    keyframe_points.clear()
+    keyframe_points.add(count)
+    
+    for attr in KEYFRAME_ARRAY_ATTRIBUTES:
+        keyframe_points.foreach_set(attr, np.ascontiguousarray(keys[attr]).ravel())
+    
+    # Sorts keys and recalculates handles
+    fcurve.update()
+
+def write_curve_stream(fcurve, chunks, count):
+    """Replace the keys of an fcurve with streamed (frames, values) chunks, as linear keys
+
+    chunks usually comes from curve_stream.stream_curve and count from
+    curve_stream.frame_count. Keyframes can only be set all at once, so the
+    coordinates are gathered into one float32 array (8 bytes per key), the
+    chunks themselves are never kept.
+    """
+    co = np.empty((count, 2), dtype=np.float32)
+    filled = 0
+    for frames, values in chunks:
+        if filled + len(frames) > count:
+            raise ValueError(f"write_curve_stream: expected {count} keys, the stream has more")
+        co[filled:filled + len(frames), 0] = frames
+        co[filled:filled + len(frames), 1] = values
+        filled += len(frames)
+    if filled != count:
+        raise ValueError(f"write_curve_stream: expected {count} keys, the stream had {filled}")
+    
+    keyframe_points = fcurve.keyframe_points
+    keyframe_points.clear()
+    keyframe_points.add(count)
+    keyframe_points.foreach_set("co", co.ravel())
+    keyframe_points.foreach_set("interpolation", np.full(count, INTERPOLATION_LINEAR, dtype=np.int32))
+    for attr in ("handle_left_type", "handle_right_type"):
+        keyframe_points.foreach_set(attr, np.full(count, HANDLE_VECTOR, dtype=np.int32))
+    
+    fcurve.update()
+
+# Selected keyframe count shown in the sidebar. The Graph Editor and Dope Sheet
+# selection operators are UNDO-only: they don't show up in window_manager.operators
+# and don't notify msgbus, so no stamp catches them and the count is redone on
+# every redraw. Only during playback, which redraws every frame and doesn't change
+# selection by itself, is it kept until the generation (bumped by handlers, msgbus
+# and our own operators) changes
+selection_stats = {"generation": 0, "stamp": None, "count": 0}
+
+# Reused for reading selection flags, grown to the longest fcurve seen
+selection_buffer = {"array": np.empty(0, dtype=bool)}
+
+# Owner of our msgbus subscriptions
+selection_msgbus_owner = object()
+
+@persistent
+def invalidate_selection_stats(*args):
+    selection_stats["generation"] += 1
+
+@persistent
+def selection_stats_depsgraph_update(scene, depsgraph):
+    if depsgraph.id_type_updated('ACTION'):
+        invalidate_selection_stats()
+
+@persistent
+def selection_stats_load_post(*args):
+    invalidate_selection_stats()
+    subscribe_selection_stats()
+
+def subscribe_selection_stats():
+    """Recount when keyframe selection is changed through properties (msgbus is cleared on file load)"""
+    bpy.msgbus.clear_by_owner(selection_msgbus_owner)
+    for prop in ("select_control_point", "co"):
+        bpy.msgbus.subscribe_rna(
+            key=(bpy.types.Keyframe, prop),
+            owner=selection_msgbus_owner,
+            args=(),
+            notify=invalidate_selection_stats,
+        )
+
+def count_selected_keyframes(channelbag):
+    """Count selected keyframes of an action slot, without creating a Python object per keyframe"""
+    buffer = selection_buffer["array"]
+    count = 0
+    for fcurve in channelbag.fcurves:
+        keyframe_points = fcurve.keyframe_points
+        key_count = len(keyframe_points)
+        if key_count > len(buffer):
+            buffer = selection_buffer["array"] = np.empty(key_count, dtype=bool)
+        selected = buffer[:key_count]
+        keyframe_points.foreach_get("select_control_point", selected)
+        count += int(np.count_nonzero(selected))
+    return count
+
+def get_selected_keyframe_count(context, channelbag):
+    """Selected keyframe count of an action slot, O(1) per playback frame when nothing changed"""
+    if not context.screen.is_animation_playing:
+        return count_selected_keyframes(channelbag)
+    
+    stamp = (channelbag.as_pointer(), selection_stats["generation"])
+    if stamp != selection_stats["stamp"]:
+        selection_stats["count"] = count_selected_keyframes(channelbag)
+        selection_stats["stamp"] = stamp
+    
+    return selection_stats["count"]
+
+# Fcurves of each action slot by bone and channel group, so applying to a few bones
+# of a big rig only reads their channels. Rebuilt when channels are added or removed,
+# dropped on undo and file load (action pointers get reused)
+action_indices = {}
+
+# pose.bones["Name"].location -> Name (quotes and backslashes in names are escaped)
+BONE_PATH_PATTERN = re.compile(r'pose\.bones\["((?:[^"\\]|\\.)*)"\]')
+
+class ActionIndex:
+    """Fcurve indices of one action slot's channels by bone name and channel group
+
+    Indices, not fcurves: Python references to Blender data must not outlive
+    an undo step.
+    """
+    
+    def __init__(self, channelbag, structure):
+        self.structure = structure
+        self.fcurve_count = len(channelbag.fcurves)
+        self.by_bone = {}
+        self.by_group = {}
+        for i, fcurve in enumerate(channelbag.fcurves):
+            match = BONE_PATH_PATTERN.match(fcurve.data_path)
+            if match:
+                bone_name = match.group(1)
+                if "\\" in bone_name:
+                    bone_name = re.sub(r'\\(.)', r'\1', bone_name)
+                self.by_bone.setdefault(bone_name, []).append(i)
+            if fcurve.group is not None:
+                self.by_group.setdefault(fcurve.group.name, []).append(i)
+    
+    def filtered(self, channelbag, channel_filter, bone_names=()):
+        """Indices of the fcurves a channel filter keeps, in channel order"""
+        if channel_filter == 'SELECTED_BONES':
+            return sorted(i for name in bone_names for i in self.by_bone.get(name, ()))
+        if channel_filter == 'SELECTED_GROUPS':
+            return sorted(i for group in channelbag.groups if group.select
+                          for i in self.by_group.get(group.name, ()))
+        if channel_filter == 'VISIBLE':
+            fcurves = channelbag.fcurves
+            return [i for i in range(self.fcurve_count) if not fcurves[i].hide]
+        return range(self.fcurve_count)
+
+def get_action_index(channelbag):
+    """ActionIndex of an action slot's channelbag (or a pre-4.4 action), built on first use"""
+    # Slots of one action are indexed apart, a slot handle is never reused within its action
+    key = (channelbag.id_data.as_pointer(), getattr(channelbag, "slot_handle", None))
+    structure = (len(channelbag.fcurves), len(channelbag.groups))
+    index = action_indices.get(key)
+    if index is None or index.structure != structure:
+        index = action_indices[key] = ActionIndex(channelbag, structure)
+    return index
+
+@persistent
+def clear_action_indices(*args):
+    action_indices.clear()
+
+def owned_datablocks(obj):
+    """The object and the datablocks it owns that can carry their own action"""
+    yield obj
+    if obj.data is not None:
+        yield obj.data
+        # Shape key animation lives on the Key datablock
+        shape_keys = getattr(obj.data, "shape_keys", None)
+        if shape_keys is not None:
+            yield shape_keys
+    for slot in obj.material_slots:
+        if slot.material is not None:
+            yield slot.material
+            if slot.material.node_tree is not None:
+                yield slot.material.node_tree
+    for modifier in obj.modifiers:
+        if modifier.type == 'NODES' and modifier.node_group is not None:
+            yield modifier.node_group
+
+def animation_channelbag(animation_data):
+    """Fcurves and groups animating one datablock, or None
+    
+    From Blender 4.4 an action holds a slot per animated datablock (an object and
+    its shape keys can share one) and action.fcurves only shows the first slot's:
+    read the channelbag of the datablock's own slot. Before 4.4, the action itself.
+    """
+    action = animation_data.action if animation_data else None
+    if action is None:
+        return None
+    if not hasattr(animation_data, "action_slot"):
+        return action
+    if animation_data.action_slot is None:
+        return None
+    from bpy_extras import anim_utils
+    return anim_utils.action_get_channelbag_for_slot(action, animation_data.action_slot)
+
+def collect_channelbags(context, batch):
+    """Channels to apply to: the active object's, or with batch those of the selected
+    objects and their datablocks, each shared action slot once"""
+    if not batch:
+        obj = context.active_object
+        channelbag = animation_channelbag(obj.animation_data) if obj else None
+        return [channelbag] if channelbag is not None else []
+    
+    objects = list(context.selected_objects)
+    if context.active_object is not None and context.active_object not in objects:
+        objects.append(context.active_object)
+    
+    channelbags = []
+    seen = set()
+    for obj in objects:
+        for id_data in owned_datablocks(obj):
+            channelbag = animation_channelbag(getattr(id_data, "animation_data", None))
+            if channelbag is None or channelbag.as_pointer() in seen:
+                continue
+            seen.add(channelbag.as_pointer())
+            channelbags.append(channelbag)
+    return channelbags
+
+def action_count(channelbags):
+    """Distinct actions the channelbags belong to"""
+    return len({channelbag.id_data.as_pointer() for channelbag in channelbags})
+
+# Driver output mode: the segments of each driven channel are stored on the
+# object (so they are saved with the file) and evaluated live by a function
+# registered in the driver namespace
+DRIVER_FUNCTION = "interp_drive"
+DRIVER_PROPERTY = "interp_drivers"
+
+# (object pointer, entry key) -> (stamp, DriverCurve), rebuilt when the entry's stamp changes
+driver_curves = {}
+
+def build_driver_curve(entry):
+    """DriverCurve for one stored channel entry"""
+    lut = get_curve_lut(entry["function"], entry["time_scale"], bool(entry["reverse"]),
+                        entry["overshoot"], entry["influence"])
+    flat = list(entry["segments"])
+    return DriverCurve(lut, [tuple(flat[i:i + 4]) for i in range(0, len(flat), 4)])
+
+def interp_drive(owner, frame, key):
+    """Driver namespace function: value of a driven channel at frame
+
+    Used as interp_drive(self, frame, "c0") with Use Self enabled. Outside the
+    interpolated segments the channel's keys take over as usual.
+    """
+    id_data = owner.id_data
+    entry = id_data[DRIVER_PROPERTY][key]
+    
+    cache_key = (id_data.as_pointer(), key)
+    cached = driver_curves.get(cache_key)
+    if cached is None or cached[0] != entry["stamp"]:
+        cached = (entry["stamp"], build_driver_curve(entry))
+        driver_curves[cache_key] = cached
+    curve = cached[1]
+    
+    value = curve.evaluate(frame)
+    if value is None:
+        channelbag = animation_channelbag(id_data.animation_data)
+        fcurve = channelbag.fcurves.find(entry["data_path"], index=entry["index"]) if channelbag else None
+        value = fcurve.evaluate(frame) if fcurve else curve.hold_value(frame)
+    return value
+
+def register_driver_function():
+    bpy.app.driver_namespace[DRIVER_FUNCTION] = interp_drive
+
+@persistent
+def driver_namespace_load_post(*args):
+    """Re-register the driver function and let our drivers retry
+
+    Drivers evaluated before the function was registered are marked invalid
+    and skipped from then on.
+    """
+    register_driver_function()
+    driver_curves.clear()
+    
+    for obj in bpy.data.objects:
+        if DRIVER_PROPERTY not in obj or not obj.animation_data:
+            continue
+        for fcurve in obj.animation_data.drivers:
+            if fcurve.driver.expression.startswith(DRIVER_FUNCTION + "("):
+                fcurve.driver.is_valid = True
+
+# Timings and counters of the last keyframe apply, see get_last_run_stats()
+last_run_stats = {}
+
+class RunStats:
+    """Per-phase wall times and counters for one operator run"""
+    
+    def __init__(self):
+        self.phases = {}
+        self.counters = {}
+        self.started = time.perf_counter()
+        self.lap_start = self.started
+        self.paused = 0.0
+    
+    def lap(self, phase):
+        """Close a phase: time since the previous lap (or the start) goes to it"""
+        now = time.perf_counter()
+        self.phases[phase] = self.phases.get(phase, 0.0) + now - self.lap_start
+        self.lap_start = now
+    
+    def resume(self):
+        """Start timing again after a pause, the time in between isn't counted"""
+        now = time.perf_counter()
+        self.paused += now - self.lap_start
+        self.lap_start = now
+    
+    def total(self):
+        return self.lap_start - self.started - self.paused
+    
+    def as_dict(self):
+        return {
+            "phases": dict(self.phases),
+            "total": self.total(),
+            "counters": dict(self.counters),
+        }
+    
+    def describe(self):
+        """Multi-line breakdown for the console"""
+        lines = [f"  {phase:<8} {seconds * 1000:9.2f} ms" for phase, seconds in self.phases.items()]
+        lines.append(f"  {'total':<8} {self.total() * 1000:9.2f} ms")
+        lines += [f"  {name}: {value}" for name, value in self.counters.items()]
+        return "\n".join(lines)
+
+def get_last_run_stats():
+    """Timings (seconds) and counters of the last keyframe apply, for profiling scripts
+
+    {"interp_name": ..., "phases": {"gather", "bake", "write", "redraw"},
+     "total": ..., "counters": {"actions", "fcurves_visited", "fcurves_baked", "segments",
+     "keys_removed", "keys_inserted", "unmet_error", "fallback_samples", "fcurves_per_sec", "keys_per_sec"}},
+    empty before the first run.
+    """
+    return dict(last_run_stats)
+
+# Generated node groups carry a hash of the parameters they were built from,
+# so asking for the same curve again reuses the group instead of adding a copy
+NODE_GROUP_HASH_PROPERTY = "interp_hash"
+NODE_GROUP_PREFIX = "Interp: "
+
+def node_group_hash(settings, num_points):
+    """Hash of everything a generated node group depends on (num_points is None for Math node graphs)"""
+    key = (settings.interp_name, num_points, settings.reverse, settings.overshoot,
+           settings.time_scale, settings.influence)
+    return hashlib.sha1(repr(key).encode()).hexdigest()[:16]
+
+def find_node_group(group_hash):
+    for node_group in bpy.data.node_groups:
+        if node_group.get(NODE_GROUP_HASH_PROPERTY) == group_hash:
+            return node_group
+    return None
+
+def node_group_function_name(node_group):
+    """Function a generated node group was made for, from its name (without Blender's .001 suffix)"""
+    return re.sub(r"\.\d{3,}$", "", node_group.name[len(NODE_GROUP_PREFIX):])
+
+def node_group_fingerprint(node_group):
+    """Content key of a generated node group, None for other groups
+
+    Float Curve groups are keyed by their points, which works for groups made
+    before they were hashed too. Math node groups are keyed by their hash.
+    """
+    if node_group.bl_idname != 'GeometryNodeTree' or not node_group.name.startswith(NODE_GROUP_PREFIX):
+        return None
+    
+    curve_nodes = [node for node in node_group.nodes if node.bl_idname == 'ShaderNodeFloatCurve']
+    if len(curve_nodes) != 1:
+        group_hash = node_group.get(NODE_GROUP_HASH_PROPERTY)
+        return ("hash", group_hash) if group_hash else None
+    
+    points = curve_nodes[0].mapping.curves[0].points
+    return tuple((round(point.location[0], 6), round(point.location[1], 6), point.handle_type)
+                 for point in points)
+
+# Most points of a Float Curve fallback, Blender evaluates curve mappings
+# through a 256 step table so more points add nothing
+FLOAT_CURVE_MAX_POINTS = 256
+
+# Spacing of generated Math nodes
+NODE_COLUMN_WIDTH = 180
+NODE_ROW_HEIGHT = 160
+
+def build_expression_nodes(node_group, expression, input_socket, group_outputs):
+    """Create Math and Switch nodes for an IR expression (see node_compiler) and connect its result"""
+    nodes = node_group.nodes
+    links = node_group.links
+    sockets = {T: input_socket}
+    columns = {T: 0}
+    rows = {}
+    
+    def build(ir):
+        if ir in sockets:
+            return sockets[ir]
+        
+        if ir[0] == "switch":
+            node = nodes.new('GeometryNodeSwitch')
+            node.input_type = 'FLOAT'
+            inputs = [node.inputs["Switch"], node.inputs["False"], node.inputs["True"]]
+        else:
+            node = nodes.new('ShaderNodeMath')
+            node.operation = ir[0]
+            inputs = node.inputs
+        
+        column = 1
+        for socket, arg in zip(inputs, ir[1:]):
+            if arg[0] == "const":
+                socket.default_value = arg[1] > 0 if socket.type == 'BOOLEAN' else arg[1]
+            else:
+                links.new(build(arg), socket)
+                column = max(column, columns[arg] + 1)
+        
+        # Lay nodes out in columns by distance from the input
+        row = rows.get(column, 0)
+        rows[column] = row + 1
+        node.location = (-400 + column * NODE_COLUMN_WIDTH, -row * NODE_ROW_HEIGHT)
+        
+        columns[ir] = column
+        sockets[ir] = node.outputs[0]
+        return sockets[ir]
+    
+    if expression[0] == "const":
+        group_outputs.inputs[0].default_value = expression[1]
+    else:
+        links.new(build(expression), group_outputs.inputs[0])
+    group_outputs.location = (-400 + (max(columns.values()) + 1) * NODE_COLUMN_WIDTH, 0)
+
+class ApplyInterpolationMixin:
+    """Properties and keyframe baking shared by the apply operators
+
+    A plain class: subclassing a registered operator detaches the Python
+    class of the registered one, so each operator derives from this instead.
+    """
     
     interp_name: bpy.props.StringProperty()
     
+    sampling_mode: bpy.props.EnumProperty(
+        name="Sampling",
+        description="How keyframes are placed between start and end",
+        items=[
+            ('UNIFORM', "Uniform", "Fixed number of evenly spaced keyframes"),
+            ('ADAPTIVE', "Adaptive", "As few keyframes as needed to stay within Max Error of the curve"),
+        ],
+        default='UNIFORM'
+    )
+    
     samples: bpy.props.IntProperty(
         name="Samples",
         description="Number of keyframes to create between start and end",
@@ -65,6 +721,15 @@ class ANIM_OT_apply_interpolation(bpy.types.Operator):
         max=200
     )
     
+    max_error: bpy.props.FloatProperty(
+        name="Max Error",
+        description="Largest allowed difference from the curve, in value units (Adaptive sampling and Bezier keys)",
+        default=0.001,
+        min=0.000001,
+        soft_max=1.0,
+        precision=4
+    )
+    
     influence: bpy.props.FloatProperty(
         name="Influence",
         description="Blend between linear (0%) and full effect (100%)",
@@ -102,21 +767,153 @@ class ANIM_OT_apply_interpolation(bpy.types.Operator):
         items=[
             ('KEYFRAMES', "Keyframes", "Apply to selected keyframes in timeline", 'KEYFRAME', 0),
             ('GEO_NODES', "Geometry Nodes", "Create a node group for Geometry Nodes", 'NODETREE', 1),
+            ('BEZIER', "Bezier Keys", "Fit the curve with as few Bezier keyframes as Max Error allows", 'IPO_BEZIER', 2),
+            ('DRIVER', "Driver", "Evaluate the curve live with a driver between the selected keys, nothing is baked (needs Auto Run Python Scripts)", 'DRIVER', 3),
         ],
         default='KEYFRAMES'
     )
     
+    channel_filter: bpy.props.EnumProperty(
+        name="Channels",
+        description="Which channels with selected keyframes to apply to",
+        items=[
+            ('ALL', "All", "Every channel with selected keyframes"),
+            ('SELECTED_BONES', "Selected Bones", "Only channels of the selected pose bones"),
+            ('VISIBLE', "Visible", "Skip channels hidden in the Graph Editor"),
+            ('SELECTED_GROUPS', "Selected Groups", "Only channels in selected channel groups"),
+        ],
+        default='ALL'
+    )
+    
+    background: bpy.props.BoolProperty(
+        name="Run in Background",
+        description="Bake in small chunks on a timer: the viewport stays usable, progress shows in the "
+                    "status bar and Esc cancels (no redo panel)",
+        default=False
+    )
+    
+    batch: bpy.props.BoolProperty(
+        name="All Selected Objects",
+        description="Apply to every selected object and the datablocks it owns (shape keys, materials, node trees), "
+                    "shared action slots once, in a single undo step",
+        default=False
+    )
+    
     @classmethod
     def poll(cls, context):
         # Always allow if we have an active object (no animation data needed for Geometry Nodes mode)
         return context.active_object is not None
     
-    def create_geometry_node_group(self, context):
-        """Create a Geometry Nodes node group with the interpolation curve"""
-        interp_func = INTERPOLATION_FUNCTIONS[self.interp_name]
+    def gather_keyframes(self, context, channelbags):
+        """Snapshot the keyframes of every fcurve with a selected pair, returns (fcurves, snapshots, fcurves visited)"""
+        # Across all actions so they bake together and undo as one step. Only the
+        # channels the filter keeps are looked at
+        bone_names = {bone.name for bone in context.selected_pose_bones or ()} \
+            if self.channel_filter == 'SELECTED_BONES' else ()
+        fcurves = []
+        key_snapshots = []
+        fcurves_visited = 0
+        for channelbag in channelbags:
+            index = get_action_index(channelbag)
+            action_fcurves = channelbag.fcurves
+            for i in index.filtered(channelbag, self.channel_filter, bone_names):
+                fcurves_visited += 1
+                fcurve = action_fcurves[i]
+                keys = read_keyframe_arrays(fcurve)
+                if keys is not None:
+                    fcurves.append(fcurve)
+                    key_snapshots.append(keys)
+        return fcurves, key_snapshots, fcurves_visited
+    
+    def finish_keyframes(self, context, stats, baker, modified_count, fallbacks_before):
+        """Redraw, record the run stats and report, once every baked fcurve is written"""
+        # Update the view
+        for area in context.screen.areas:
+            if area.type in ('GRAPH_EDITOR', 'DOPESHEET_EDITOR'):
+                area.tag_redraw()
+        stats.lap("redraw")
+        
+        seconds = stats.total()
+        stats.counters.update({
+            "segments": modified_count,
+            "keys_removed": baker.counters["keys_removed"],
+            "keys_inserted": baker.counters["keys_inserted"],
+            "unmet_error": baker.counters["unmet_error"],
+            "fallback_samples": curve_cache.fallbacks - fallbacks_before,
+            "fcurves_per_sec": round(stats.counters["fcurves_baked"] / seconds) if seconds else 0,
+            "keys_per_sec": round(baker.counters["keys_inserted"] / seconds) if seconds else 0,
+        })
+        last_run_stats.clear()
+        last_run_stats["interp_name"] = self.interp_name
+        last_run_stats.update(stats.as_dict())
+        
+        prefs = get_addon_preferences()
+        if prefs and prefs.log_timings:
+            print(f"Custom Interpolation: applied {self.interp_name}\n{stats.describe()}")
+        
+        elapsed = f"{seconds * 1000:.1f} ms"
+        action_total = stats.counters["actions"]
+        across = f" across {action_total} actions" if action_total > 1 else ""
+        if modified_count > 0:
+            message = f"Applied {self.interp_name} to {modified_count} curve segment(s){across} in {elapsed}"
+            if baker.is_return_to_start:
+                message += " - Returns to start"
+            if baker.counters["unmet_error"] > 0:
+                # Detail finer than the adaptive table, the keys can't follow it
+                self.report({'WARNING'}, f"{message} - Max Error not reached, up to {baker.counters['unmet_error']:.4g} off the curve")
+            else:
+                self.report({'INFO'}, message)
+        else:
+            self.report({'WARNING'}, "No valid keyframe pairs selected")
+    
+    def apply_to_keyframes(self, context):
+        """Apply interpolation to selected keyframes"""
+        # Only check for animation data in keyframes mode
+        channelbags = collect_channelbags(context, self.batch)
+        if not channelbags:
+            self.report({'WARNING'}, "No animation data found. Select object with keyframes or use Geometry Nodes mode.")
+            return {'CANCELLED'}
+        
+        stats = RunStats()
+        fallbacks_before = curve_cache.fallbacks
         
+        # Plan: snapshot the keyframes to bake (main thread)
+        fcurves, key_snapshots, fcurves_visited = self.gather_keyframes(context, channelbags)
+        stats.counters = {"actions": action_count(channelbags), "fcurves_visited": fcurves_visited, "fcurves_baked": len(fcurves)}
+        stats.lap("gather")
+        
+        # Compute: bake all snapshots without touching Blender data (thread pool)
+        baker = CurveBaker(BakeSettings.from_operator(self))
+        results = baker.bake_fcurves(key_snapshots)
+        stats.lap("bake")
+        
+        # Commit: write the baked keyframes back (main thread)
+        modified_count = 0
+        for fcurve, (keys, segment_count) in zip(fcurves, results):
+            write_keyframe_arrays(fcurve, keys)
+            modified_count += segment_count
+        
+        # New keys come in selected
+        invalidate_selection_stats()
+        stats.lap("write")
+        
+        self.finish_keyframes(context, stats, baker, modified_count, fallbacks_before)
+        return {'FINISHED'}
+
+class ANIM_OT_apply_interpolation(ApplyInterpolationMixin, bpy.types.Operator):
+    """Apply custom interpolation between selected keyframes"""
+    bl_idname = "anim.apply_interpolation"
+    bl_label = "Apply Interpolation"
+    bl_options = {'REGISTER', 'UNDO'}
+    
+    def build_geometry_node_group(self, settings, expression, num_points):
+        """Create a Geometry Nodes node group with the interpolation curve
+
+        With an expression (see node_compiler) the function is built from Math
+        nodes and evaluated exactly, otherwise it is sampled into a Float Curve.
+        """
         # Create node group
-        node_group = bpy.data.node_groups.new(f"Interp: {self.interp_name}", 'GeometryNodeTree')
+        node_group = bpy.data.node_groups.new(f"{NODE_GROUP_PREFIX}{self.interp_name}", 'GeometryNodeTree')
         
         # Create group inputs and outputs
         group_inputs = node_group.nodes.new('NodeGroupInput')
@@ -134,6 +931,10 @@ class ANIM_OT_apply_interpolation(bpy.types.Operator):
         # Add output socket
         node_group.interface.new_socket(name="Result", in_out='OUTPUT', socket_type='NodeSocketFloat')
         
+        if expression is not None:
+            build_expression_nodes(node_group, expression, group_inputs.outputs[0], group_outputs)
+            return node_group
+        
         # Create Float Curve node
         curve_node = node_group.nodes.new('ShaderNodeFloatCurve')
         curve_node.location = (0, 0)
@@ -141,49 +942,14 @@ class ANIM_OT_apply_interpolation(bpy.types.Operator):
         # Sample the interpolation function and create curve points
         curve = curve_node.mapping.curves[0]
         
-        num_points = min(self.samples, 64)
-        
-        # Blender curves start with 2 default points
-        # We'll reuse them and add more if needed
-        current_points = len(curve.points)
-        
-        # Add additional points if we need more than the default 2
-        for _ in range(num_points - current_points):
+        # Blender curves start with 2 default points, add the rest, then
+        # place them all in one go
+        for _ in range(num_points - len(curve.points)):
             curve.points.new(0, 0)
         
-        # Now set coordinates for each point (only use the first num_points)
-        for i in range(min(num_points, len(curve.points))):
-            t = i / (num_points - 1)
-            
-            # Apply time scale
-            t_scaled = min(1.0, t * self.time_scale)
-            
-            # Apply reverse
-            if self.reverse:
-                t_scaled = 1.0 - t_scaled
-            
-            try:
-                # Get interpolated value
-                interp_t = interp_func(t_scaled)
-                
-                # Apply overshoot multiplier
-                if interp_t < 0:
-                    interp_t = interp_t * self.overshoot
-                elif interp_t > 1:
-                    interp_t = 1 + (interp_t - 1) * self.overshoot
-                
-                # Apply influence
-                linear_value = t
-                influence_factor = self.influence / 100.0
-                value = linear_value * (1 - influence_factor) + interp_t * influence_factor
-                
-                # Set point location
-                curve.points[i].location = (t, value)
-                
-            except Exception as e:
-                # Fallback to linear
-                curve.points[i].location = (t, t)
-                print(f"Error evaluating interpolation at t={t}: {e}")
+        # Shaped curve at t = i / (num_points - 1), from the same kernel as keyframes
+        point_t, point_values = float_curve_points(settings, num_points)
+        curve.points.foreach_set("location", np.column_stack((point_t, point_values)).astype(np.float32).ravel())
         
         # Update the curve mapping
         curve_node.mapping.update()
@@ -194,6 +960,32 @@ class ANIM_OT_apply_interpolation(bpy.types.Operator):
         node_group.links.new(group_inputs.outputs[0], curve_node.inputs[1])
         node_group.links.new(curve_node.outputs[0], group_outputs.inputs[0])
         
+        return node_group
+    
+    def create_geometry_node_group(self, context):
+        """Add the interpolation node group to the active object's Geometry Nodes modifier
+
+        A group generated earlier with the same function and parameters is
+        reused. Returns (node group, True if it was reused).
+        """
+        settings = BakeSettings.from_operator(self)
+        
+        # Exact Math node graph when the function compiles, sampled Float Curve otherwise
+        try:
+            expression = shaped_expression(self.interp_name, self.time_scale, self.reverse,
+                                           self.overshoot, self.influence)
+            num_points = None
+        except UnsupportedExpression:
+            expression = None
+            num_points = min(self.samples, FLOAT_CURVE_MAX_POINTS)
+        
+        group_hash = node_group_hash(settings, num_points)
+        node_group = find_node_group(group_hash)
+        reused = node_group is not None
+        if not reused:
+            node_group = self.build_geometry_node_group(settings, expression, num_points)
+            node_group[NODE_GROUP_HASH_PROPERTY] = group_hash
+        
         # Try to add to active geometry nodes modifier
         obj = context.active_object
         geo_mod = None
@@ -224,146 +1016,113 @@ class ANIM_OT_apply_interpolation(bpy.types.Operator):
             # Connect input to output
             geo_mod.node_group.links.new(input_node.outputs[0], output_node.inputs[0])
         
-        # Add the interpolation node group to the modifier's node tree
-        if geo_mod.node_group:
-            interp_node = geo_mod.node_group.nodes.new('GeometryNodeGroup')
+        # Add the interpolation node group to the modifier's node tree,
+        # unless a node there already uses it
+        tree = geo_mod.node_group
+        if tree and not any(node.bl_idname == 'GeometryNodeGroup' and node.node_tree == node_group
+                            for node in tree.nodes):
+            interp_node = tree.nodes.new('GeometryNodeGroup')
             interp_node.node_tree = node_group
             interp_node.label = f"{self.interp_name}"
             interp_node.location = (0, -200)
         
-        return node_group
+        return node_group, reused
     
-    def apply_to_keyframes(self, context):
-        """Apply interpolation to selected keyframes"""
+    def apply_drivers(self, context):
+        """Drive the channels with selected keyframes live instead of baking keys"""
         obj = context.active_object
+        channelbag = animation_channelbag(obj.animation_data) if obj else None
         
-        # Only check for animation data in keyframes mode
-        if not obj or not obj.animation_data or not obj.animation_data.action:
+        if channelbag is None:
             self.report({'WARNING'}, "No animation data found. Select object with keyframes or use Geometry Nodes mode.")
             return {'CANCELLED'}
         
-        action = obj.animation_data.action
-        interp_func = INTERPOLATION_FUNCTIONS[self.interp_name]
+        is_return_to_start = interpolation_functions.get_function_info(self.interp_name).return_to_start
         
-        # Check if this is a return-to-start function (marked with ↺)
-        is_return_to_start = " ↺" in self.interp_name
+        if DRIVER_PROPERTY not in obj:
+            obj[DRIVER_PROPERTY] = {}
+        entries = obj[DRIVER_PROPERTY]
         
-        modified_count = 0
+        # Applying again to a driven channel replaces its entry
+        channels = {(entry["data_path"], entry["index"]): key for key, entry in entries.items()}
+        next_key = len(entries)
         
-        # Process each fcurve
-        for fcurve in action.fcurves:
-            # Get selected keyframes
-            selected_points = [kp for kp in fcurve.keyframe_points if kp.select_control_point]
+        driven_count = 0
+        segment_count = 0
+        for fcurve in channelbag.fcurves:
+            keys = read_keyframe_arrays(fcurve)
+            if keys is None:
+                continue
             
-            if len(selected_points) < 2:
+            values = keys["co"][:, 1].tolist()
+            segments = driver_segments(keys["co"][:, 0].tolist(), values,
+                                       keys["select_control_point"].tolist(), is_return_to_start)
+            if not segments:
                 continue
             
-            # Sort by frame
-            selected_points.sort(key=lambda kp: kp.co[0])
+            key = channels.get((fcurve.data_path, fcurve.array_index))
+            if key is None:
+                while f"c{next_key}" in entries:
+                    next_key += 1
+                key = f"c{next_key}"
             
-            # First, set all selected keyframes to LINEAR with Vector handles to prevent any interpolation issues
-            for kp in selected_points:
-                kp.interpolation = 'LINEAR'
-                kp.handle_left_type = 'VECTOR'
-                kp.handle_right_type = 'VECTOR'
+            entries[key] = {
+                "data_path": fcurve.data_path,
+                "index": fcurve.array_index,
+                "function": self.interp_name,
+                "time_scale": self.time_scale,
+                "reverse": self.reverse,
+                "overshoot": self.overshoot,
+                "influence": self.influence,
+                "segments": [value for segment in segments for value in segment],
+                # Tells interp_drive to rebuild its cached curve
+                "stamp": random.getrandbits(31),
+            }
             
-            # Process pairs of consecutive selected keyframes
-            for i in range(len(selected_points) - 1):
-                start_kf = selected_points[i]
-                end_kf = selected_points[i + 1]
-                
-                start_frame = start_kf.co[0]
-                end_frame = end_kf.co[0]
-                start_value = start_kf.co[1]
-                end_value = end_kf.co[1]
-                
-                # Skip if frames are the same
-                if start_frame >= end_frame:
-                    continue
-                
-                # Remove existing keyframes between start and end (except endpoints)
-                points_to_remove = [kp for kp in fcurve.keyframe_points 
-                                   if start_frame < kp.co[0] < end_frame]
-                for kp in points_to_remove:
-                    fcurve.keyframe_points.remove(kp)
-                
-                # Insert new keyframes with custom interpolation
-                # Note: range goes from 1 to samples-1, so we don't duplicate the endpoints
-                for j in range(1, self.samples):
-                    t = j / self.samples
-                    frame = start_frame + t * (end_frame - start_frame)
-                    
-                    # Apply time scale
-                    t_scaled = min(1.0, t * self.time_scale)
-                    
-                    # Apply reverse
-                    if self.reverse:
-                        t_scaled = 1.0 - t_scaled
-                    
-                    try:
-                        # Get interpolated value (this already goes 0→1→0 for marked functions)
-                        interp_t = interp_func(t_scaled)
-                        
-                        # Apply overshoot multiplier
-                        if interp_t < 0:
-                            interp_t = interp_t * self.overshoot
-                        elif interp_t > 1:
-                            interp_t = 1 + (interp_t - 1) * self.overshoot
-                        
-                        # Calculate final value
-                        # The interp_t value from the function IS the normalized value (0-1 range)
-                        # We just scale it between start and end values
-                        interp_value = start_value + interp_t * (end_value - start_value)
-                        
-                        # Apply influence
-                        linear_value = start_value + t * (end_value - start_value)
-                        influence_factor = self.influence / 100.0
-                        value = linear_value * (1 - influence_factor) + interp_value * influence_factor
-                        
-                        fcurve.keyframe_points.insert(frame, value)
-                    except Exception as e:
-                        # Fallback to linear interpolation
-                        value = start_value + t * (end_value - start_value)
-                        fcurve.keyframe_points.insert(frame, value)
-                        print(f"Error applying interpolation at frame {frame}: {e}")
-                
-                # If this is a return-to-start function, move the end keyframe to start value
-                if is_return_to_start:
-                    end_kf.co = (end_frame, start_value)
-                
-                modified_count += 1
+            try:
+                driver_fcurve = obj.driver_add(fcurve.data_path, fcurve.array_index)
+            except TypeError:
+                # Not an array property
+                driver_fcurve = obj.driver_add(fcurve.data_path)
+            driver = driver_fcurve.driver
+            driver.type = 'SCRIPTED'
+            driver.use_self = True
+            driver.expression = f'{DRIVER_FUNCTION}(self, frame, "{key}")'
             
-            # Now set ALL keyframes in the fcurve to linear with vector handles
-            # This must happen AFTER all insertions to ensure clean linear interpolation
-            for kp in fcurve.keyframe_points:
-                kp.interpolation = 'LINEAR'
-                kp.handle_left_type = 'VECTOR'
-                kp.handle_right_type = 'VECTOR'
-        
-        # Update the view
-        for area in context.screen.areas:
-            if area.type in ('GRAPH_EDITOR', 'DOPESHEET_EDITOR'):
-                area.tag_redraw()
-        
-        if modified_count > 0:
+            # End keys go back to the start value, like the keyframe bake does
             if is_return_to_start:
-                self.report({'INFO'}, f"Applied {self.interp_name} to {modified_count} curve segment(s) - Returns to start")
-            else:
-                self.report({'INFO'}, f"Applied {self.interp_name} to {modified_count} curve segment(s)")
-        else:
+                keys["co"][:, 1] = values
+                write_keyframe_arrays(fcurve, keys)
+            
+            driven_count += 1
+            segment_count += len(segments)
+        
+        if driven_count == 0:
             self.report({'WARNING'}, "No valid keyframe pairs selected")
+            return {'CANCELLED'}
         
+        invalidate_selection_stats()
+        self.report({'INFO'}, f"Driving {driven_count} channel(s), {segment_count} segment(s) with {self.interp_name}")
         return {'FINISHED'}
     
     def execute(self, context):
+        if self.output_mode == 'DRIVER':
+            return self.apply_drivers(context)
         if self.output_mode == 'GEO_NODES':
             try:
-                node_group = self.create_geometry_node_group(context)
-                self.report({'INFO'}, f"Created Geometry Nodes group: {node_group.name}")
+                node_group, reused = self.create_geometry_node_group(context)
+                if reused:
+                    self.report({'INFO'}, f"Reused Geometry Nodes group: {node_group.name}")
+                else:
+                    self.report({'INFO'}, f"Created Geometry Nodes group: {node_group.name}")
                 return {'FINISHED'}
             except Exception as e:
                 self.report({'ERROR'}, f"Failed to create Geometry Nodes group: {str(e)}")
                 return {'CANCELLED'}
+        elif self.background and context.window is not None:
+            # Hand over to the modal variant, it makes its own undo step once done
+            bpy.ops.anim.apply_interpolation_modal('INVOKE_DEFAULT', **self.as_keywords())
+            return {'CANCELLED'}
         else:
             return self.apply_to_keyframes(context)
     
@@ -373,12 +1132,10 @@ class ANIM_OT_apply_interpolation(bpy.types.Operator):
     def draw(self, context):
         layout = self.layout
         
-        # Show large preview image (remove ↺ for filename lookup)
-        safe_name = self.interp_name.replace(" ↺", "").replace(" ", "_").replace("+", "plus").replace("/", "_")
-        pcoll = preview_collections.get("main")
-        if pcoll and safe_name in pcoll:
-            icon = pcoll[safe_name]
-            layout.template_icon(icon_value=icon.icon_id, scale=10.0)
+        # Show large preview image
+        icon_id = get_preview_icon(self.interp_name)
+        if icon_id:
+            layout.template_icon(icon_value=icon_id, scale=10.0)
         
         layout.label(text=self.interp_name, icon='FCURVE')
         layout.separator()
@@ -387,12 +1144,23 @@ class ANIM_OT_apply_interpolation(bpy.types.Operator):
         box = layout.box()
         box.label(text="Output Mode:", icon='EXPORT')
         box.prop(self, "output_mode", expand=True)
+        if self.output_mode in {'KEYFRAMES', 'BEZIER'}:
+            box.prop(self, "channel_filter")
+            box.prop(self, "batch")
+            box.prop(self, "background")
         
         layout.separator()
         
         # Main parameters
         col = layout.column(align=True)
-        col.prop(self, "samples")
+        if self.output_mode == 'BEZIER':
+            col.prop(self, "max_error")
+        elif self.output_mode != 'DRIVER':
+            col.prop(self, "sampling_mode", expand=True)
+            if self.sampling_mode == 'ADAPTIVE' and self.output_mode == 'KEYFRAMES':
+                col.prop(self, "max_error")
+            else:
+                col.prop(self, "samples")
         col.prop(self, "influence")
         
         layout.separator()
@@ -405,6 +1173,190 @@ class ANIM_OT_apply_interpolation(bpy.types.Operator):
         col.prop(self, "overshoot")
         col.prop(self, "time_scale")
 
+# Background apply: seconds of baking per timer tick, the rest of the time is left to the UI
+MODAL_TICK_BUDGET = 0.05
+MODAL_TIMER_INTERVAL = 0.01
+
+# Events let through while a background apply runs: viewport navigation only,
+# anything else could edit (or undo) the keys being baked
+MODAL_NAVIGATION_EVENTS = {
+    'MOUSEMOVE', 'INBETWEEN_MOUSEMOVE', 'MIDDLEMOUSE', 'WHEELUPMOUSE', 'WHEELDOWNMOUSE',
+    'TRACKPADPAN', 'TRACKPADZOOM', 'MOUSEROTATE', 'NDOF_MOTION',
+}
+
+class ANIM_OT_apply_interpolation_modal(ApplyInterpolationMixin, bpy.types.Operator):
+    """Apply custom interpolation a few fcurves at a time, with progress in the status bar (Esc cancels)"""
+    bl_idname = "anim.apply_interpolation_modal"
+    bl_label = "Apply Interpolation (Background)"
+    # No redo panel, redoing would bake everything again in one blocking go
+    bl_options = {'UNDO'}
+    
+    def invoke(self, context, event):
+        channelbags = collect_channelbags(context, self.batch)
+        if not channelbags:
+            self.report({'WARNING'}, "No animation data found. Select object with keyframes or use Geometry Nodes mode.")
+            return {'CANCELLED'}
+        
+        self.stats = RunStats()
+        self.fallbacks_before = curve_cache.fallbacks
+        self.fcurves, self.key_snapshots, fcurves_visited = self.gather_keyframes(context, channelbags)
+        self.stats.counters = {"actions": action_count(channelbags), "fcurves_visited": fcurves_visited,
+                               "fcurves_baked": len(self.fcurves)}
+        self.stats.lap("gather")
+        
+        if not self.fcurves:
+            self.report({'WARNING'}, "No valid keyframe pairs selected")
+            return {'CANCELLED'}
+        
+        self.baker = CurveBaker(BakeSettings.from_operator(self))
+        self.chunk_size = os.cpu_count() or 1
+        self.done = 0
+        self.modified_count = 0
+        # Keys of every written fcurve as they were, for Esc
+        self.originals = []
+        
+        window_manager = context.window_manager
+        self.timer = window_manager.event_timer_add(MODAL_TIMER_INTERVAL, window=context.window)
+        window_manager.modal_handler_add(self)
+        self.show_progress(context)
+        return {'RUNNING_MODAL'}
+    
+    def execute(self, context):
+        # Run from a script: no timer to wait for, bake everything in one go
+        return self.apply_to_keyframes(context)
+    
+    def modal(self, context, event):
+        if event.type == 'ESC':
+            self.rollback(context)
+            self.report({'WARNING'}, f"Cancelled {self.interp_name}, {len(self.originals)} fcurve(s) restored")
+            return {'CANCELLED'}
+        
+        if event.type != 'TIMER':
+            return {'PASS_THROUGH'} if event.type in MODAL_NAVIGATION_EVENTS else {'RUNNING_MODAL'}
+        
+        # Every timer of the window sends TIMER events, leave other operators' to them
+        if event.timer is not self.timer:
+            return {'PASS_THROUGH'}
+        
+        # Idle time between ticks doesn't count towards the throughput
+        self.stats.resume()
+        deadline = time.perf_counter() + MODAL_TICK_BUDGET
+        while self.done < len(self.fcurves) and time.perf_counter() < deadline:
+            self.bake_chunk()
+        
+        if self.done < len(self.fcurves):
+            self.show_progress(context)
+            return {'RUNNING_MODAL'}
+        
+        self.stop(context)
+        invalidate_selection_stats()
+        self.finish_keyframes(context, self.stats, self.baker, self.modified_count, self.fallbacks_before)
+        return {'FINISHED'}
+    
+    def cancel(self, context):
+        # The handler is being removed from outside (window closed, file loaded),
+        # the fcurves may already be gone so there is nothing to restore
+        self.stop(context)
+    
+    def bake_chunk(self):
+        """Bake and write the next few fcurves"""
+        chunk = slice(self.done, self.done + self.chunk_size)
+        key_snapshots = self.key_snapshots[chunk]
+        
+        # Baking edits the snapshots in place
+        self.originals.extend({attr: array.copy() for attr, array in keys.items()} for keys in key_snapshots)
+        results = self.baker.bake_fcurves(key_snapshots)
+        self.stats.lap("bake")
+        
+        for fcurve, (keys, segment_count) in zip(self.fcurves[chunk], results):
+            write_keyframe_arrays(fcurve, keys)
+            self.modified_count += segment_count
+        self.stats.lap("write")
+        
+        # Written, the snapshot isn't needed anymore
+        self.key_snapshots[chunk] = [None] * len(key_snapshots)
+        self.done += len(key_snapshots)
+    
+    def rollback(self, context):
+        """Write back the original keys of every fcurve changed so far"""
+        self.stop(context)
+        for fcurve, keys in zip(self.fcurves, self.originals):
+            write_keyframe_arrays(fcurve, keys)
+        invalidate_selection_stats()
+        
+        for area in context.screen.areas:
+            if area.type in ('GRAPH_EDITOR', 'DOPESHEET_EDITOR'):
+                area.tag_redraw()
+    
+    def show_progress(self, context):
+        total = len(self.fcurves)
+        context.workspace.status_text_set(
+            f"Applying {self.interp_name}: {self.done}/{total} fcurves ({self.done * 100 // total}%), Esc to cancel")
+    
+    def stop(self, context):
+        context.window_manager.event_timer_remove(self.timer)
+        context.workspace.status_text_set(None)
+
+class ANIM_OT_merge_interpolation_node_groups(bpy.types.Operator):
+    """Merge identical interpolation node groups into one and remove the copies"""
+    bl_idname = "anim.merge_interpolation_node_groups"
+    bl_label = "Merge Duplicate Node Groups"
+    bl_options = {'REGISTER', 'UNDO'}
+    
+    def execute(self, context):
+        duplicates = {}
+        for node_group in bpy.data.node_groups:
+            key = node_group_fingerprint(node_group)
+            if key is not None:
+                duplicates.setdefault(key, []).append(node_group)
+        
+        removed_count = 0
+        for node_groups in duplicates.values():
+            if len(node_groups) < 2:
+                continue
+            
+            # Keep a hashed group if there is one, then the most used, then by name
+            keep = min(node_groups, key=lambda node_group: (NODE_GROUP_HASH_PROPERTY not in node_group,
+                                                            -node_group.users, node_group.name))
+            function_names = sorted({node_group_function_name(node_group) for node_group in node_groups})
+            for node_group in node_groups:
+                if node_group == keep:
+                    continue
+                node_group.user_remap(keep)
+                bpy.data.node_groups.remove(node_group)
+                removed_count += 1
+            
+            # Different functions with the same curve (Ease Out Quad and Gravity Fall),
+            # named after all of them rather than whichever group was kept
+            if len(function_names) > 1:
+                keep.name = NODE_GROUP_PREFIX + " / ".join(function_names)
+        
+        if removed_count:
+            self.report({'INFO'}, f"Merged {removed_count} duplicate node group(s)")
+        else:
+            self.report({'INFO'}, "No duplicate node groups found")
+        return {'FINISHED'}
+
+def draw_function_button(layout, name):
+    """Operator button for one function, with its preview icon (name includes ↺ symbol)"""
+    op = layout.operator(ANIM_OT_apply_interpolation.bl_idname, text=name,
+                         icon_value=get_preview_icon(name))
+    op.interp_name = name
+
+class InterpolationBrowserSettings(bpy.types.PropertyGroup):
+    """Sidebar browser state (per window manager, not saved)"""
+    search: bpy.props.StringProperty(
+        name="Search",
+        description="Filter functions by name (letters can be spread out, e.g. \"eio sin\")",
+        options={'TEXTEDIT_UPDATE'}
+    )
+    
+    expanded_categories: bpy.props.BoolVectorProperty(
+        name="Expanded Categories",
+        size=len(CATEGORIES),
+        default=[False] * len(CATEGORIES)
+    )
+
 class VIEW3D_PT_custom_interpolation(bpy.types.Panel):
     """Main panel in 3D Viewport sidebar"""
     bl_label = "Custom Interpolation"
@@ -424,14 +1376,13 @@ class VIEW3D_PT_custom_interpolation(bpy.types.Panel):
         
         # Show animation status (but don't require it)
         box = layout.box()
-        if not obj.animation_data or not obj.animation_data.action:
+        channelbag = animation_channelbag(obj.animation_data)
+        if channelbag is None:
             box.label(text="No animation data", icon='INFO')
             box.label(text="Functions work in Geo Nodes mode")
         else:
-            # Count selected keyframes
-            selected_count = 0
-            for fcurve in obj.animation_data.action.fcurves:
-                selected_count += len([kp for kp in fcurve.keyframe_points if kp.select_control_point])
+            # Count selected keyframes (cached, only recounted when something changed)
+            selected_count = get_selected_keyframe_count(context, channelbag)
             
             if selected_count < 2:
                 box.label(text="Select 2+ keyframes", icon='INFO')
@@ -442,64 +1393,177 @@ class VIEW3D_PT_custom_interpolation(bpy.types.Panel):
         
         layout.separator()
         
-        # Get preview collection
-        pcoll = preview_collections.get("main")
-        
-        # Category colors for visual distinction
-        category_colors = {
-            "SMOOTH & CLASSIC": 'COLORSET_01_VEC',
-            "ELASTIC & SPRINGY": 'COLORSET_03_VEC',
-            "BOUNCY & OVERSHOOT": 'COLORSET_02_VEC',
-            "EXPONENTIAL & POWER": 'COLORSET_06_VEC',
-            "RHYTHMIC & WAVES": 'COLORSET_04_VEC',
-            "ORGANIC & NATURAL": 'COLORSET_14_VEC',
-            "GLITCHY & DIGITAL": 'COLORSET_09_VEC',
-            "EXTREME & WILD": 'COLORSET_01_VEC',
-            "MECHANICAL & ROBOTIC": 'COLORSET_15_VEC',
-            "COMPLEX STORIES": 'COLORSET_08_VEC',
-        }
+        # Search box, matches are listed flat across categories
+        browser = context.window_manager.interp_browser
+        layout.prop(browser, "search", text="", icon='VIEWZOOM')
         
-        # Display all interpolations organized by category with color coding
-        for category_name, function_list in CATEGORIES.items():
-            # Category header with colored icon
+        if browser.search.strip():
+            names = search_functions(browser.search)
+            box = layout.box()
+            if not names:
+                box.label(text="No matching functions", icon='INFO')
+            for name in names:
+                draw_function_button(box, name)
+            return
+        
+        # Display interpolations organized by category with color coding,
+        # only expanded categories lay out their buttons
+        for index, (category_name, color_icon, names) in enumerate(category_index):
+            # Category header with expand toggle and colored icon
             box = layout.box()
             row = box.row()
             
-            # Use a colored icon for the category
-            color_icon = category_colors.get(category_name, 'DOT')
+            expanded = browser.expanded_categories[index]
+            row.prop(browser, "expanded_categories", index=index, text="",
+                     icon='TRIA_DOWN' if expanded else 'TRIA_RIGHT', emboss=False)
             row.label(text=category_name, icon=color_icon)
             
-            # Display functions in this category
-            for name in function_list:
-                if name in INTERPOLATION_FUNCTIONS:
-                    # Remove ↺ for filename lookup but keep in display
-                    safe_name = name.replace(" ↺", "").replace(" ", "_").replace("+", "plus").replace("/", "_")
-                    
-                    # Get the icon if available
-                    if pcoll and safe_name in pcoll:
-                        icon = pcoll[safe_name].icon_id
-                    else:
-                        icon = 0
-                    
-                    # Create operator button with icon (name includes ↺ symbol)
-                    op = box.operator(ANIM_OT_apply_interpolation.bl_idname, text=name, icon_value=icon)
-                    op.interp_name = name
+            if expanded:
+                for name in names:
+                    draw_function_button(box, name)
             
             layout.separator()
+        
+        layout.operator(ANIM_OT_merge_interpolation_node_groups.bl_idname, icon='NODETREE')
+
+def update_curve_cache_size(self, context):
+    curve_cache.set_max_bytes(self.curve_cache_size * 1024 * 1024)
+
+class CustomInterpolationPreferences(bpy.types.AddonPreferences):
+    """Addon preferences"""
+    bl_idname = __name__
+    
+    curve_cache_size: bpy.props.IntProperty(
+        name="Curve Cache Size (MB)",
+        description="Memory used to keep evaluated curves around between operator runs",
+        default=16,
+        min=1,
+        max=1024,
+        update=update_curve_cache_size
+    )
+    
+    log_timings: bpy.props.BoolProperty(
+        name="Log Timings",
+        description="Print a per-phase timing breakdown to the console after every keyframe apply",
+        default=False
+    )
+    
+    preview_cache_size: bpy.props.IntProperty(
+        name="Loaded Preview Icons",
+        description="Most preview icons kept loaded, the least recently shown are dropped first",
+        default=DEFAULT_PREVIEW_CACHE_SIZE,
+        min=8,
+        max=1000
+    )
+    
+    unload_idle_previews: bpy.props.BoolProperty(
+        name="Unload Idle Previews",
+        description="Free all preview icons when the panel has not been drawn for a while",
+        default=False
+    )
+    
+    preview_idle_minutes: bpy.props.IntProperty(
+        name="Idle Minutes",
+        description="Minutes without drawing before preview icons are freed",
+        default=5,
+        min=1,
+        max=240
+    )
+    
+    def draw(self, context):
+        layout = self.layout
+        layout.prop(self, "curve_cache_size")
+        layout.prop(self, "log_timings")
+        
+        col = layout.column(align=True)
+        col.prop(self, "preview_cache_size")
+        col.prop(self, "unload_idle_previews")
+        sub = col.row()
+        sub.active = self.unload_idle_previews
+        sub.prop(self, "preview_idle_minutes")
+        
+        # Cache counters, to help pick a size
+        stats = curve_cache.stats()
+        box = layout.box()
+        box.label(text=f"Cached curves: {stats['entries']} ({stats['bytes'] / 1024:.1f} KB)", icon='INFO')
+        box.label(text=f"Hits: {stats['hits']}   Misses: {stats['misses']}   Evictions: {stats['evictions']}")
+        
+        if last_run_stats:
+            box = layout.box()
+            box.label(text=f"Last apply: {last_run_stats['interp_name']} in {last_run_stats['total'] * 1000:.1f} ms", icon='TIME')
+            box.label(text="   ".join(f"{phase}: {seconds * 1000:.1f} ms" for phase, seconds in last_run_stats["phases"].items()))
+
+def get_addon_preferences():
+    addon = bpy.context.preferences.addons.get(__name__)
+    return addon.preferences if addon else None
 
 def register():
+    bpy.utils.register_class(CustomInterpolationPreferences)
+    bpy.utils.register_class(InterpolationBrowserSettings)
     bpy.utils.register_class(ANIM_OT_apply_interpolation)
+    bpy.utils.register_class(ANIM_OT_apply_interpolation_modal)
+    bpy.utils.register_class(ANIM_OT_merge_interpolation_node_groups)
     bpy.utils.register_class(VIEW3D_PT_custom_interpolation)
     
-    # Load preview icons
-    load_preview_icons()
+    bpy.types.WindowManager.interp_browser = bpy.props.PointerProperty(type=InterpolationBrowserSettings)
+    
+    # Keep the sidebar's selected keyframe count up to date
+    bpy.app.handlers.depsgraph_update_post.append(selection_stats_depsgraph_update)
+    bpy.app.handlers.load_post.append(selection_stats_load_post)
+    bpy.app.handlers.undo_post.append(invalidate_selection_stats)
+    bpy.app.handlers.redo_post.append(invalidate_selection_stats)
+    subscribe_selection_stats()
+    for handlers in (bpy.app.handlers.load_post, bpy.app.handlers.undo_post, bpy.app.handlers.redo_post):
+        handlers.append(clear_action_indices)
+    
+    # Driver output mode, load_post registers again after a file is opened
+    register_driver_function()
+    bpy.app.handlers.load_post.append(driver_namespace_load_post)
+    
+    # Apply saved cache size
+    prefs = get_addon_preferences()
+    if prefs:
+        curve_cache.set_max_bytes(prefs.curve_cache_size * 1024 * 1024)
+    
+    # Tables baked with curve_library.py are read from the file instead of evaluated
+    curve_cache.library = CurveLibrary.load(get_addon_dir())
+    
+    # Index functions, preview icons are only loaded once something draws them
+    build_function_index()
+    
+    # Nothing draws in background mode, so there is nothing to unload
+    if not bpy.app.background:
+        bpy.app.timers.register(unload_idle_previews, first_interval=PREVIEW_IDLE_CHECK_INTERVAL, persistent=True)
 
 def unregister():
     # Unload preview icons
+    if bpy.app.timers.is_registered(unload_idle_previews):
+        bpy.app.timers.unregister(unload_idle_previews)
     unload_preview_icons()
     
+    bpy.msgbus.clear_by_owner(selection_msgbus_owner)
+    bpy.app.handlers.depsgraph_update_post.remove(selection_stats_depsgraph_update)
+    bpy.app.handlers.load_post.remove(selection_stats_load_post)
+    bpy.app.handlers.undo_post.remove(invalidate_selection_stats)
+    bpy.app.handlers.redo_post.remove(invalidate_selection_stats)
+    for handlers in (bpy.app.handlers.load_post, bpy.app.handlers.undo_post, bpy.app.handlers.redo_post):
+        handlers.remove(clear_action_indices)
+    action_indices.clear()
+    bpy.app.handlers.load_post.remove(driver_namespace_load_post)
+    bpy.app.driver_namespace.pop(DRIVER_FUNCTION, None)
+    driver_curves.clear()
+    
     bpy.utils.unregister_class(VIEW3D_PT_custom_interpolation)
+    bpy.utils.unregister_class(ANIM_OT_merge_interpolation_node_groups)
+    bpy.utils.unregister_class(ANIM_OT_apply_interpolation_modal)
     bpy.utils.unregister_class(ANIM_OT_apply_interpolation)
+    
+    del bpy.types.WindowManager.interp_browser
+    bpy.utils.unregister_class(InterpolationBrowserSettings)
+    bpy.utils.unregister_class(CustomInterpolationPreferences)
+    
+    curve_cache.clear()
+    curve_cache.library = None
 
 if __name__ == "__main__":
     register()
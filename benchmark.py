@@ -0,0 +1,382 @@
+"""
+Run this script to benchmark the addon outside Blender.
+It times every interpolation function (scalar and vectorized), keyframe
+baking through ANIM_OT_apply_interpolation.apply_to_keyframes on stand-in
+fcurves, and preview rendering, then writes the results as JSON.
+
+    python benchmark.py --output results.json
+    python benchmark.py --compare baseline.json --threshold 0.1
+
+With --compare, the run fails (exit code 1) when any benchmark lost more
+than the threshold in ops/sec or grew its peak memory by more than it.
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+import types
+import numpy as np
+
+ADDON_DIR = os.path.dirname(os.path.realpath(__file__))
+
+# (fcurves, selected keys per fcurve) for the keyframe benchmarks
+KEYFRAME_SCENARIOS = [
+    (1, 2), (1, 100), (1, 1000),
+    (100, 2), (100, 100), (100, 1000),
+    (10000, 2), (10000, 20),
+]
+
+# Scenarios left out by --quick
+LARGE_FCURVE_COUNT = 10000
+
+# Facial rig for the channel filter benchmarks: bones, fcurves per bone
+# (location, quaternion rotation, scale), bones with selected keys
+RIG_BONES = 300
+RIG_CHANNELS = [("location", 3), ("rotation_quaternion", 4), ("scale", 3)]
+RIG_SELECTED_BONES = 3
+
+# Interpolation baked in the keyframe benchmarks
+KEYFRAME_FUNCTION = "Ease InOut Cubic"
+
+# t values per call in the function benchmarks
+FUNCTION_SAMPLES = 1000
+
+def install_fake_bpy():
+    """Put a stand-in bpy module in sys.modules, enough to import the addon and bake keyframes"""
+    bpy = types.ModuleType("bpy")
+    bpy.types = types.SimpleNamespace(Operator=object, Panel=object, AddonPreferences=object,
+                                      PropertyGroup=object)
+
+    # Properties just evaluate to their default (see new_operator)
+    class Props:
+        def __getattr__(self, name):
+            return lambda *args, **kwargs: kwargs.get("default")
+    bpy.props = Props()
+
+    # No addon preferences, the addon falls back to its defaults
+    bpy.context = types.SimpleNamespace(preferences=types.SimpleNamespace(addons={}))
+
+    utils = types.ModuleType("bpy.utils")
+    previews = types.ModuleType("bpy.utils.previews")
+    utils.previews = previews
+    bpy.utils = utils
+
+    app = types.ModuleType("bpy.app")
+    handlers = types.ModuleType("bpy.app.handlers")
+    handlers.persistent = lambda func: func
+    app.handlers = handlers
+    app.background = True
+    bpy.app = app
+
+    sys.modules.update({
+        "bpy": bpy,
+        "bpy.utils": utils,
+        "bpy.utils.previews": previews,
+        "bpy.app": app,
+        "bpy.app.handlers": handlers,
+    })
+    return bpy
+
+def import_addon():
+    """Import the addon package (with the stand-in bpy)"""
+    install_fake_bpy()
+    spec = importlib.util.spec_from_file_location("interp_addon", os.path.join(ADDON_DIR, "__init__.py"),
+                                                  submodule_search_locations=[ADDON_DIR])
+    addon = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = addon
+    spec.loader.exec_module(addon)
+    return addon
+
+class FakeKeyframePoints:
+    """Keyframe storage with the foreach_get/foreach_set/clear/add API, backed by numpy arrays"""
+
+    def __init__(self, attributes, count=0):
+        self.attributes = attributes
+        self.arrays = {attr: np.zeros(count * width, dtype=dtype)
+                       for attr, (dtype, width) in attributes.items()}
+
+    def __len__(self):
+        return len(self.arrays["co"]) // 2
+
+    def clear(self):
+        self.arrays = {attr: array[:0] for attr, array in self.arrays.items()}
+
+    def add(self, count):
+        for attr, (dtype, width) in self.attributes.items():
+            self.arrays[attr] = np.concatenate([self.arrays[attr], np.zeros(count * width, dtype=dtype)])
+
+    def foreach_get(self, attr, out):
+        out[:] = self.arrays[attr]
+
+    def foreach_set(self, attr, data):
+        array = self.arrays[attr]
+        if len(data) != len(array):
+            raise ValueError(f"foreach_set: expected {len(array)} values for {attr}, got {len(data)}")
+        array[:] = data
+
+class FakeFCurve:
+    def __init__(self, attributes, frames, values, data_path="location", selected=True):
+        self.data_path = data_path
+        self.group = None
+        self.hide = False
+        self.keyframe_points = FakeKeyframePoints(attributes, len(frames))
+        arrays = self.keyframe_points.arrays
+        arrays["co"][0::2] = frames
+        arrays["co"][1::2] = values
+        arrays["handle_left"][:] = arrays["co"]
+        arrays["handle_right"][:] = arrays["co"]
+        arrays["interpolation"][:] = 2
+        for attr in ("select_control_point", "select_left_handle", "select_right_handle"):
+            arrays[attr][:] = selected
+
+    def update(self):
+        """Sort keys by frame, as Blender does"""
+        arrays = self.keyframe_points.arrays
+        order = np.argsort(arrays["co"][0::2], kind='stable')
+        for attr, (dtype, width) in self.keyframe_points.attributes.items():
+            arrays[attr] = arrays[attr].reshape(-1, width)[order].ravel()
+
+def new_operator(addon, **properties):
+    """Operator instance with every property at its default, plus the given overrides"""
+    op_class = addon.ANIM_OT_apply_interpolation
+    op = op_class()
+    # Properties are declared on the shared mixin
+    for cls in reversed(op_class.__mro__):
+        for name, default in vars(cls).get("__annotations__", {}).items():
+            setattr(op, name, default)
+    for name, value in properties.items():
+        setattr(op, name, value)
+    op.reports = []
+    op.report = lambda kind, message: op.reports.append(message)
+    return op
+
+def new_action_context(addon, fcurves, selected_bone_names=()):
+    """Context with an active object animated by an action of the given fcurves"""
+    # Fake actions can reuse the address of a freed one
+    addon.clear_action_indices()
+    action = types.SimpleNamespace(fcurves=fcurves, groups=[])
+    action.as_pointer = lambda: id(action)
+    action.id_data = action
+    obj = types.SimpleNamespace(animation_data=types.SimpleNamespace(action=action))
+    return types.SimpleNamespace(
+        active_object=obj,
+        selected_pose_bones=[types.SimpleNamespace(name=name) for name in selected_bone_names],
+        screen=types.SimpleNamespace(areas=[]),
+    )
+
+def new_context(addon, fcurve_count, key_count, seed=0):
+    """Context with an active object whose action has fcurve_count fcurves of key_count selected keys"""
+    rng = np.random.default_rng(seed)
+    frames = np.arange(key_count, dtype=np.float32) * 10
+    fcurves = [FakeFCurve(addon.KEYFRAME_ARRAY_ATTRIBUTES, frames, rng.uniform(-5, 5, key_count))
+               for _ in range(fcurve_count)]
+    return new_action_context(addon, fcurves)
+
+def new_rig_context(addon, key_count, seed=0):
+    """Context with a RIG_BONES bone action, keys selected (and bones selected) on the first RIG_SELECTED_BONES"""
+    rng = np.random.default_rng(seed)
+    frames = np.arange(key_count, dtype=np.float32) * 10
+    bone_names = [f"bone_{i}" for i in range(RIG_BONES)]
+    fcurves = [FakeFCurve(addon.KEYFRAME_ARRAY_ATTRIBUTES, frames, rng.uniform(-5, 5, key_count),
+                          data_path=f'pose.bones["{name}"].{prop}', selected=i < RIG_SELECTED_BONES)
+               for i, name in enumerate(bone_names)
+               for prop, width in RIG_CHANNELS for _ in range(width)]
+    return new_action_context(addon, fcurves, bone_names[:RIG_SELECTED_BONES])
+
+def time_runs(run, setup=None, min_time=0.2, max_runs=50):
+    """Median seconds per run; setup (untimed) builds the argument for each run"""
+    times = []
+    started = time.perf_counter()
+    while len(times) < max_runs and (not times or time.perf_counter() - started < min_time):
+        arg = setup() if setup else None
+        start = time.perf_counter()
+        run(arg)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times), len(times)
+
+def peak_memory(run, setup=None):
+    """Peak bytes allocated by one run (numpy arrays included)"""
+    arg = setup() if setup else None
+    tracemalloc.start()
+    try:
+        run(arg)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def benchmark_functions(addon, min_time):
+    """Calls per second of every function, scalar (one t per call) and vectorized (FUNCTION_SAMPLES per call)"""
+    results = {}
+    values = [i / (FUNCTION_SAMPLES - 1) for i in range(FUNCTION_SAMPLES)]
+    t = np.array(values)
+    vectorized = addon.vectorized_functions.VECTORIZED_FUNCTIONS
+
+    for name, func in addon.INTERPOLATION_FUNCTIONS.items():
+        def run_scalar(_):
+            for value in values:
+                try:
+                    func(value)
+                except Exception:
+                    pass
+        seconds, runs = time_runs(run_scalar, min_time=min_time)
+        results[f"functions/scalar/{name}"] = {"ops_per_sec": FUNCTION_SAMPLES / seconds, "runs": runs}
+
+        vector_func = vectorized.get(name)
+        if vector_func is not None:
+            seconds, runs = time_runs(lambda _: vector_func(t), min_time=min_time)
+            results[f"functions/vectorized/{name}"] = {"ops_per_sec": FUNCTION_SAMPLES / seconds,
+                                                       "runs": runs}
+
+    return results
+
+def benchmark_keyframes(addon, min_time, quick=False):
+    """Applies per second of apply_to_keyframes on stand-in fcurves, all keys selected"""
+    results = {}
+
+    for fcurve_count, key_count in KEYFRAME_SCENARIOS:
+        if quick and fcurve_count >= LARGE_FCURVE_COUNT:
+            continue
+
+        op = new_operator(addon, interp_name=KEYFRAME_FUNCTION)
+        setup = lambda: new_context(addon, fcurve_count, key_count)
+
+        def run(context):
+            op.reports.clear()
+            addon.curve_cache.clear()
+            if op.apply_to_keyframes(context) != {'FINISHED'}:
+                raise RuntimeError(f"apply_to_keyframes failed: {op.reports}")
+
+        seconds, runs = time_runs(run, setup, min_time=min_time, max_runs=20)
+        results[f"keyframes/{fcurve_count}x{key_count}"] = {
+            "ops_per_sec": 1.0 / seconds,
+            "keys_per_sec": fcurve_count * key_count / seconds,
+            "peak_bytes": peak_memory(run, setup),
+            "runs": runs,
+        }
+
+    # A big rig with a few bones touched, every channel vs only the selected bones'.
+    # The sidebar has indexed the action by the time the operator runs
+    def rig_setup():
+        context = new_rig_context(addon, 4)
+        addon.get_action_index(context.active_object.animation_data.action)
+        return context
+
+    for channel_filter in ('ALL', 'SELECTED_BONES'):
+        op = new_operator(addon, interp_name=KEYFRAME_FUNCTION, channel_filter=channel_filter)
+        setup = rig_setup
+
+        def run(context):
+            op.reports.clear()
+            if op.apply_to_keyframes(context) != {'FINISHED'}:
+                raise RuntimeError(f"apply_to_keyframes failed: {op.reports}")
+
+        seconds, runs = time_runs(run, setup, min_time=min_time, max_runs=20)
+        results[f"keyframes/rig{RIG_BONES}/{channel_filter.lower()}"] = {"ops_per_sec": 1.0 / seconds, "runs": runs}
+
+    return results
+
+def benchmark_previews(min_time):
+    """Previews per second from generate_preview, each function once per run with a cold curve cache"""
+    sys.path.insert(0, ADDON_DIR)
+    import generate_interp_previews
+    from curve_cache import curve_cache
+
+    def run(_):
+        curve_cache.clear()
+        for name, func in generate_interp_previews.INTERPOLATION_FUNCTIONS.items():
+            generate_interp_previews.generate_preview(func, name)
+
+    count = len(generate_interp_previews.INTERPOLATION_FUNCTIONS)
+    seconds, runs = time_runs(run, min_time=min_time, max_runs=10)
+    return {"previews/generate_preview": {
+        "ops_per_sec": count / seconds,
+        "peak_bytes": peak_memory(run),
+        "runs": runs,
+    }}
+
+def compare_results(results, baseline, threshold):
+    """Print regressions against a baseline run, returns True when there are none"""
+    regressions = []
+    improvements = 0
+
+    for name, current in sorted(results.items()):
+        base = baseline.get(name)
+        if base is None:
+            continue
+
+        ratio = current["ops_per_sec"] / base["ops_per_sec"]
+        if ratio < 1 - threshold:
+            regressions.append(f"{name}: {base['ops_per_sec']:.1f} -> {current['ops_per_sec']:.1f} ops/sec ({ratio - 1:+.0%})")
+        elif ratio > 1 + threshold:
+            improvements += 1
+
+        if "peak_bytes" in current and base.get("peak_bytes"):
+            growth = current["peak_bytes"] / base["peak_bytes"]
+            if growth > 1 + threshold:
+                regressions.append(f"{name}: peak memory {base['peak_bytes'] / 1024:.0f} -> "
+                                   f"{current['peak_bytes'] / 1024:.0f} KB ({growth - 1:+.0%})")
+
+    missing = sorted(set(baseline) - set(results))
+
+    for line in regressions:
+        print(f"✗ {line}")
+    print(f"\n{len(regressions)} regression(s), {improvements} improvement(s) over {threshold:.0%}, "
+          f"{len(missing)} baseline benchmark(s) not run")
+    return not regressions
+
+def run_benchmarks(groups, min_time=0.2, quick=False):
+    """Run the benchmark groups ("functions", "keyframes", "previews"), returns the JSON report"""
+    addon = import_addon()
+    results = {}
+
+    if "functions" in groups:
+        print("Timing interpolation functions...")
+        results.update(benchmark_functions(addon, min_time / 10))
+    if "keyframes" in groups:
+        print("Timing keyframe baking...")
+        results.update(benchmark_keyframes(addon, min_time, quick))
+    if "previews" in groups:
+        print("Timing preview rendering...")
+        results.update(benchmark_previews(min_time))
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the addon without Blender")
+    parser.add_argument("--output", help="Write the JSON report to this file (default: print it)")
+    parser.add_argument("--compare", help="Baseline JSON report to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.1, help="Allowed slowdown/memory growth (0.1 = 10%%)")
+    parser.add_argument("--only", default="functions,keyframes,previews", help="Comma separated benchmark groups")
+    parser.add_argument("--min-time", type=float, default=0.2, help="Seconds to repeat each benchmark for")
+    parser.add_argument("--quick", action="store_true", help="Skip the 10,000 fcurve scenarios")
+    args = parser.parse_args()
+
+    report = run_benchmarks(args.only.split(","), args.min_time, args.quick)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=1)
+        print(f"Results saved to: {args.output}")
+    else:
+        print(json.dumps(report, ensure_ascii=False, indent=1))
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if not compare_results(report["results"], baseline["results"], args.threshold):
+            sys.exit(1)
@@ -0,0 +1,165 @@
+"""
+Curve Lookup Table Cache
+Precomputed, shaped interpolation curves shared by the keyframe baker,
+the Geometry Nodes builder and the preview generator.
+
+A table holds the normalized curve (0 = start value, 1 = end value) at
+t = i / samples for i = 0..samples, with time scale, reverse, overshoot and
+influence already applied. Baking a segment is then just
+start + table * (end - start).
+
+Tables are kept in a least-recently-used cache with a memory cap, so
+tweaking parameters in the redo panel only evaluates each combination once.
+When a baked curve library is attached, tables it holds are read from it
+instead of being evaluated.
+"""
+
+from collections import OrderedDict
+import numpy as np
+
+# Works both inside the addon package and as a standalone script
+try:
+    from . import interpolation_functions
+    from . import vectorized_functions
+except ImportError:
+    import interpolation_functions
+    import vectorized_functions
+
+DEFAULT_MAX_BYTES = 16 * 1024 * 1024
+
+def evaluate_curve_table(name, samples, time_scale=1.0, reverse=False, overshoot=1.0, influence=100.0):
+    """Evaluate the shaped curve for a registered function at t = i / samples, i = 0..samples"""
+    table, _ = evaluate_curve_table_with_fallbacks(name, samples, time_scale, reverse, overshoot, influence)
+    return table
+
+def evaluate_curve_table_with_fallbacks(name, samples, time_scale=1.0, reverse=False, overshoot=1.0, influence=100.0):
+    """Same as evaluate_curve_table, also returns how many samples fell back to linear"""
+    t = np.arange(samples + 1, dtype=np.float64) / samples
+    return evaluate_shaped_curve(name, t, time_scale, reverse, overshoot, influence)
+
+def evaluate_shaped_curve(name, t, time_scale=1.0, reverse=False, overshoot=1.0, influence=100.0):
+    """Shaped curve of a registered function at any t in [0, 1] (an array)
+
+    Returns (values, how many samples fell back to linear).
+    """
+    # Apply time scale
+    t_scaled = np.minimum(1.0, t * time_scale)
+
+    # Apply reverse
+    if reverse:
+        t_scaled = 1.0 - t_scaled
+
+    vector_func = vectorized_functions.VECTORIZED_FUNCTIONS.get(name)
+    if vector_func is not None:
+        interp_t = vector_func(t_scaled)
+    else:
+        func = interpolation_functions.INTERPOLATION_FUNCTIONS[name]
+        interp_t = np.empty_like(t_scaled)
+        for i, value in enumerate(t_scaled.tolist()):
+            try:
+                interp_t[i] = func(value)
+            except Exception as e:
+                interp_t[i] = np.nan
+                print(f"Error evaluating {name} at t={value}: {e}")
+
+    # Fallback to linear wherever the function has no valid value
+    failed = ~np.isfinite(interp_t)
+
+    # Apply overshoot multiplier (always: the analyzed range comes from samples
+    # and can miss a peak between them)
+    if overshoot != 1.0:
+        interp_t = np.where(interp_t < 0, interp_t * overshoot,
+                            np.where(interp_t > 1, 1 + (interp_t - 1) * overshoot, interp_t))
+
+    # Apply influence (blend with linear)
+    influence_factor = influence / 100.0
+    values = t * (1 - influence_factor) + interp_t * influence_factor
+    values[failed] = t[failed]
+
+    return values, int(np.count_nonzero(failed))
+
+class CurveTableCache:
+    """LRU cache of evaluated curve tables with a memory cap in bytes"""
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.tables = OrderedDict()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # Samples that fell back to linear, counted on every lookup of a table that has them
+        self.fallbacks = 0
+        # Baked CurveLibrary to take tables from before evaluating (see curve_library)
+        self.library = None
+
+    def get(self, name, samples, time_scale=1.0, reverse=False, overshoot=1.0, influence=100.0):
+        """Get the (read-only) table for these parameters, evaluating it on a miss"""
+        key = (name, int(samples), float(time_scale), bool(reverse), float(overshoot), float(influence))
+
+        entry = self.tables.get(key)
+        if entry is not None:
+            self.hits += 1
+            self.tables.move_to_end(key)
+            table, fallbacks = entry
+            self.fallbacks += fallbacks
+            return table
+
+        self.misses += 1
+        baked = self.library.find(*key) if self.library is not None else None
+        if baked is not None:
+            # A view into the mapped file, only float32 libraries are copied since
+            # the callers do their math in float64 (the library only serves rows
+            # without fallbacks)
+            table = baked if baked.dtype == np.float64 else baked.astype(np.float64)
+            fallbacks = 0
+        else:
+            table, fallbacks = evaluate_curve_table_with_fallbacks(*key)
+        table.flags.writeable = False
+        self.fallbacks += fallbacks
+
+        self.tables[key] = (table, fallbacks)
+        self.current_bytes += table.nbytes
+        self.evict()
+
+        return table
+
+    def evict(self):
+        """Drop least recently used tables until we fit under the cap (always keeps the newest)"""
+        while self.current_bytes > self.max_bytes and len(self.tables) > 1:
+            _, (table, _) = self.tables.popitem(last=False)
+            self.current_bytes -= table.nbytes
+            self.evictions += 1
+
+    def set_max_bytes(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.evict()
+
+    def clear(self):
+        self.tables.clear()
+        self.current_bytes = 0
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.fallbacks = 0
+
+    def stats(self):
+        """Counters for sizing the cache"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "fallbacks": self.fallbacks,
+            "entries": len(self.tables),
+            "bytes": self.current_bytes,
+            "max_bytes": self.max_bytes,
+        }
+
+# Shared cache used by the whole addon
+curve_cache = CurveTableCache()
+
+def get_curve_table(name, samples, time_scale=1.0, reverse=False, overshoot=1.0, influence=100.0):
+    """Get a table from the shared cache"""
+    return curve_cache.get(name, samples, time_scale, reverse, overshoot, influence)
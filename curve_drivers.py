@@ -0,0 +1,98 @@
+"""
+Curve Drivers
+Live evaluation of an interpolation between keys, for the driver output mode.
+
+Instead of baking keys, the operator stores the selected segments of an
+fcurve and drives the property with a function from
+bpy.app.driver_namespace. Drivers run on every frame change, so a segment
+is evaluated through a lookup table built once from the curve cache:
+finding the segment is a binary search, the curve value is one linear
+interpolation between two table entries.
+
+Nothing in here touches bpy, the addon registers DriverCurve objects and
+hands them frames.
+"""
+
+from bisect import bisect_right
+
+# Works both inside the addon package and as a standalone script
+try:
+    from .curve_cache import get_curve_table
+except ImportError:
+    from curve_cache import get_curve_table
+
+# Table entries per curve, enough for the busiest curves (noise, glitches)
+DRIVER_LUT_RESOLUTION = 4096
+
+class CurveLUT:
+    """Shaped curve as a lookup table over t in [0, 1], linearly interpolated"""
+
+    def __init__(self, table):
+        # Python floats, indexing a list is much cheaper than a numpy array per call
+        self.values = table.tolist()
+        self.resolution = len(self.values) - 1
+
+    def __call__(self, t):
+        if t <= 0.0:
+            return self.values[0]
+        if t >= 1.0:
+            return self.values[-1]
+        x = t * self.resolution
+        i = int(x)
+        low = self.values[i]
+        return low + (self.values[i + 1] - low) * (x - i)
+
+def get_curve_lut(interp_name, time_scale=1.0, reverse=False, overshoot=1.0, influence=100.0):
+    """Lookup table for a function and its shaping parameters"""
+    return CurveLUT(get_curve_table(interp_name, DRIVER_LUT_RESOLUTION, time_scale,
+                                    reverse, overshoot, influence))
+
+def driver_segments(frames, values, selected, is_return_to_start=False):
+    """Segments between consecutive selected keys, as (start frame, end frame, start value, end value)
+
+    frames/values/selected are per key, sorted by frame. Like the keyframe
+    bake, return-to-start curves move each end key back to its start value
+    (the returned end value is the original one, it sets the curve's
+    amplitude), so the values list is updated in place.
+    """
+    segments = []
+    selected_indices = [i for i, is_selected in enumerate(selected) if is_selected]
+
+    for start_index, end_index in zip(selected_indices[:-1], selected_indices[1:]):
+        if frames[start_index] >= frames[end_index]:
+            continue
+
+        start_value = values[start_index]
+        segments.append((frames[start_index], frames[end_index], start_value, values[end_index]))
+
+        if is_return_to_start:
+            values[end_index] = start_value
+
+    return segments
+
+class DriverCurve:
+    """An interpolation over a set of frame segments, evaluated per frame"""
+
+    def __init__(self, lut, segments):
+        self.lut = lut
+        self.segments = sorted(segments)
+        self.starts = [segment[0] for segment in self.segments]
+
+    def evaluate(self, frame):
+        """Value at frame, or None when the frame is outside every segment"""
+        i = bisect_right(self.starts, frame) - 1
+        if i < 0:
+            return None
+
+        start_frame, end_frame, start_value, end_value = self.segments[i]
+        if frame > end_frame:
+            return None
+
+        t = (frame - start_frame) / (end_frame - start_frame)
+        return start_value + self.lut(t) * (end_value - start_value)
+
+    def hold_value(self, frame):
+        """Value of the nearest segment, held flat outside and between segments"""
+        i = max(bisect_right(self.starts, frame) - 1, 0)
+        start_frame, end_frame = self.segments[i][:2]
+        return self.evaluate(min(max(frame, start_frame), end_frame))
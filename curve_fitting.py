@@ -0,0 +1,135 @@
+"""
+Curve Fitting
+Helpers that pick as few keyframes as possible to reproduce an evaluated
+curve table (see curve_cache.py) within an error tolerance.
+"""
+
+import numpy as np
+
+# Table resolution the adaptive keys are picked from
+ADAPTIVE_RESOLUTION = 1000
+
+# Adaptive spans are checked against the curve evaluated this many times finer
+# than the table, so detail between two table entries isn't missed
+ADAPTIVE_CHECK_FACTOR = 8
+
+def adaptive_sample_indices(table, tolerance, fine_table=None):
+    """Pick table indices so straight lines between them stay within tolerance of the table
+
+    Works by error subdivision: a span is split at its worst point for as long
+    as the chord between its ends misses the table by more than tolerance.
+    With fine_table (the same curve at a multiple of the table's resolution)
+    the chords are measured against it instead and split at the table entry
+    nearest its worst point. A span between neighbouring entries can't be
+    split, so the tolerance may not be met (see polyline_error).
+    Returns sorted indices, always including both ends.
+    """
+    if fine_table is None:
+        fine_table = table
+    factor = (len(fine_table) - 1) // (len(table) - 1)
+
+    last = len(table) - 1
+    keep = [0, last]
+    spans = [(0, last)]
+
+    while spans:
+        first, end = spans.pop()
+        if end - first < 2:
+            continue
+
+        # Distance of the curve from the straight line between the span ends
+        fine_first = first * factor
+        fine_end = end * factor
+        inner = np.arange(fine_first + 1, fine_end)
+        chord = fine_table[fine_first] + (fine_table[fine_end] - fine_table[fine_first]) * (inner - fine_first) / (fine_end - fine_first)
+        error = np.abs(fine_table[fine_first + 1:fine_end] - chord)
+
+        worst = int(np.argmax(error))
+        if error[worst] > tolerance:
+            split = min(max(int(round((fine_first + 1 + worst) / factor)), first + 1), end - 1)
+            keep.append(split)
+            spans.append((first, split))
+            spans.append((split, end))
+
+    return np.sort(np.array(keep))
+
+def polyline_error(fine_table, indices, factor=1):
+    """Largest distance between fine_table and straight lines through the table entries at indices
+
+    indices are positions in a table factor times coarser than fine_table.
+    """
+    positions = np.asarray(indices) * factor
+    lines = np.interp(np.arange(len(fine_table)), positions, fine_table[positions])
+    return float(np.max(np.abs(fine_table - lines)))
+
+def table_slopes(table):
+    """Slopes (per unit t) on the left and right side of every table entry
+
+    Where both one-sided estimates agree the curve is smooth and both sides
+    get the same slope, otherwise (kinks, jumps) each side keeps its own.
+    """
+    h = 1.0 / (len(table) - 1)
+    diff = np.diff(table) / h
+
+    # Second order one-sided differences, first order next to the ends
+    left = np.empty_like(table)
+    left[1] = diff[0]
+    left[2:] = (3*table[2:] - 4*table[1:-1] + table[:-2]) / (2*h)
+    left[0] = diff[0]
+
+    right = np.empty_like(table)
+    right[-2] = diff[-1]
+    right[:-2] = (-3*table[:-2] + 4*table[1:-1] - table[2:]) / (2*h)
+    right[-1] = diff[-1]
+
+    smooth = np.abs(left - right) <= 0.1 * np.maximum(np.abs(left), np.abs(right)) + 1e-9
+    central = np.empty_like(table)
+    central[1:-1] = (table[2:] - table[:-2]) / (2*h)
+    central[0] = right[0]
+    central[-1] = left[-1]
+
+    left = np.where(smooth, central, left)
+    right = np.where(smooth, central, right)
+    return left, right, smooth
+
+def fit_bezier_keys(table, tolerance):
+    """Pick table indices and handle slopes for Bezier keys that follow the table within tolerance
+
+    Each span between two keys is a cubic Bezier with handles a third of the
+    way along the span (how Blender shapes fcurve segments), so it is a cubic
+    Hermite curve through the end values with the end slopes. Spans are split
+    at their worst point until they fit.
+
+    Returns (indices, left_slopes, right_slopes, smooth) for the picked keys,
+    slopes are per unit t.
+    """
+    left, right, smooth = table_slopes(table)
+    h = 1.0 / (len(table) - 1)
+    last = len(table) - 1
+    keep = [0, last]
+    spans = [(0, last)]
+
+    while spans:
+        first, end = spans.pop()
+        if end - first < 2:
+            continue
+
+        # Bezier through the span ends, with handles from the slopes
+        u = (np.arange(first + 1, end) - first) / (end - first)
+        width = (end - first) * h
+        p0 = table[first]
+        p1 = p0 + right[first] * width / 3
+        p3 = table[end]
+        p2 = p3 - left[end] * width / 3
+        curve = (1-u)**3*p0 + 3*(1-u)**2*u*p1 + 3*(1-u)*u**2*p2 + u**3*p3
+
+        error = np.abs(table[first + 1:end] - curve)
+        worst = int(np.argmax(error))
+        if error[worst] > tolerance:
+            split = first + 1 + worst
+            keep.append(split)
+            spans.append((first, split))
+            spans.append((split, end))
+
+    indices = np.sort(np.array(keep))
+    return indices, left[indices], right[indices], smooth[indices]
@@ -0,0 +1,538 @@
+"""
+Curve Kernel
+The keyframe baking math, without any bpy access.
+
+The operator snapshots the keyframes of every fcurve into numpy arrays
+(one dict of arrays per fcurve, see KEYFRAME_ARRAY_ATTRIBUTES), hands them
+to a CurveBaker, and writes the returned arrays back on the main thread.
+Because nothing in here touches Blender data, fcurves can be baked in a
+thread pool, and all of it runs in plain Python outside Blender
+(render farm preprocessing, profilers...):
+
+    from curve_kernel import BakeSettings, bake_keyframes
+    keys = bake_keyframes([0, 24], [0.0, 5.0], [True, True], BakeSettings("Bounce Out"))
+    frames, values = keys["co"][:, 0], keys["co"][:, 1]
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import os
+import threading
+import numpy as np
+
+# Works both inside the addon package and as a standalone script
+try:
+    from .curve_cache import get_curve_table
+    from .interpolation_functions import get_function_info
+    from .curve_fitting import ADAPTIVE_CHECK_FACTOR, ADAPTIVE_RESOLUTION, adaptive_sample_indices, fit_bezier_keys, polyline_error
+except ImportError:
+    from curve_cache import get_curve_table
+    from interpolation_functions import get_function_info
+    from curve_fitting import ADAPTIVE_CHECK_FACTOR, ADAPTIVE_RESOLUTION, adaptive_sample_indices, fit_bezier_keys, polyline_error
+
+# Every keyframe attribute we carry over when an fcurve is rewritten in bulk,
+# with the numpy dtype used for foreach_get/foreach_set and its item width
+KEYFRAME_ARRAY_ATTRIBUTES = {
+    "co": (np.float32, 2),
+    "handle_left": (np.float32, 2),
+    "handle_right": (np.float32, 2),
+    "handle_left_type": (np.int32, 1),
+    "handle_right_type": (np.int32, 1),
+    "interpolation": (np.int32, 1),
+    "type": (np.int32, 1),
+    "easing": (np.int32, 1),
+    "back": (np.float32, 1),
+    "amplitude": (np.float32, 1),
+    "period": (np.float32, 1),
+    "select_control_point": (bool, 1),
+    "select_left_handle": (bool, 1),
+    "select_right_handle": (bool, 1),
+}
+
+# Blender's integer values for Keyframe enums, as foreach_get/foreach_set use them
+INTERPOLATION_LINEAR = 1      # BEZT_IPO_LIN
+INTERPOLATION_BEZIER = 2      # BEZT_IPO_BEZ
+HANDLE_FREE = 0               # HD_FREE
+HANDLE_VECTOR = 2             # HD_VECT
+HANDLE_ALIGNED = 3            # HD_ALIGN
+KEYFRAME_TYPE_KEYFRAME = 0    # BEZT_KEYTYPE_KEYFRAME
+EASING_AUTO = 0               # BEZT_IPO_EASE_AUTO
+
+# keyframe_points.insert() merges a new key into an existing one no farther than this
+KEYFRAME_INSERT_THRESHOLD = np.float32(0.01)
+
+def new_keyframe_arrays(frames, values):
+    """Build keyframe arrays for new keys, matching what keyframe_points.insert() creates"""
+    count = len(frames)
+    co = np.column_stack((frames, values)).astype(np.float32).reshape(count, 2)
+
+    return {
+        "co": co,
+        "handle_left": co.copy(),
+        "handle_right": co.copy(),
+        "handle_left_type": np.full(count, HANDLE_VECTOR, dtype=np.int32),
+        "handle_right_type": np.full(count, HANDLE_VECTOR, dtype=np.int32),
+        "interpolation": np.full(count, INTERPOLATION_LINEAR, dtype=np.int32),
+        "type": np.full(count, KEYFRAME_TYPE_KEYFRAME, dtype=np.int32),
+        "easing": np.full(count, EASING_AUTO, dtype=np.int32),
+        "back": np.full(count, 1.70158, dtype=np.float32),
+        "amplitude": np.full(count, 0.8, dtype=np.float32),
+        "period": np.full(count, 4.1, dtype=np.float32),
+        "select_control_point": np.ones(count, dtype=bool),
+        "select_left_handle": np.ones(count, dtype=bool),
+        "select_right_handle": np.ones(count, dtype=bool),
+    }
+
+def plan_segment_samples(start_frame, end_frame, curve_table, sample_indices):
+    """Work out where the new keys of one segment land
+
+    Returns (frames, weights, start_weight, end_weight): frames and normalized
+    values of the new keys, and the normalized value of a sample that lands on
+    the start or end key (None if there is none). Samples within
+    KEYFRAME_INSERT_THRESHOLD of a key are merged the way keyframe_points.insert()
+    does, keeping the first frame and the last value. Like Blender, which looks
+    at an fcurve's first and last keys before searching the rest, the start and
+    end keys are checked before the previous sample (exact when they are the
+    fcurve's first and last keys).
+    """
+    resolution = len(curve_table) - 1
+    start_key = np.float32(start_frame)
+    end_key = np.float32(end_frame)
+
+    frames = []
+    weights = []
+    start_weight = None
+    end_weight = None
+    for j in sample_indices:
+        t = j / resolution
+        key_frame = np.float32(start_frame + t * (end_frame - start_frame))
+        weight = float(curve_table[j])
+
+        if key_frame - start_key <= KEYFRAME_INSERT_THRESHOLD:
+            start_weight = weight
+        elif end_key - key_frame <= KEYFRAME_INSERT_THRESHOLD:
+            end_weight = weight
+        elif frames and key_frame - frames[-1] <= KEYFRAME_INSERT_THRESHOLD:
+            weights[-1] = weight
+        else:
+            frames.append(key_frame)
+            weights.append(weight)
+
+    return np.array(frames, dtype=np.float32), np.array(weights), start_weight, end_weight
+
+def plan_samples(start_frames, end_frames, curve_table, sample_indices):
+    """plan_segment_samples for many segments sharing the same sample indices, at once
+
+    Returns (frames, weights): a (segments, samples) array of new key frames
+    and the normalized value of each sample. Returns None when a sample of
+    some segment would merge with another sample or an endpoint key, those
+    segments need plan_segment_samples.
+    """
+    resolution = len(curve_table) - 1
+    sample_indices = np.asarray(sample_indices)
+    t = sample_indices / resolution
+    start_frames = np.asarray(start_frames, dtype=np.float64)
+    end_frames = np.asarray(end_frames, dtype=np.float64)
+    frames = (start_frames[:, None] + t * (end_frames - start_frames)[:, None]).astype(np.float32)
+
+    # Frames only grow along a row, so neighbours are the only samples that can merge
+    if (np.any(np.diff(frames, axis=1) <= KEYFRAME_INSERT_THRESHOLD)
+            or np.any(frames[:, 0] - start_frames.astype(np.float32) <= KEYFRAME_INSERT_THRESHOLD)
+            or np.any(end_frames.astype(np.float32) - frames[:, -1] <= KEYFRAME_INSERT_THRESHOLD)):
+        return None
+
+    return frames, curve_table[sample_indices]
+
+def splice_keyframe_arrays(keys, firsts, lasts, new_keys, counts):
+    """Replace ranges of keyframe arrays with new keys, one pass per attribute
+
+    keys[firsts[i]:lasts[i]] is replaced by the next counts[i] keys of
+    new_keys. Ranges are sorted by position and must not overlap.
+    """
+    if not len(firsts):
+        return keys
+
+    key_count = len(keys["co"])
+    firsts = np.asarray(firsts)
+    lasts = np.asarray(lasts)
+    new_offsets = np.concatenate(([0], np.cumsum(counts)))
+
+    # Keys inside a replaced range are dropped
+    inside = np.cumsum(np.bincount(firsts, minlength=key_count + 1) - np.bincount(lasts, minlength=key_count + 1))
+    kept = np.flatnonzero(inside[:key_count] == 0)
+
+    # Kept keys move down by the new keys of every range before them, new
+    # keys by the kept keys before their range
+    kept_positions = np.arange(len(kept)) + new_offsets[np.searchsorted(lasts, kept, side='right')]
+    new_positions = np.arange(new_offsets[-1]) + np.repeat(np.searchsorted(kept, firsts), counts)
+
+    spliced = {}
+    for attr, array in keys.items():
+        out = np.empty((len(kept) + new_offsets[-1],) + array.shape[1:], dtype=array.dtype)
+        out[kept_positions] = array[kept]
+        out[new_positions] = new_keys[attr]
+        spliced[attr] = out
+
+    return spliced
+
+class BakeSettings:
+    """Plain copy of the operator settings, safe to read from worker threads"""
+
+    def __init__(self, interp_name, samples=20, influence=100.0, reverse=False, overshoot=1.0,
+                 time_scale=1.0, sampling_mode='UNIFORM', max_error=0.001, bezier=False):
+        self.interp_name = interp_name
+        self.samples = samples
+        self.influence = influence
+        self.reverse = reverse
+        self.overshoot = overshoot
+        self.time_scale = time_scale
+        self.sampling_mode = sampling_mode
+        self.max_error = max_error
+        self.bezier = bezier
+
+    @classmethod
+    def from_operator(cls, op):
+        return cls(op.interp_name, op.samples, op.influence, op.reverse, op.overshoot,
+                   op.time_scale, op.sampling_mode, op.max_error, op.output_mode == 'BEZIER')
+
+class CurveBaker:
+    """Bakes one interpolation into keyframe arrays
+
+    Work that only depends on the settings (the curve table) or on a span
+    (sample placement, adaptive keys, Bezier fits) is done once and shared
+    by every fcurve baked with the same baker.
+    """
+
+    def __init__(self, settings):
+        self.settings = settings
+
+        # Adaptive sampling and Bezier fitting pick their keys from a fine table,
+        # uniform sampling uses every entry
+        self.bezier = settings.bezier
+        self.adaptive = self.bezier or settings.sampling_mode == 'ADAPTIVE'
+        self.resolution = ADAPTIVE_RESOLUTION if self.adaptive else settings.samples
+
+        # Evaluated once per parameter set and shared through the cache
+        self.curve_table = get_curve_table(settings.interp_name, self.resolution, settings.time_scale,
+                                           settings.reverse, settings.overshoot, settings.influence)
+
+        # Return-to-start functions (marked with ↺) put the end key back on the start value
+        self.is_return_to_start = get_function_info(settings.interp_name).return_to_start
+
+        # Adaptive keys have to follow the curve between the endpoint keys as they
+        # end up: start value, then end value (or start value again for ↺ functions)
+        self.fit_table = self.curve_table.copy()
+        self.fit_table[0] = 0.0
+        self.fit_table[-1] = 0.0 if self.is_return_to_start else 1.0
+
+        # Adaptive keys are checked against the curve at a finer resolution,
+        # a table alone misses whatever happens between its entries
+        self.check_table = None
+        if self.adaptive and not self.bezier:
+            self.check_table = get_curve_table(settings.interp_name, self.resolution * ADAPTIVE_CHECK_FACTOR,
+                                               settings.time_scale, settings.reverse, settings.overshoot,
+                                               settings.influence).copy()
+            self.check_table[0] = self.fit_table[0]
+            self.check_table[-1] = self.fit_table[-1]
+
+        # Shared between fcurves (and threads, dict get/set is atomic)
+        self.uniform_indices = range(1, self.resolution)
+        self.adaptive_indices = {}
+        self.segment_plans = {}
+        self.bezier_fits = {}
+
+        # Totals over every fcurve baked, for the operator's timing report
+        # (unmet_error: the worst error of adaptive segments that couldn't get within Max Error)
+        self.counters = {"keys_removed": 0, "keys_inserted": 0, "unmet_error": 0.0}
+        self.counters_lock = threading.Lock()
+
+    def fit_bezier_segment(self, keys, start_index, end_index):
+        """Fit one segment with Bezier keys, returns the new keys and sets the endpoint handles in keys"""
+        frames = keys["co"][:, 0]
+        values = keys["co"][:, 1]
+        start_frame = float(frames[start_index])
+        start_value = float(values[start_index])
+        frame_range = float(frames[end_index]) - start_frame
+        value_range = float(values[end_index]) - start_value
+
+        if value_range != 0:
+            # Max Error is in value units, the table is normalized to the segment
+            tolerance = self.settings.max_error / abs(value_range)
+            if tolerance not in self.bezier_fits:
+                self.bezier_fits[tolerance] = fit_bezier_keys(self.fit_table, tolerance)
+            indices, left_slopes, right_slopes, smooth = self.bezier_fits[tolerance]
+        else:
+            # Flat segment, flat handles on the endpoints are enough
+            indices = np.array([0, self.resolution])
+            left_slopes = right_slopes = np.zeros(2)
+            smooth = np.ones(2, dtype=bool)
+
+        key_frames = start_frame + indices / self.resolution * frame_range
+        key_values = start_value + self.fit_table[indices] * value_range
+
+        # Handles sit a third of the way to the neighbouring key, along the slope
+        # (slopes are per unit t of a normalized curve, so scale them to values)
+        spacing = np.diff(indices) / self.resolution / 3
+        left_dt = np.concatenate(([spacing[0]], spacing))
+        right_dt = np.concatenate((spacing, [spacing[-1]]))
+        handle_left = np.column_stack((key_frames - left_dt * frame_range,
+                                       key_values - left_slopes * left_dt * value_range))
+        handle_right = np.column_stack((key_frames + right_dt * frame_range,
+                                        key_values + right_slopes * right_dt * value_range))
+
+        handle_types = np.where(smooth, HANDLE_ALIGNED, HANDLE_FREE).astype(np.int32)
+
+        # Start and end keys only get the handle on this segment's side. Both of
+        # their handles become free: fcurve.update() would otherwise turn the
+        # fitted handle to line up with an auto or vector handle on the other side
+        keys["interpolation"][start_index] = INTERPOLATION_BEZIER
+        keys["handle_right"][start_index] = handle_right[0]
+        keys["handle_left"][end_index] = handle_left[-1]
+        for index in (start_index, end_index):
+            keys["handle_left_type"][index] = HANDLE_FREE
+            keys["handle_right_type"][index] = HANDLE_FREE
+
+        new_keys = new_keyframe_arrays(key_frames[1:-1], key_values[1:-1])
+        new_keys["handle_left"] = handle_left[1:-1].astype(np.float32)
+        new_keys["handle_right"] = handle_right[1:-1].astype(np.float32)
+        new_keys["handle_left_type"][:] = handle_types[1:-1]
+        new_keys["handle_right_type"][:] = handle_types[1:-1]
+        new_keys["interpolation"][:] = INTERPOLATION_BEZIER
+        return new_keys
+
+    def adaptive_samples(self, tolerance, value_range):
+        """Table indices of the adaptive keys for a normalized tolerance (endpoints left out)
+
+        value_range is the largest value range of the segments using them,
+        to report the error in value units when the tolerance can't be met.
+        """
+        picked = self.adaptive_indices.get(tolerance)
+        if picked is None:
+            indices = adaptive_sample_indices(self.fit_table, tolerance, self.check_table)
+            picked = (indices[1:-1].tolist(),
+                      polyline_error(self.check_table, indices, ADAPTIVE_CHECK_FACTOR))
+            self.adaptive_indices[tolerance] = picked
+        sample_indices, error = picked
+
+        # Curves with detail finer than the table can't always be followed
+        if error > tolerance:
+            with self.counters_lock:
+                self.counters["unmet_error"] = max(self.counters["unmet_error"], error * value_range)
+        return sample_indices
+
+    def sample_segments(self, keys, starts, ends, valid):
+        """Sample every segment of one fcurve with linear keys at once
+
+        starts and ends are the endpoint key indices of each pair of
+        consecutive selected keys, valid tells which pairs get baked. Returns
+        (new keys of all valid segments in order, new key count of each), or
+        (None, None) when samples of some segment merge with each other or
+        with its endpoint keys: those go through sample_segment one by one.
+        """
+        frames = keys["co"][:, 0]
+        values = keys["co"][:, 1]
+
+        start_values = values[starts].astype(np.float64)
+        if self.is_return_to_start:
+            # Each baked segment starts from the value the one before put back on its end key
+            run_firsts = np.where(valid & ~np.concatenate(([False], valid[:-1])), np.arange(len(starts)), 0)
+            start_values = start_values[np.maximum.accumulate(run_firsts)]
+
+        starts = starts[valid]
+        ends = ends[valid]
+        start_values = start_values[valid]
+        value_ranges = values[ends] - start_values
+        start_frames = frames[starts].astype(np.float64)
+        end_frames = frames[ends].astype(np.float64)
+
+        # (segment rows, sample indices) sharing one plan
+        if not self.adaptive:
+            groups = [(np.arange(len(starts)), self.uniform_indices)]
+        else:
+            # Max Error is in value units, the table is normalized to the segment.
+            # Flat segments get no samples, the endpoints already describe them
+            magnitudes = np.abs(value_ranges)
+            tolerances = np.divide(self.settings.max_error, magnitudes,
+                                   out=np.zeros_like(magnitudes), where=magnitudes != 0)
+            unique, inverse = np.unique(tolerances, return_inverse=True)
+            order = np.argsort(inverse, kind='stable')
+            groups = []
+            for tolerance, rows in zip(unique, np.split(order, np.cumsum(np.bincount(inverse))[:-1])):
+                if tolerance > 0:
+                    groups.append((rows, self.adaptive_samples(float(tolerance), float(magnitudes[rows].max()))))
+
+        counts = np.zeros(len(starts), dtype=np.int64)
+        plans = []
+        for rows, sample_indices in groups:
+            if not len(sample_indices):
+                continue
+            plan = plan_samples(start_frames[rows], end_frames[rows], self.curve_table, sample_indices)
+            if plan is None:
+                return None, None
+            plans.append((rows, plan))
+            counts[rows] = len(sample_indices)
+
+        # Every segment's keys in one set of arrays
+        offsets = np.concatenate(([0], np.cumsum(counts)))
+        new_frames = np.empty(offsets[-1], dtype=np.float32)
+        new_values = np.empty(offsets[-1])
+        for rows, (sample_frames, weights) in plans:
+            positions = offsets[rows][:, None] + np.arange(len(weights))
+            new_frames[positions] = sample_frames
+            new_values[positions] = start_values[rows][:, None] + weights * value_ranges[rows][:, None]
+
+        # Return-to-start functions put the end keys back on the start values
+        if self.is_return_to_start:
+            values[ends] = start_values
+
+        return new_keyframe_arrays(new_frames, new_values), counts
+
+    def sample_segment(self, keys, start_index, end_index):
+        """Sample one segment with linear keys, returns the new keys (may update the endpoint values)"""
+        values = keys["co"][:, 1]
+        start_frame = float(keys["co"][start_index, 0])
+        end_frame = float(keys["co"][end_index, 0])
+        start_value = float(values[start_index])
+        end_value = float(values[end_index])
+
+        # Pick which table entries become keyframes
+        # Note: endpoints are never included, so we don't duplicate them
+        if not self.adaptive:
+            tolerance = None
+            sample_indices = self.uniform_indices
+        elif end_value != start_value:
+            # Max Error is in value units, the table is normalized to the segment
+            tolerance = self.settings.max_error / abs(end_value - start_value)
+            sample_indices = self.adaptive_samples(tolerance, abs(end_value - start_value))
+        else:
+            # Flat segment, the endpoints already describe it
+            tolerance = 0.0
+            sample_indices = []
+
+        # Where the samples land only depends on the span, so fcurves sharing
+        # a span (location/rotation/scale channels usually do) share the plan
+        plan_key = (start_frame, end_frame, tolerance)
+        plan = self.segment_plans.get(plan_key)
+        if plan is None:
+            plan = plan_segment_samples(start_frame, end_frame, self.curve_table, sample_indices)
+            self.segment_plans[plan_key] = plan
+        sample_frames, sample_weights, start_weight, end_weight = plan
+
+        # The table value IS the normalized value (0-1 range, with time scale,
+        # reverse, overshoot and influence applied), we just scale it
+        # between start and end values
+        value_range = end_value - start_value
+        if start_weight is not None:
+            values[start_index] = start_value + start_weight * value_range
+        if end_weight is not None:
+            values[end_index] = start_value + end_weight * value_range
+        sample_values = start_value + sample_weights * value_range
+
+        return new_keyframe_arrays(sample_frames, sample_values)
+
+    def bake_fcurve(self, keys):
+        """Bake between every pair of consecutive selected keys of one fcurve
+
+        keys is a dict of keyframe arrays sorted by frame, it is modified in
+        place. Returns (new keys, number of segments baked).
+        """
+        frames = keys["co"][:, 0]
+        values = keys["co"][:, 1]
+
+        # Get selected keyframes (already sorted by frame)
+        selected = np.flatnonzero(keys["select_control_point"])
+        if len(selected) < 2:
+            return keys, 0
+
+        # Pairs of consecutive selected keyframes, skipping pairs on the same frame
+        starts = selected[:-1]
+        ends = selected[1:]
+        valid = frames[starts] < frames[ends]
+
+        new_keys = None
+        if not self.bezier:
+            new_keys, counts = self.sample_segments(keys, starts, ends, valid)
+
+        if new_keys is None:
+            # One segment at a time: Bezier fits, and segments with merging samples
+            # (their endpoint values can change, which the next segment starts from)
+            segments = []
+            for start_index, end_index in zip(starts[valid], ends[valid]):
+                start_value = float(values[start_index])
+                if self.bezier:
+                    segments.append(self.fit_bezier_segment(keys, start_index, end_index))
+                else:
+                    segments.append(self.sample_segment(keys, start_index, end_index))
+
+                # If this is a return-to-start function, move the end keyframe to start value
+                if self.is_return_to_start:
+                    values[end_index] = start_value
+
+            counts = [len(segment["co"]) for segment in segments]
+            new_keys = {attr: np.concatenate([segment[attr] for segment in segments])
+                        for attr in segments[0]} if segments else {}
+
+        # Existing keyframes between start and end (except endpoints) form one
+        # contiguous range of the sorted frames per segment, found by binary search
+        firsts = np.searchsorted(frames, frames[starts[valid]], side='right')
+        lasts = np.searchsorted(frames, frames[ends[valid]], side='left')
+
+        # Swap each segment's interior for its new keyframes
+        keys = splice_keyframe_arrays(keys, firsts, lasts, new_keys, counts)
+
+        with self.counters_lock:
+            self.counters["keys_removed"] += int(np.sum(lasts - firsts))
+            self.counters["keys_inserted"] += int(np.sum(counts))
+
+        # Now set ALL keyframes in the fcurve to linear with vector handles
+        # (Bezier keys keep the handles computed for them)
+        if not self.bezier:
+            keys["interpolation"][:] = INTERPOLATION_LINEAR
+            keys["handle_left_type"][:] = HANDLE_VECTOR
+            keys["handle_right_type"][:] = HANDLE_VECTOR
+
+        return keys, len(firsts)
+
+    def bake_fcurves(self, key_snapshots, max_workers=None):
+        """Bake many fcurves, in a thread pool when there is more than one
+
+        Linear keys of an fcurve are planned and written with whole-array NumPy
+        operations (which release the GIL), not per segment. Returns a list
+        of (new keys, number of segments baked) in the same order.
+        """
+        if len(key_snapshots) < 2 or max_workers == 1:
+            return [self.bake_fcurve(keys) for keys in key_snapshots]
+
+        if max_workers is None:
+            max_workers = min(len(key_snapshots), os.cpu_count() or 1)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(self.bake_fcurve, key_snapshots))
+
+def keyframe_arrays(frames, values, selected=None):
+    """Build keyframe arrays from plain frames and values (all selected unless a mask is given)"""
+    frames = np.asarray(frames, dtype=np.float32)
+    keys = new_keyframe_arrays(frames, np.asarray(values, dtype=np.float64))
+    if selected is not None:
+        selected = np.asarray(selected, dtype=bool)
+        keys["select_control_point"][:] = selected
+        keys["select_left_handle"][:] = selected
+        keys["select_right_handle"][:] = selected
+
+    # Sorted by frame, like the keyframes of an fcurve
+    order = np.argsort(frames, kind='stable')
+    return {attr: array[order] for attr, array in keys.items()}
+
+def bake_keyframes(frames, values, selected, settings):
+    """Bake an interpolation between the selected keys of one curve given as plain arrays
+
+    Returns the new keyframe arrays (see KEYFRAME_ARRAY_ATTRIBUTES), sorted by frame.
+    """
+    keys, _ = CurveBaker(settings).bake_fcurve(keyframe_arrays(frames, values, selected))
+    return keys
+
+def float_curve_points(settings, num_points):
+    """Evenly spaced (t, value) points of the shaped curve over [0, 1], for a Float Curve mapping"""
+    t = np.arange(num_points) / (num_points - 1)
+    table = get_curve_table(settings.interp_name, num_points - 1, settings.time_scale,
+                            settings.reverse, settings.overshoot, settings.influence)
+    return t, table
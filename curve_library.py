@@ -0,0 +1,233 @@
+"""
+Curve Library
+Every registered function baked into one contiguous .npy file plus a JSON
+index, so curves can be looked up without evaluating the Python functions
+(with checking off, without even importing them).
+
+    python curve_library.py --resolution 1000 --preset reversed:reverse=1 --preset punchy:overshoot=2
+
+Each row is a shaped curve table (see curve_cache): resolution + 1 values
+for one function and one parameter preset. CurveLibrary memory-maps the
+file, so rows are read-only views into pages shared by every process using
+the same file, and the curve cache uses them without copying. Rows are
+float64 like evaluated tables; --float32 halves the file, rounding every
+value to about 7 significant digits. Other tools can read the data directly:
+the index gives the byte offset of the first row, the row length and the dtype.
+
+The index also stores a fingerprint of each function's code. When checking
+is on, a row whose function changed since the bake counts as missing.
+When the library sits next to the addon, the curve cache takes its tables
+from it.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import numpy as np
+
+LIBRARY_FILE = "curve_library.npy"
+LIBRARY_INDEX = "curve_library.json"
+LIBRARY_VERSION = 2
+
+# The adaptive/Bezier table size, and a multiple of the usual sample counts
+DEFAULT_RESOLUTION = 1000
+
+# Shaping parameters of a preset, anything left out keeps its default
+PRESET_DEFAULTS = {"time_scale": 1.0, "reverse": False, "overshoot": 1.0, "influence": 100.0}
+
+def preset_parameters(**parameters):
+    """Full, normalized parameters of a preset"""
+    unknown = set(parameters) - set(PRESET_DEFAULTS)
+    if unknown:
+        raise ValueError(f"Unknown preset parameter(s): {', '.join(sorted(unknown))}")
+    preset = dict(PRESET_DEFAULTS, **parameters)
+    return {
+        "time_scale": float(preset["time_scale"]),
+        "reverse": bool(preset["reverse"]),
+        "overshoot": float(preset["overshoot"]),
+        "influence": float(preset["influence"]),
+    }
+
+def import_functions():
+    """The function registry, the vectorized twins and the table evaluation, imported on first use"""
+    # Works both inside the addon package and as a standalone script
+    try:
+        from . import interpolation_functions, vectorized_functions
+        from .curve_cache import evaluate_curve_table_with_fallbacks
+    except ImportError:
+        import interpolation_functions
+        import vectorized_functions
+        from curve_cache import evaluate_curve_table_with_fallbacks
+    return interpolation_functions, vectorized_functions, evaluate_curve_table_with_fallbacks
+
+def function_hash(name):
+    """Fingerprint of everything a row depends on: the function's code and the shaping code"""
+    interpolation_functions, vectorized_functions, evaluate_curve_table_with_fallbacks = import_functions()
+    digest = hashlib.sha1(name.encode())
+    seen = set()
+    interpolation_functions.code_fingerprint(interpolation_functions.INTERPOLATION_FUNCTIONS[name], digest, seen)
+    interpolation_functions.code_fingerprint(evaluate_curve_table_with_fallbacks, digest, seen)
+    vector_func = vectorized_functions.VECTORIZED_FUNCTIONS.get(name)
+    if vector_func is not None:
+        interpolation_functions.code_fingerprint(vector_func, digest, seen)
+    return digest.hexdigest()[:16]
+
+def bake_library(output_dir, resolution=DEFAULT_RESOLUTION, presets=None, dtype=np.float64):
+    """Evaluate every function for every preset into LIBRARY_FILE and write LIBRARY_INDEX
+
+    presets maps a preset name to its parameters (default: just "default").
+    Returns the index.
+    """
+    if presets is None:
+        presets = {"default": {}}
+    presets = {name: preset_parameters(**parameters) for name, parameters in presets.items()}
+    interpolation_functions, _, evaluate_curve_table_with_fallbacks = import_functions()
+    names = list(interpolation_functions.INTERPOLATION_FUNCTIONS)
+
+    data_path = os.path.join(output_dir, LIBRARY_FILE)
+    rows = np.lib.format.open_memmap(data_path, mode='w+', dtype=dtype,
+                                     shape=(len(names) * len(presets), resolution + 1))
+
+    functions = {}
+    row = 0
+    for name in names:
+        entry = functions[name] = {"hash": function_hash(name), "rows": {}, "fallbacks": {}}
+        for preset_name, parameters in presets.items():
+            rows[row], entry["fallbacks"][preset_name] = evaluate_curve_table_with_fallbacks(
+                name, resolution, **parameters)
+            entry["rows"][preset_name] = row
+            row += 1
+
+    # Where the rows start in the file, for readers without numpy
+    data_offset = rows.offset
+    rows.flush()
+    del rows
+
+    index = {
+        "version": LIBRARY_VERSION,
+        "resolution": resolution,
+        "dtype": np.dtype(dtype).str,
+        "shape": [len(names) * len(presets), resolution + 1],
+        "data_offset": data_offset,
+        "presets": presets,
+        "functions": functions,
+    }
+    with open(os.path.join(output_dir, LIBRARY_INDEX), "w", encoding="utf-8") as file:
+        json.dump(index, file, indent=1, ensure_ascii=False)
+    return index
+
+class CurveLibrary:
+    """A baked library, memory-mapped"""
+
+    def __init__(self, data, index, check=True):
+        self.data = data
+        self.index = index
+        self.resolution = index["resolution"]
+        self.functions = index["functions"]
+        # Presets by their parameters, for find()
+        self.presets_by_parameters = {tuple(preset_parameters(**parameters).values()): name
+                                      for name, parameters in index["presets"].items()}
+        self.check = check
+        self.valid = {}
+
+    @classmethod
+    def load(cls, directory, check=True):
+        """Open the library in directory, None when there is none (or it can't be read)
+
+        With check off, rows are trusted without fingerprinting the functions.
+        """
+        index_path = os.path.join(directory, LIBRARY_INDEX)
+        data_path = os.path.join(directory, LIBRARY_FILE)
+        if not os.path.exists(index_path) or not os.path.exists(data_path):
+            return None
+
+        try:
+            with open(index_path, encoding="utf-8") as file:
+                index = json.load(file)
+            data = np.load(data_path, mmap_mode='r')
+        except (OSError, ValueError) as e:
+            print(f"Could not load curve library: {e}")
+            return None
+
+        if index.get("version") != LIBRARY_VERSION or list(data.shape) != index["shape"]:
+            print("Curve library doesn't match its index, ignoring it (bake it again)")
+            return None
+        return cls(data, index, check)
+
+    def table(self, name, preset="default"):
+        """Read-only row of a function for a preset, None when missing or out of date"""
+        entry = self.functions.get(name)
+        if entry is None or preset not in entry["rows"]:
+            return None
+
+        if self.check:
+            valid = self.valid.get(name)
+            if valid is None:
+                interpolation_functions = import_functions()[0]
+                valid = self.valid[name] = (name in interpolation_functions.INTERPOLATION_FUNCTIONS
+                                            and function_hash(name) == entry["hash"])
+            if not valid:
+                return None
+
+        return self.data[entry["rows"][preset]]
+
+    def find(self, name, samples, time_scale=1.0, reverse=False, overshoot=1.0, influence=100.0):
+        """Table of samples + 1 values for these parameters, when a preset and the resolution allow it
+
+        Works for any samples count that divides the resolution: every
+        step-th entry lands exactly on t = i / samples. Rows where samples fell
+        back to linear aren't served, so the cache can count the fallbacks.
+        """
+        if samples <= 0 or self.resolution % samples:
+            return None
+        preset = self.presets_by_parameters.get(tuple(preset_parameters(
+            time_scale=time_scale, reverse=reverse, overshoot=overshoot, influence=influence).values()))
+        if preset is None:
+            return None
+
+        row = self.table(name, preset)
+        if row is None or self.functions[name]["fallbacks"][preset]:
+            return None
+        return row[::self.resolution // samples]
+
+    def lookup(self, name, t, preset="default"):
+        """Curve value(s) at t in [0, 1], linearly interpolated between entries"""
+        row = self.table(name, preset)
+        if row is None:
+            raise KeyError(f"{name} is not in the curve library (or changed since it was baked)")
+        return np.interp(t, np.linspace(0.0, 1.0, self.resolution + 1), row)
+
+def parse_preset(text):
+    """name:param=value,param=value -> (name, parameters)"""
+    name, _, assignments = text.partition(":")
+    parameters = {}
+    for assignment in filter(None, assignments.split(",")):
+        key, _, value = assignment.partition("=")
+        key = key.strip()
+        parameters[key] = value.strip().lower() in ("1", "true", "yes") if key == "reverse" else float(value)
+    return name.strip(), parameters
+
+def main():
+    parser = argparse.ArgumentParser(description="Bake every interpolation function into a memory-mappable library")
+    parser.add_argument("--output-dir", default=os.path.dirname(os.path.realpath(__file__)),
+                        help="Folder for the library files (default: next to the addon)")
+    parser.add_argument("--resolution", type=int, default=DEFAULT_RESOLUTION,
+                        help="Table intervals per curve, rows hold resolution + 1 values")
+    parser.add_argument("--preset", action="append", default=[], metavar="NAME:PARAM=VALUE,...",
+                        help="Extra parameter preset (time_scale, reverse, overshoot, influence), repeatable")
+    parser.add_argument("--float32", action="store_true",
+                        help="Store float32 instead of float64: half the size, about 7 significant digits")
+    args = parser.parse_args()
+
+    presets = {"default": {}}
+    presets.update(parse_preset(text) for text in args.preset)
+    index = bake_library(args.output_dir, args.resolution, presets,
+                         dtype=np.float32 if args.float32 else np.float64)
+
+    size = os.path.getsize(os.path.join(args.output_dir, LIBRARY_FILE))
+    print(f"Baked {len(index['functions'])} functions x {len(presets)} preset(s) at resolution "
+          f"{args.resolution} into {LIBRARY_FILE} ({size / 1024:.0f} KB)")
+
+if __name__ == "__main__":
+    main()
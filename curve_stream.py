@@ -0,0 +1,108 @@
+"""
+Curve Streams
+Evaluate an interpolation over very long frame ranges in fixed-size chunks.
+
+The keyframe bake and the previews work on whole tables, which is fine for a
+segment between two keys. Procedural uses want one value per frame over
+millions of frames (a "Breath ↺" cycle across a feature-length timeline), so
+stream_curve yields (frames, values) arrays of at most chunk_size entries and
+memory stays the same however long the range is.
+
+    from curve_stream import stream_curve
+    for frames, values in stream_curve("Breath ↺", 0, 2_000_000, period=48):
+        ...
+
+Chunks can feed keyframe writes (see write_curve_stream in the addon) or go
+straight to disk with export_curve. Nothing in here touches bpy.
+
+    python curve_stream.py "Heartbeat ↺" 0 1000000 --period 24 --output heartbeat.npy
+"""
+
+import argparse
+import math
+import numpy as np
+
+# Works both inside the addon package and as a standalone script
+try:
+    from .curve_cache import evaluate_shaped_curve
+except ImportError:
+    from curve_cache import evaluate_shaped_curve
+
+# Frames per chunk, 1 MB per float64 array
+DEFAULT_CHUNK_SIZE = 131072
+
+def frame_count(start_frame, end_frame, step=1.0):
+    """Number of frames from start_frame to end_frame (included when it falls on a step)"""
+    if step <= 0:
+        raise ValueError("step must be positive")
+    if end_frame < start_frame:
+        return 0
+    # Tolerance so an end frame on a step isn't lost to rounding
+    return int(math.floor((end_frame - start_frame) / step + 1e-9)) + 1
+
+def stream_curve(name, start_frame, end_frame, start_value=0.0, end_value=1.0, period=None, step=1.0,
+                 chunk_size=DEFAULT_CHUNK_SIZE, time_scale=1.0, reverse=False, overshoot=1.0, influence=100.0):
+    """Yield (frames, values) float64 chunks of a shaped function from start_frame to end_frame
+
+    Without a period the curve runs once over the whole range. With one, it
+    repeats every period frames (return-to-start functions loop seamlessly).
+    Values go from start_value (curve at 0) to end_value (curve at 1).
+    """
+    count = frame_count(start_frame, end_frame, step)
+    span = period if period is not None else end_frame - start_frame
+    if span <= 0:
+        raise ValueError("the period (or the frame range) must be longer than 0")
+    value_range = end_value - start_value
+
+    for first in range(0, count, chunk_size):
+        frames = start_frame + np.arange(first, min(first + chunk_size, count), dtype=np.float64) * step
+
+        t = (frames - start_frame) / span
+        if period is not None:
+            t %= 1.0
+        else:
+            np.minimum(t, 1.0, out=t)
+
+        curve, _ = evaluate_shaped_curve(name, t, time_scale, reverse, overshoot, influence)
+        yield frames, start_value + curve * value_range
+
+def export_curve(path, name, start_frame, end_frame, dtype=np.float64, **options):
+    """Write a streamed curve to a .npy file of (frame, value) rows, returns the number of rows
+
+    The file is filled through a memory map one chunk at a time. options are
+    passed on to stream_curve.
+    """
+    count = frame_count(start_frame, end_frame, options.get("step", 1.0))
+    rows = np.lib.format.open_memmap(path, mode='w+', dtype=dtype, shape=(count, 2))
+
+    first = 0
+    for frames, values in stream_curve(name, start_frame, end_frame, **options):
+        rows[first:first + len(frames), 0] = frames
+        rows[first:first + len(frames), 1] = values
+        first += len(frames)
+
+    rows.flush()
+    del rows
+    return count
+
+def main():
+    parser = argparse.ArgumentParser(description="Export an interpolation evaluated per frame to a .npy file")
+    parser.add_argument("name", help="Function name, as in INTERPOLATION_FUNCTIONS")
+    parser.add_argument("start_frame", type=float)
+    parser.add_argument("end_frame", type=float)
+    parser.add_argument("--output", required=True, help=".npy file of (frame, value) rows")
+    parser.add_argument("--period", type=float, help="Repeat the curve every this many frames")
+    parser.add_argument("--step", type=float, default=1.0, help="Frames between samples")
+    parser.add_argument("--start-value", type=float, default=0.0)
+    parser.add_argument("--end-value", type=float, default=1.0)
+    parser.add_argument("--float32", action="store_true", help="Store float32 instead of float64")
+    args = parser.parse_args()
+
+    count = export_curve(args.output, args.name, args.start_frame, args.end_frame,
+                         dtype=np.float32 if args.float32 else np.float64,
+                         start_value=args.start_value, end_value=args.end_value,
+                         period=args.period, step=args.step)
+    print(f"Wrote {count} frames of {args.name} to {args.output}")
+
+if __name__ == "__main__":
+    main()
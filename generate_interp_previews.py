@@ -1,20 +1,42 @@
 """
-Run this script to generate PNG preview images for all interpolation functions.
-This creates a folder with all the preview images that the Blender addon will use.
+Run this script to generate preview images for all interpolation functions.
+This creates a folder with a single atlas image and a JSON manifest that the
+Blender addon loads its icons from.
 """
 
+import argparse
+import hashlib
+import json
 import math
 import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
 from PIL import Image, ImageDraw
 
 # Import functions from the shared library
 try:
-    from interpolation_functions import INTERPOLATION_FUNCTIONS
+    from interpolation_functions import INTERPOLATION_FUNCTIONS, code_fingerprint
 except ImportError:
     print("Error: Could not find interpolation_functions.py")
     print("Make sure this script is in the same folder as interpolation_functions.py")
     exit(1)
 
+# Shared curve cache (needs numpy), falls back to calling the functions directly
+try:
+    from curve_cache import evaluate_curve_table, get_curve_table
+    from vectorized_functions import VECTORIZED_FUNCTIONS
+except ImportError:
+    get_curve_table = None
+
+# Atlas layout, the addon reads the manifest to find each tile
+ATLAS_IMAGE = "previews_atlas.png"
+ATLAS_MANIFEST = "previews_atlas.json"
+ATLAS_COLUMNS = 12
+MANIFEST_VERSION = 1
+
+# Fewer changed previews than this are rendered without starting worker processes
+PARALLEL_MIN_TILES = 8
+
 def generate_preview(func, name, width=200, height=100, samples=200):
     """Generate a preview image for an interpolation function"""
     
@@ -33,13 +55,17 @@ def generate_preview(func, name, width=200, height=100, samples=200):
     points = []
     values = []
     
-    for i in range(samples):
-        t = i / (samples - 1)
-        try:
-            value = func(t)
-            values.append(value)
-        except:
-            values.append(t)  # Fallback to linear
+    if get_curve_table and INTERPOLATION_FUNCTIONS.get(name) is func:
+        # Registered function: raw curve (default parameters) from the shared cache
+        values = get_curve_table(name, samples - 1).tolist()
+    else:
+        for i in range(samples):
+            t = i / (samples - 1)
+            try:
+                value = func(t)
+                values.append(value)
+            except:
+                values.append(t)  # Fallback to linear
     
     # Normalize values to fit in image
     min_val = min(values)
@@ -70,29 +96,159 @@ def generate_preview(func, name, width=200, height=100, samples=200):
     
     return img
 
-def generate_all_previews(output_dir="interp_previews"):
-    """Generate preview images for all interpolation functions"""
+def preview_source_hash(name, width, height, samples):
+    """Hash of everything a preview depends on: the curve's code and the render settings"""
+    digest = hashlib.sha1(f"{name}|{width}|{height}|{samples}".encode())
+    seen = set()
+    code_fingerprint(INTERPOLATION_FUNCTIONS[name], digest, seen)
+    code_fingerprint(generate_preview, digest, seen)
+    if get_curve_table:
+        code_fingerprint(evaluate_curve_table, digest, seen)
+        vector_func = VECTORIZED_FUNCTIONS.get(name)
+        if vector_func is not None:
+            code_fingerprint(vector_func, digest, seen)
+    return digest.hexdigest()[:16]
+
+def render_preview(name, width, height, samples):
+    """Render one registered function's preview as RGBA bytes (runs in worker processes)"""
+    img = generate_preview(INTERPOLATION_FUNCTIONS[name], name, width, height, samples)
+    return img.convert('RGBA').tobytes()
+
+def load_previous_atlas(output_dir):
+    """Manifest and atlas image of the last run, or (None, None)"""
+    try:
+        with open(os.path.join(output_dir, ATLAS_MANIFEST), encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("version") != MANIFEST_VERSION:
+            return None, None
+        atlas = Image.open(os.path.join(output_dir, manifest["image"]))
+        atlas.load()
+        return manifest, atlas.convert('RGBA')
+    except (OSError, ValueError, KeyError):
+        return None, None
+
+def stale_previews(output_dir="interp_previews", width=200, height=100, samples=200):
+    """Names whose tile is missing from the manifest or was rendered from other code or settings"""
+    manifest, _ = load_previous_atlas(output_dir)
+    icons = manifest["icons"] if manifest else {}
+    stale = [name for name in INTERPOLATION_FUNCTIONS
+             if icons.get(name, {}).get("source") != preview_source_hash(name, width, height, samples)]
+    # Tiles of functions that were removed or renamed
+    stale += [name for name in icons if name not in INTERPOLATION_FUNCTIONS]
+    return stale
+
+def generate_all_previews(output_dir="interp_previews", width=200, height=100, samples=200,
+                          columns=ATLAS_COLUMNS, force=False, max_workers=None):
+    """Render every function into one atlas image plus a JSON manifest
+
+    The manifest maps each function name (as shown in the addon, return
+    marker included) to its tile rect [x, y, width, height] in the atlas,
+    measured from the top left, a hash of the tile's pixels and a hash of
+    what the tile was rendered from (see preview_source_hash).
+
+    Tiles whose source hash matches the previous manifest are copied from the
+    previous atlas, the rest are rendered in worker processes. Nothing is
+    written when every tile is unchanged and in place. Use force to render
+    everything again.
+    """
     
     # Create output directory
     os.makedirs(output_dir, exist_ok=True)
     
-    print(f"Generating {len(INTERPOLATION_FUNCTIONS)} preview images...")
-    
-    for name, func in INTERPOLATION_FUNCTIONS.items():
-        # Create safe filename
-        safe_name = name.replace(" ", "_").replace("+", "plus").replace("/", "_")
-        filename = f"{safe_name}.png"
-        filepath = os.path.join(output_dir, filename)
-        
-        try:
-            img = generate_preview(func, name)
-            img.save(filepath)
-            print(f"✓ Generated: {filename}")
-        except Exception as e:
-            print(f"✗ Failed to generate {name}: {e}")
-    
-    print(f"\nDone! All previews saved to: {output_dir}/")
+    names = list(INTERPOLATION_FUNCTIONS)
+    source_hashes = {name: preview_source_hash(name, width, height, samples) for name in names}
+    old_manifest, old_atlas = (None, None) if force else load_previous_atlas(output_dir)
+    old_icons = old_manifest["icons"] if old_manifest else {}
+    
+    tiles = {}
+    for name in names:
+        old = old_icons.get(name)
+        if old and old.get("source") == source_hashes[name]:
+            x, y, w, h = old["rect"]
+            tiles[name] = old_atlas.crop((x, y, x + w, y + h))
+    
+    todo = [name for name in names if name not in tiles]
+    print(f"Generating {len(todo)} of {len(names)} preview images...")
+    
+    # A process pool costs more to start than a few renders take
+    if len(todo) >= PARALLEL_MIN_TILES and max_workers != 1:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            futures = {name: pool.submit(render_preview, name, width, height, samples) for name in todo}
+            results = {}
+            for name, future in futures.items():
+                try:
+                    results[name] = future.result()
+                except Exception as e:
+                    results[name] = e
+    else:
+        results = {}
+        for name in todo:
+            try:
+                results[name] = render_preview(name, width, height, samples)
+            except Exception as e:
+                results[name] = e
+    
+    for name in todo:
+        if isinstance(results[name], Exception):
+            print(f"✗ Failed to generate {name}: {results[name]}")
+        else:
+            tiles[name] = Image.frombytes('RGBA', (width, height), results[name])
+            print(f"✓ Generated: {name}")
+    
+    rendered = [name for name in names if name in tiles]
+    rows = max(1, math.ceil(len(rendered) / columns))
+    icons = {}
+    
+    for index, name in enumerate(rendered):
+        x = (index % columns) * width
+        y = (index // columns) * height
+        old = old_icons.get(name)
+        icons[name] = {
+            "rect": [x, y, width, height],
+            "hash": old["hash"] if name not in todo else hashlib.sha1(tiles[name].tobytes()).hexdigest()[:16],
+            "source": source_hashes[name],
+        }
+    
+    if old_manifest and icons == old_icons and old_atlas.size == (columns * width, rows * height):
+        print(f"\nAll previews in {output_dir}/ are up to date.")
+        return
+    
+    atlas = Image.new('RGBA', (columns * width, rows * height), color=(0, 0, 0, 0))
+    for name in rendered:
+        x, y = icons[name]["rect"][:2]
+        atlas.paste(tiles[name], (x, y))
+    atlas.save(os.path.join(output_dir, ATLAS_IMAGE))
+    
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "image": ATLAS_IMAGE,
+        "size": [atlas.width, atlas.height],
+        "icons": icons,
+    }
+    with open(os.path.join(output_dir, ATLAS_MANIFEST), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1)
+    
+    print(f"\nDone! {len(icons)} previews saved to: {output_dir}/{ATLAS_IMAGE} ({output_dir}/{ATLAS_MANIFEST})")
     print(f"Copy this folder to your Blender addon directory.")
 
 if __name__ == "__main__":
-    generate_all_previews()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Generate the preview atlas for the addon")
+    parser.add_argument("--output", default="interp_previews", help="Output folder")
+    parser.add_argument("--width", type=int, default=200, help="Tile width in pixels")
+    parser.add_argument("--height", type=int, default=100, help="Tile height in pixels")
+    parser.add_argument("--force", action="store_true", help="Render every preview again")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (1 renders serially)")
+    parser.add_argument("--check", action="store_true", help="Only check the manifest is up to date, exit 1 if not")
+    args = parser.parse_args()
+    
+    if args.check:
+        stale = stale_previews(args.output, args.width, args.height)
+        for name in stale:
+            print(f"✗ Out of date: {name}")
+        if stale:
+            print(f"{len(stale)} preview(s) out of date, run generate_interp_previews.py")
+            sys.exit(1)
+        print(f"All previews in {args.output}/ are up to date.")
+        sys.exit(0)
+    
+    generate_all_previews(args.output, args.width, args.height, force=args.force, max_workers=args.workers)
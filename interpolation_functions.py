@@ -4,9 +4,18 @@ All 140+ interpolation functions in one place
 Edit this file to add new functions!
 
 Functions ending with ↺ return to the start value (0→peak→0 curves)
+
+Each function's metadata (category, return to start, where it ends) is
+measured once by analyze_function and kept in a CurveInfo, see
+get_function_info. Run this file to check every function.
 """
 
+import inspect
 import math
+import sys
+import textwrap
+import types
+from dataclasses import dataclass
 
 # Simple noise function for organic effects
 def noise(t):
@@ -43,6 +52,13 @@ def elastic_out(t):
 def smoothstep(t): 
     return 3*t**2 - 2*t**3
 
+# Name suffix of functions that return to the start value
+RETURN_TO_START_MARKER = " ↺"
+
+def safe_name(name):
+    """File-safe version of a function name, used for preview images (drops the ↺ marker)"""
+    return name.replace(RETURN_TO_START_MARKER, "").replace(" ", "_").replace("+", "plus").replace("/", "_")
+
 # All interpolation functions organized by category
 INTERPOLATION_FUNCTIONS = {
     # === SMOOTH & CLASSIC (15) ===
@@ -245,3 +261,122 @@ CATEGORIES = {
                  "Joy to Sad", "Surprise Shock ↺", "Anticipation Peak", "Calm to Panic",
                  "Meditation Wave ↺", "Laughter Fit"],
 }
+
+def code_fingerprint(func, digest, seen):
+    """Feed a function's source, and the source of every module function it uses, into a hash
+
+    Source rather than bytecode, which changes between Python versions.
+    """
+    if func in seen:
+        return
+    seen.add(func)
+    
+    try:
+        source = textwrap.dedent(inspect.getsource(func))
+    except (OSError, TypeError):
+        # Defined where the source can't be read (exec, the REPL)
+        source = func.__qualname__
+    digest.update(source.encode())
+    
+    names = set()
+    codes = [func.__code__]
+    while codes:
+        code = codes.pop()
+        names.update(code.co_names)
+        codes.extend(const for const in code.co_consts if isinstance(const, types.CodeType))
+    
+    # Helpers called by name (in name order, the order of co_names is the
+    # compiler's), and functions wrapped in closures
+    used = [func.__globals__.get(name) for name in sorted(names)]
+    used += [cell.cell_contents for cell in func.__closure__ or ()]
+    for value in used:
+        if isinstance(value, types.FunctionType):
+            code_fingerprint(value, digest, seen)
+
+# Samples the analyzer checks for errors and non-finite values
+ANALYSIS_SAMPLES = 4096
+
+# A ↺ function ending closer than this to its start value still returns
+# (the bake puts the end key back on the start value, the gap is invisible)
+RETURN_TO_START_TOLERANCE = 0.01
+
+@dataclass(slots=True)
+class CurveInfo:
+    """Metadata of one function, measured by analyze_function"""
+    name: str
+    category: str
+    return_to_start: bool  # marked ↺: the bake moves the end key back to the start value
+    end_offset: float      # f(1) - f(0)
+
+# name -> CurveInfo, filled on first use of each function
+FUNCTION_INFO = {}
+
+def evaluate_function(func, t):
+    """func(t), NaN where it raises"""
+    try:
+        return float(func(t))
+    except Exception:
+        return math.nan
+
+def sample_function(func, t):
+    """func(t), or t where it has no finite value (the bake falls back to linear too)"""
+    value = evaluate_function(func, t)
+    return value if math.isfinite(value) else t
+
+def first_failure(func):
+    """First analyzed t where func raises or isn't finite, None if there is none"""
+    for i in range(ANALYSIS_SAMPLES + 1):
+        t = i / ANALYSIS_SAMPLES
+        if not math.isfinite(evaluate_function(func, t)):
+            return t
+    return None
+
+def analyze_function(name):
+    """Measure the CurveInfo of a registered function"""
+    func = INTERPOLATION_FUNCTIONS[name]
+    category = next((category for category, names in CATEGORIES.items() if name in names), "")
+    
+    return CurveInfo(
+        name=name,
+        category=category,
+        return_to_start=name.endswith(RETURN_TO_START_MARKER),
+        end_offset=sample_function(func, 1.0) - sample_function(func, 0.0),
+    )
+
+def get_function_info(name):
+    """CurveInfo of a registered function (analyzed the first time it is asked for)"""
+    info = FUNCTION_INFO.get(name)
+    if info is None:
+        info = FUNCTION_INFO[name] = analyze_function(name)
+    return info
+
+def check_function_info():
+    """Analyze every function and check the registry is consistent, returns {name: problem}"""
+    problems = {}
+    categorized = [name for names in CATEGORIES.values() for name in names]
+    
+    for name in INTERPOLATION_FUNCTIONS:
+        info = get_function_info(name)
+        if categorized.count(name) != 1:
+            problems[name] = f"listed in {categorized.count(name)} categories"
+        elif info.return_to_start and abs(info.end_offset) > RETURN_TO_START_TOLERANCE:
+            problems[name] = f"marked ↺ but ends {info.end_offset:+.4f} away from where it starts"
+        else:
+            failure = first_failure(INTERPOLATION_FUNCTIONS[name])
+            if failure is not None:
+                problems[name] = f"no value at t={failure:.4f}, baked linear there"
+    
+    for name in categorized:
+        if name not in INTERPOLATION_FUNCTIONS:
+            problems[name] = "listed in CATEGORIES but not defined"
+    
+    return problems
+
+if __name__ == "__main__":
+    problems = check_function_info()
+    print(f"Analyzed {len(FUNCTION_INFO)} functions: "
+          f"{sum(info.return_to_start for info in FUNCTION_INFO.values())} return to start")
+    for name, problem in problems.items():
+        print(f"✗ {name}: {problem}")
+    if problems:
+        sys.exit(1)
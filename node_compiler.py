@@ -0,0 +1,431 @@
+"""
+Node Compiler
+Turns the interpolation functions in interpolation_functions.py into a small
+expression IR that maps one-to-one onto Geometry Nodes Math and Switch
+nodes, so Geometry Nodes output evaluates the exact function on every point
+instead of a sampled Float Curve.
+
+IR nodes are nested tuples:
+
+    ("t",)                           the input value
+    ("const", value)
+    (operation, a, b, ...)           a Math node operation, e.g. ("SINE", a)
+    ("switch", condition, if_false, if_true)
+
+Equal subexpressions are equal tuples, so a builder keyed by IR creates each
+shared subexpression once. Functions are parsed from source (lambdas and the
+module level helpers they call) and every compiled function is checked
+against the curve table before it is used; anything that can't be compiled
+or doesn't match raises UnsupportedExpression.
+"""
+
+import ast
+import inspect
+import math
+import numpy as np
+
+# Works both inside the addon package and as a standalone script
+try:
+    from . import interpolation_functions
+    from .curve_cache import evaluate_shaped_curve
+except ImportError:
+    import interpolation_functions
+    from curve_cache import evaluate_shaped_curve
+
+T = ("t",)
+
+# Python operators -> Math node operations
+BINARY_OPERATIONS = {
+    ast.Add: "ADD",
+    ast.Sub: "SUBTRACT",
+    ast.Mult: "MULTIPLY",
+    ast.Div: "DIVIDE",
+    ast.Pow: "POWER",
+    ast.Mod: "FLOORED_MODULO",
+}
+
+# math.<name>(x) and builtins -> Math node operations
+CALL_OPERATIONS = {
+    "sin": "SINE",
+    "cos": "COSINE",
+    "exp": "EXPONENT",
+    "sqrt": "SQRT",
+    "floor": "FLOOR",
+    "abs": "ABSOLUTE",
+    "round": "ROUND",
+    "min": "MINIMUM",
+    "max": "MAXIMUM",
+}
+
+MATH_CONSTANTS = {"pi": math.pi, "e": math.e, "tau": math.tau}
+
+# Samples and tolerance of the check against the curve table (plus the
+# points where a rounded value is exactly halfway, see round_tie_points)
+VERIFY_SAMPLES = 1000
+VERIFY_TOLERANCE = 1e-6
+
+# Bisection steps to find a halfway point, enough to reach neighbouring doubles
+TIE_BISECTION_STEPS = 64
+
+# Deepest helper call chain we inline
+MAX_INLINE_DEPTH = 8
+
+class UnsupportedExpression(Exception):
+    """A function uses something the node compiler can't express"""
+
+def const(value):
+    return ("const", float(value))
+
+def evaluate_ir(ir, t, cache=None):
+    """Evaluate IR over a numpy array of t, with the semantics of Blender's Math node"""
+    if cache is None:
+        cache = {}
+    if ir in cache:
+        return cache[ir]
+
+    kind = ir[0]
+    if kind == "t":
+        result = t
+    elif kind == "const":
+        result = np.full_like(t, ir[1])
+    else:
+        args = [evaluate_ir(arg, t, cache) for arg in ir[1:]]
+        with np.errstate(all='ignore'):
+            result = MATH_FUNCTIONS[kind](*args)
+
+    cache[ir] = result
+    return result
+
+def _safe_power(a, b):
+    # Negative bases only work with integer exponents, anything else gives 0
+    result = np.where((a >= 0) | (b == np.floor(b)), np.power(a, b), 0.0)
+    return np.where(np.isfinite(result), result, 0.0)
+
+MATH_FUNCTIONS = {
+    "ADD": np.add,
+    "SUBTRACT": np.subtract,
+    "MULTIPLY": np.multiply,
+    "DIVIDE": lambda a, b: np.where(b != 0, a / np.where(b != 0, b, 1.0), 0.0),
+    "POWER": _safe_power,
+    "FLOORED_MODULO": lambda a, b: np.where(b != 0, a - np.floor(a / np.where(b != 0, b, 1.0)) * b, 0.0),
+    "SINE": np.sin,
+    "COSINE": np.cos,
+    "EXPONENT": np.exp,
+    "SQRT": lambda a: np.where(a > 0, np.sqrt(np.maximum(a, 0.0)), 0.0),
+    "FLOOR": np.floor,
+    "ABSOLUTE": np.abs,
+    "ROUND": lambda a: np.floor(a + 0.5),
+    "MINIMUM": np.minimum,
+    "MAXIMUM": np.maximum,
+    "LESS_THAN": lambda a, b: (a < b).astype(np.float64),
+    "GREATER_THAN": lambda a, b: (a > b).astype(np.float64),
+    "COMPARE": lambda a, b, epsilon: (np.abs(a - b) <= np.maximum(epsilon, np.finfo(np.float32).eps)).astype(np.float64),
+    "switch": lambda condition, if_false, if_true: np.where(condition > 0, if_true, if_false),
+}
+
+def make(operation, *args):
+    """IR node, folded to a constant when every argument is one"""
+    if operation == "switch" and args[0][0] == "const":
+        return args[2] if args[0][1] > 0 else args[1]
+    if all(arg[0] == "const" for arg in args):
+        return const(evaluate_ir((operation,) + args, np.zeros(1))[0])
+    return (operation,) + args
+
+def round_half_even(a):
+    """IR of Python's round(a): halves go to the even neighbour
+
+    The ROUND node is floor(a + 0.5), which rounds every half up, so
+    exact halves landing on an odd value step back down by one.
+    """
+    rounded = make("ROUND", a)
+    halfway = make("COMPARE", make("SUBTRACT", rounded, a), const(0.5), const(0))
+    odd = make("FLOORED_MODULO", rounded, const(2))
+    return make("SUBTRACT", rounded, make("MULTIPLY", halfway, odd))
+
+def round_arguments(ir, found=None):
+    """Arguments of every ROUND node in an IR"""
+    if found is None:
+        found = set()
+    if ir[0] == "ROUND":
+        found.add(ir[1])
+    if ir[0] not in ("t", "const"):
+        for arg in ir[1:]:
+            round_arguments(arg, found)
+    return found
+
+def round_tie_points(ir, t):
+    """t values where the argument of a ROUND in ir is halfway between two integers
+
+    Rounding only differs between conventions there, and an evenly spaced
+    grid rarely lands on one (round(t*8) is halfway at odd sixteenths). One
+    point is found per grid interval where the rounded value changes, by
+    bisection down to neighbouring doubles; both neighbours are returned,
+    one of them sits on the half when the argument can reach it exactly.
+    """
+    points = []
+    for arg in round_arguments(ir):
+        values = evaluate_ir(arg, t)
+        changes = np.flatnonzero(np.floor(values[1:] + 0.5) != np.floor(values[:-1] + 0.5))
+        if not len(changes):
+            continue
+
+        low = t[changes]
+        high = t[changes + 1]
+        rising = values[changes + 1] > values[changes]
+        half = np.floor(np.maximum(values[changes], values[changes + 1]) + 0.5) - 0.5
+        for _ in range(TIE_BISECTION_STEPS):
+            middle = (low + high) / 2
+            past = (evaluate_ir(arg, middle) >= half) == rising
+            high = np.where(past, middle, high)
+            low = np.where(past, low, middle)
+        points += [low, high]
+
+    return np.concatenate(points) if points else np.empty(0)
+
+def substitute(ir, replacement):
+    """Replace the input t of an IR with another IR"""
+    if ir == T:
+        return replacement
+    if ir[0] == "const":
+        return ir
+    return make(ir[0], *(substitute(arg, replacement) for arg in ir[1:]))
+
+class ExpressionParser:
+    """Parses Python expressions (and simple helper functions) into IR"""
+
+    def __init__(self, module_tree):
+        self.helpers = {node.name: node for node in module_tree.body if isinstance(node, ast.FunctionDef)}
+        self.depth = 0
+
+    def function(self, node):
+        """IR of a lambda or a helper function definition, in terms of its argument"""
+        args = node.args.args
+        if len(args) != 1 or node.args.vararg or node.args.kwonlyargs or node.args.defaults:
+            raise UnsupportedExpression("only functions of a single argument are supported")
+        return self.call(node, [T])
+
+    def call(self, node, arguments):
+        """Inline a lambda or helper with the given argument IRs"""
+        self.depth += 1
+        if self.depth > MAX_INLINE_DEPTH:
+            raise UnsupportedExpression("helper calls nest too deep")
+        try:
+            env = {arg.arg: value for arg, value in zip(node.args.args, arguments)}
+            if isinstance(node, ast.Lambda):
+                return self.expression(node.body, env)
+            return self.block(node.body, env)
+        finally:
+            self.depth -= 1
+
+    def block(self, statements, env):
+        """IR of a list of statements that ends in a return on every path"""
+        env = dict(env)
+        for index, statement in enumerate(statements):
+            if isinstance(statement, ast.Expr) and isinstance(statement.value, ast.Constant):
+                continue  # docstring
+            if isinstance(statement, ast.Return) and statement.value is not None:
+                return self.expression(statement.value, env)
+            if isinstance(statement, ast.Assign) and len(statement.targets) == 1:
+                self.assign(statement.targets[0], statement.value, env)
+                continue
+            if isinstance(statement, ast.If):
+                # The if branch has to return, the rest of the block is the else branch
+                if_true = self.block(statement.body, env)
+                if_false = self.block(statement.orelse + statements[index + 1:], env)
+                return make("switch", self.condition(statement.test, env), if_false, if_true)
+            raise UnsupportedExpression(f"unsupported statement: {type(statement).__name__}")
+        raise UnsupportedExpression("function does not return on every path")
+
+    def assign(self, target, value, env):
+        if isinstance(target, ast.Name):
+            env[target.id] = self.expression(value, env)
+        elif (isinstance(target, ast.Tuple) and isinstance(value, ast.Tuple)
+              and len(target.elts) == len(value.elts)
+              and all(isinstance(name, ast.Name) for name in target.elts)):
+            values = [self.expression(item, env) for item in value.elts]
+            for name, item in zip(target.elts, values):
+                env[name.id] = item
+        else:
+            raise UnsupportedExpression("unsupported assignment")
+
+    def condition(self, node, env):
+        """IR that is 1 where a test holds and 0 elsewhere"""
+        if isinstance(node, ast.Compare):
+            return self.expression(node, env)
+        # Python truthiness: anything but zero
+        return make("SUBTRACT", const(1), make("COMPARE", self.expression(node, env), const(0), const(0)))
+
+    def expression(self, node, env):
+        if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)) and not isinstance(node.value, bool):
+            return const(node.value)
+
+        if isinstance(node, ast.Name):
+            if node.id in env:
+                return env[node.id]
+            raise UnsupportedExpression(f"unknown name: {node.id}")
+
+        if isinstance(node, ast.Attribute):
+            if isinstance(node.value, ast.Name) and node.value.id == "math" and node.attr in MATH_CONSTANTS:
+                return const(MATH_CONSTANTS[node.attr])
+            raise UnsupportedExpression(f"unsupported attribute: {node.attr}")
+
+        if isinstance(node, ast.UnaryOp):
+            operand = self.expression(node.operand, env)
+            if isinstance(node.op, ast.USub):
+                return make("SUBTRACT", const(0), operand)
+            if isinstance(node.op, ast.UAdd):
+                return operand
+            raise UnsupportedExpression(f"unsupported operator: {type(node.op).__name__}")
+
+        if isinstance(node, ast.BinOp):
+            operation = BINARY_OPERATIONS.get(type(node.op))
+            if operation is None:
+                raise UnsupportedExpression(f"unsupported operator: {type(node.op).__name__}")
+            return make(operation, self.expression(node.left, env), self.expression(node.right, env))
+
+        if isinstance(node, ast.Compare):
+            result = None
+            left = self.expression(node.left, env)
+            for operator, comparator in zip(node.ops, node.comparators):
+                right = self.expression(comparator, env)
+                test = self.comparison(operator, left, right)
+                result = test if result is None else make("MULTIPLY", result, test)
+                left = right
+            return result
+
+        if isinstance(node, ast.IfExp):
+            return make("switch", self.condition(node.test, env),
+                        self.expression(node.orelse, env), self.expression(node.body, env))
+
+        if isinstance(node, ast.Call) and not node.keywords:
+            return self.function_call(node, env)
+
+        raise UnsupportedExpression(f"unsupported expression: {type(node).__name__}")
+
+    def comparison(self, operator, left, right):
+        if isinstance(operator, ast.Lt):
+            return make("LESS_THAN", left, right)
+        if isinstance(operator, ast.Gt):
+            return make("GREATER_THAN", left, right)
+        if isinstance(operator, ast.LtE):
+            return make("SUBTRACT", const(1), make("GREATER_THAN", left, right))
+        if isinstance(operator, ast.GtE):
+            return make("SUBTRACT", const(1), make("LESS_THAN", left, right))
+        if isinstance(operator, ast.Eq):
+            return make("COMPARE", left, right, const(0))
+        if isinstance(operator, ast.NotEq):
+            return make("SUBTRACT", const(1), make("COMPARE", left, right, const(0)))
+        raise UnsupportedExpression(f"unsupported comparison: {type(operator).__name__}")
+
+    def function_call(self, node, env):
+        func = node.func
+        arguments = [self.expression(arg, env) for arg in node.args]
+
+        if isinstance(func, ast.Attribute) and isinstance(func.value, ast.Name) and func.value.id == "math":
+            name = func.attr
+        elif isinstance(func, ast.Name) and func.id in ("abs", "round", "min", "max"):
+            name = func.id
+        elif isinstance(func, ast.Name) and func.id in self.helpers:
+            helper = self.helpers[func.id]
+            if len(helper.args.args) != len(arguments):
+                raise UnsupportedExpression(f"wrong number of arguments for {func.id}")
+            return self.call(helper, arguments)
+        else:
+            raise UnsupportedExpression(f"unsupported call: {ast.dump(func)}")
+
+        operation = CALL_OPERATIONS.get(name)
+        if operation is None:
+            raise UnsupportedExpression(f"unsupported function: {name}")
+        expected = 2 if operation in ("MINIMUM", "MAXIMUM") else 1
+        if len(arguments) != expected:
+            raise UnsupportedExpression(f"{name} takes {expected} argument(s) here")
+        if operation == "ROUND":
+            return round_half_even(*arguments)
+        return make(operation, *arguments)
+
+def function_sources():
+    """name -> AST node (lambda or helper definition) of every entry in INTERPOLATION_FUNCTIONS"""
+    tree = ast.parse(inspect.getsource(interpolation_functions))
+    helpers = {node.name: node for node in tree.body if isinstance(node, ast.FunctionDef)}
+    sources = {}
+
+    for statement in tree.body:
+        if (isinstance(statement, ast.Assign) and isinstance(statement.value, ast.Dict)
+                and any(isinstance(target, ast.Name) and target.id == "INTERPOLATION_FUNCTIONS"
+                        for target in statement.targets)):
+            for key, value in zip(statement.value.keys, statement.value.values):
+                if isinstance(value, ast.Name):
+                    value = helpers.get(value.id, value)
+                sources[key.value] = value
+
+    return tree, sources
+
+# name -> IR, or the UnsupportedExpression raised for it
+compiled_functions = {}
+
+def compile_all():
+    """Compile and verify every function, filling compiled_functions"""
+    tree, sources = function_sources()
+    parser = ExpressionParser(tree)
+    t = np.arange(VERIFY_SAMPLES + 1, dtype=np.float64) / VERIFY_SAMPLES
+
+    for name in interpolation_functions.INTERPOLATION_FUNCTIONS:
+        try:
+            source = sources.get(name)
+            if not isinstance(source, (ast.Lambda, ast.FunctionDef)):
+                raise UnsupportedExpression("no source found")
+            ir = parser.function(source)
+
+            # Checked where rounding is halfway too, that's where conventions differ
+            points = np.union1d(t, np.clip(round_tie_points(ir, t), 0.0, 1.0))
+
+            # Against the curve evaluation itself (failed samples fall back to linear)
+            expected, _ = evaluate_shaped_curve(name, points)
+            error = np.max(np.abs(evaluate_ir(ir, points) - expected))
+            if not error <= VERIFY_TOLERANCE * max(1.0, np.ptp(expected)):
+                raise UnsupportedExpression(f"compiled nodes differ from the function by {error:.3g}")
+
+            compiled_functions[name] = ir
+        except UnsupportedExpression as e:
+            compiled_functions[name] = e
+
+def compile_function(name):
+    """IR of a registered function, raises UnsupportedExpression when it can't be compiled"""
+    if not compiled_functions:
+        compile_all()
+    result = compiled_functions.get(name)
+    if result is None:
+        raise UnsupportedExpression(f"unknown function: {name}")
+    if isinstance(result, UnsupportedExpression):
+        raise result
+    return result
+
+def shaped_expression(name, time_scale=1.0, reverse=False, overshoot=1.0, influence=100.0):
+    """IR of a function with time scale, reverse, overshoot and influence applied (see curve_cache)"""
+    ir = compile_function(name)
+
+    t_scaled = T
+    if time_scale != 1.0:
+        t_scaled = make("MINIMUM", make("MULTIPLY", T, const(time_scale)), const(1))
+    if reverse:
+        t_scaled = make("SUBTRACT", const(1), t_scaled)
+    value = substitute(ir, t_scaled)
+
+    if overshoot != 1.0:
+        above = make("ADD", const(1), make("MULTIPLY", make("SUBTRACT", value, const(1)), const(overshoot)))
+        value = make("switch", make("LESS_THAN", value, const(0)),
+                     make("switch", make("GREATER_THAN", value, const(1)), value, above),
+                     make("MULTIPLY", value, const(overshoot)))
+
+    if influence != 100.0:
+        factor = influence / 100.0
+        value = make("ADD", make("MULTIPLY", T, const(1 - factor)), make("MULTIPLY", value, const(factor)))
+
+    return value
+
+if __name__ == "__main__":
+    compile_all()
+    failed = {name: result for name, result in compiled_functions.items() if isinstance(result, UnsupportedExpression)}
+    print(f"{len(compiled_functions) - len(failed)} of {len(compiled_functions)} functions compile to nodes")
+    for name, error in failed.items():
+        print(f"  {name}: {error}")
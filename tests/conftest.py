@@ -0,0 +1,16 @@
+import os
+import sys
+
+# The addon modules also run as plain scripts, import them from the repo root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def pytest_sessionfinish(session, exitstatus):
+    session.config.bpy_exitstatus = int(exitstatus)
+
+def pytest_unconfigure(config):
+    # The bpy module waits forever at interpreter exit once the driver
+    # namespace has been touched, leave as soon as pytest is done
+    if "bpy" in sys.modules:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os._exit(getattr(config, "bpy_exitstatus", 0))
@@ -0,0 +1,234 @@
+"""
+Tests that need Blender's Python module (pip install bpy), skipped without it.
+"""
+
+import importlib.util
+import os
+import sys
+import pytest
+
+bpy = pytest.importorskip("bpy")
+
+ADDON_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+@pytest.fixture(scope="module")
+def addon():
+    spec = importlib.util.spec_from_file_location("interp_addon", os.path.join(ADDON_DIR, "__init__.py"),
+                                                  submodule_search_locations=[ADDON_DIR])
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    module.register()
+    yield module
+    module.unregister()
+    del sys.modules[spec.name]
+
+def animated_object(name, start=(1, 0.0), end=(21, 5.0), data=None):
+    """Active object with two selected location X keys"""
+    obj = bpy.data.objects.new(name, data)
+    bpy.context.scene.collection.objects.link(obj)
+    bpy.context.view_layer.objects.active = obj
+    for frame, value in (start, end):
+        obj.location.x = value
+        obj.keyframe_insert("location", index=0, frame=frame)
+    fcurve = obj.animation_data.action.fcurves[0]
+    for keyframe in fcurve.keyframe_points:
+        keyframe.select_control_point = True
+    return obj, fcurve
+
+def test_apply_operators_run(addon):
+    _, fcurve = animated_object("Apply")
+    assert bpy.ops.anim.apply_interpolation(interp_name="Ease Out Cubic") == {'FINISHED'}
+    assert len(fcurve.keyframe_points) > 2
+
+    _, fcurve = animated_object("Apply Modal")
+    assert bpy.ops.anim.apply_interpolation_modal(interp_name="Bounce Out") == {'FINISHED'}
+    assert len(fcurve.keyframe_points) > 2
+
+def test_bezier_endpoint_handles_survive_update(addon):
+    _, fcurve = animated_object("Bezier")
+    assert bpy.ops.anim.apply_interpolation(interp_name="Ease Out Cubic", output_mode='BEZIER') == {'FINISHED'}
+    fcurve.update()
+
+    # Ease Out Cubic starts with slope 3, over 20 frames and 5 units: 0.75 per frame
+    first = fcurve.keyframe_points[0]
+    (x0, y0), (x1, y1) = first.co, first.handle_right
+    assert (y1 - y0) / (x1 - x0) == pytest.approx(0.75, rel=1e-3)
+
+    # and ends flat
+    last = fcurve.keyframe_points[-1]
+    (x0, y0), (x1, y1) = last.handle_left, last.co
+    assert (y1 - y0) / (x1 - x0) == pytest.approx(0.0, abs=1e-4)
+
+@pytest.mark.parametrize("span", [(1.0, 1.3), (0.0, 0.2), (3.0, 3.45)])
+@pytest.mark.parametrize("samples", [20, 50, 100])
+def test_short_span_matches_keyframe_insert(addon, span, samples):
+    # Samples closer than the insert threshold merge into keys the way insert() merges them
+    action = bpy.data.actions.new("Short Span")
+    baked = action.fcurves.new("location", index=0)
+    inserted = action.fcurves.new("location", index=1)
+    for fcurve in (baked, inserted):
+        fcurve.keyframe_points.insert(span[0], 0.0)
+        fcurve.keyframe_points.insert(span[1], 5.0)
+
+    baker = addon.CurveBaker(addon.BakeSettings("Ease Out Cubic", samples=samples))
+    keys, _ = baker.bake_fcurve(addon.read_keyframe_arrays(baked))
+    addon.write_keyframe_arrays(baked, keys)
+
+    start_frame, end_frame = (key.co.x for key in inserted.keyframe_points)
+    for j in range(1, samples):
+        t = j / samples
+        inserted.keyframe_points.insert(start_frame + t * (end_frame - start_frame), 5.0 * float(baker.curve_table[j]))
+
+    assert [tuple(key.co) for key in baked.keyframe_points] == [tuple(key.co) for key in inserted.keyframe_points]
+
+def test_sidebar_count_follows_editor_selection(addon):
+    obj, fcurve = animated_object("Editor Selection")
+    channelbag = addon.animation_channelbag(obj.animation_data)
+    for keyframe in fcurve.keyframe_points:
+        keyframe.select_control_point = False
+    assert addon.get_selected_keyframe_count(bpy.context, channelbag) == 0
+
+    # Box selecting in the Dope Sheet is UNDO-only, no operator stamp or msgbus notification
+    obj.select_set(True)
+    window = bpy.context.window_manager.windows[0]
+    area = next(area for area in window.screen.areas if area.type == 'DOPESHEET_EDITOR')
+    region = next(region for region in area.regions if region.type == 'WINDOW')
+    with bpy.context.temp_override(window=window, area=area, region=region):
+        assert bpy.ops.action.select_box(xmin=-10000, xmax=10000, ymin=-10000, ymax=10000,
+                                         wait_for_input=False, mode='SET') == {'FINISHED'}
+    assert addon.get_selected_keyframe_count(bpy.context, channelbag) == 2
+
+def shape_keyed_object(addon, name):
+    """animated_object with a mesh and a shape key keyed too (on 4.4+ in its own slot of the object's action)"""
+    mesh = bpy.data.meshes.new(name)
+    mesh.vertices.add(1)
+    obj, fcurve = animated_object(name, data=mesh)
+    obj.shape_key_add(name="Basis")
+    shape_key = obj.shape_key_add(name="K")
+    for frame, value in ((1, 0.0), (21, 1.0)):
+        shape_key.value = value
+        shape_key.keyframe_insert("value", frame=frame)
+    channelbag = addon.animation_channelbag(mesh.shape_keys.animation_data)
+    shape_fcurve = channelbag.fcurves.find('key_blocks["K"].value')
+    for keyframe in shape_fcurve.keyframe_points:
+        keyframe.select_control_point = True
+    return obj, fcurve, shape_fcurve
+
+def test_batch_bakes_every_slot_of_a_shared_action(addon):
+    obj, fcurve, shape_fcurve = shape_keyed_object(addon, "Slots")
+    obj.select_set(True)
+    assert bpy.ops.anim.apply_interpolation(interp_name="Ease Out Cubic", batch=True) == {'FINISHED'}
+    assert len(fcurve.keyframe_points) > 2
+    assert len(shape_fcurve.keyframe_points) > 2
+
+def test_action_index_per_slot(addon):
+    obj, _, _ = shape_keyed_object(addon, "Slot Index")
+    object_index = addon.get_action_index(addon.animation_channelbag(obj.animation_data))
+    shape_index = addon.get_action_index(addon.animation_channelbag(obj.data.shape_keys.animation_data))
+    assert object_index is not shape_index
+    assert (object_index.fcurve_count, shape_index.fcurve_count) == (1, 1)
+    assert list(object_index.by_group) == ["Object Transforms"]
+    assert shape_index.by_group == {}
+
+def test_search_matches_word_starts_in_order(addon):
+    assert addon.fuzzy_match("eio sin", "ease inout sine")
+    assert addon.fuzzy_match("bnc", "bounce out")
+    assert not addon.fuzzy_match("out", "bounce")
+    assert not addon.fuzzy_match("sine ease", "ease in")
+
+    # In category order, and not filtered again for the same query
+    names = addon.search_functions("bounce")
+    assert "Bounce Out" in names and "Basketball Bounce ↺" in names
+    assert names == [name for name in addon.function_index if name in names]
+    assert addon.search_functions("bounce") is names
+
+def test_preview_icons_load_on_draw_up_to_the_cap(addon, monkeypatch):
+    addon.unload_preview_icons()
+    assert addon.preview_atlas["icons"] is None
+
+    # (Background mode has no icon ids, the previews are made all the same)
+    monkeypatch.setattr(addon, "DEFAULT_PREVIEW_CACHE_SIZE", 2)
+    names = ["Linear", "Ease In Quad", "Ease Out Quad"]
+    for name in names:
+        addon.get_preview_icon(name)
+    assert len(addon.preview_atlas["icons"]) == len(addon.INTERPOLATION_FUNCTIONS)
+
+    # The least recently drawn icon was dropped, drawing it again brings it back
+    previews = addon.preview_collections["main"]
+    assert list(addon.loaded_previews) == names[1:]
+    assert sorted(previews.keys()) == sorted(addon.safe_name(name) for name in names[1:])
+    addon.get_preview_icon("Linear")
+    assert list(addon.loaded_previews) == [names[2], names[0]]
+    addon.unload_preview_icons()
+    assert not addon.loaded_previews and not addon.preview_collections
+
+def test_geometry_nodes_group_built_from_rounding_function(addon):
+    animated_object("Nodes", data=bpy.data.meshes.new("Nodes"))
+    assert bpy.ops.anim.apply_interpolation(interp_name="Bit Crush", output_mode='GEO_NODES') == {'FINISHED'}
+    group = next(group for group in bpy.data.node_groups if "Bit Crush" in group.name)
+    operations = {node.operation for node in group.nodes if node.bl_idname == 'ShaderNodeMath'}
+    assert {"ROUND", "COMPARE", "FLOORED_MODULO"} <= operations
+
+def test_geometry_nodes_group_reused_for_same_settings(addon):
+    obj, _ = animated_object("Reuse", data=bpy.data.meshes.new("Reuse"))
+    assert bpy.ops.anim.apply_interpolation(interp_name="Ease In Quad", output_mode='GEO_NODES') == {'FINISHED'}
+    group_count = len(bpy.data.node_groups)
+    group = next(group for group in bpy.data.node_groups if "Ease In Quad" in group.name)
+    group_hash = group[addon.NODE_GROUP_HASH_PROPERTY]
+
+    assert bpy.ops.anim.apply_interpolation(interp_name="Ease In Quad", output_mode='GEO_NODES') == {'FINISHED'}
+    assert len(bpy.data.node_groups) == group_count
+    assert addon.find_node_group(group_hash) == group
+    tree = obj.modifiers[0].node_group
+    assert [node.node_tree for node in tree.nodes if node.bl_idname == 'GeometryNodeGroup'] == [group]
+
+    # Any other parameter builds a new group
+    assert bpy.ops.anim.apply_interpolation(interp_name="Ease In Quad", output_mode='GEO_NODES',
+                                            reverse=True) == {'FINISHED'}
+    assert len(bpy.data.node_groups) == group_count + 1
+
+@pytest.mark.parametrize("names", [("Ease Out Quad", "Gravity Fall"), ("Gravity Fall", "Ease Out Quad")])
+def test_merged_node_group_named_after_every_function(addon, names):
+    for name in names:
+        node_group = bpy.data.node_groups.new(addon.NODE_GROUP_PREFIX + name, 'GeometryNodeTree')
+        node_group.nodes.new('ShaderNodeFloatCurve')
+
+    assert bpy.ops.anim.merge_interpolation_node_groups() == {'FINISHED'}
+    merged = [node_group for node_group in bpy.data.node_groups if any(name in node_group.name for name in names)]
+    assert [node_group.name for node_group in merged] == ["Interp: Ease Out Quad / Gravity Fall"]
+    bpy.data.node_groups.remove(merged[0])
+
+def test_driver_mode_values_and_reload(addon):
+    obj, fcurve = animated_object("Driven")
+    assert bpy.ops.anim.apply_interpolation(interp_name="Ease Out Cubic", output_mode='DRIVER') == {'FINISHED'}
+    driver = obj.animation_data.drivers.find("location", index=0).driver
+    assert driver.expression == 'interp_drive(self, frame, "c0")'
+
+    # Ease Out Cubic at t = 0.5 is 0.875, over 0 -> 5
+    assert addon.interp_drive(obj, 11, "c0") == pytest.approx(4.375, abs=1e-3)
+    assert addon.interp_drive(obj, 21, "c0") == pytest.approx(5.0)
+    # Past the segment the keys take over, without them the segment's value is held
+    assert addon.interp_drive(obj, 30, "c0") == pytest.approx(fcurve.evaluate(30))
+    curve = addon.build_driver_curve(obj[addon.DRIVER_PROPERTY]["c0"])
+    assert curve.evaluate(30) is None
+    assert curve.hold_value(30) == pytest.approx(5.0)
+
+    # Opening a file starts from an empty namespace and invalid drivers
+    del bpy.app.driver_namespace[addon.DRIVER_FUNCTION]
+    driver.is_valid = False
+    addon.driver_namespace_load_post()
+    assert bpy.app.driver_namespace[addon.DRIVER_FUNCTION] is addon.interp_drive
+    assert driver.is_valid
+
+def test_write_curve_stream_across_chunks(addon):
+    from interp_addon.curve_stream import frame_count, stream_curve
+
+    _, fcurve = animated_object("Streamed")
+    count = frame_count(0, 99)
+    addon.write_curve_stream(fcurve, stream_curve("Ease Out Cubic", 0, 99, chunk_size=16), count)
+    assert len(fcurve.keyframe_points) == 100
+    assert fcurve.keyframe_points[-1].co.y == pytest.approx(1.0)
+
+    with pytest.raises(ValueError):
+        addon.write_curve_stream(fcurve, stream_curve("Ease Out Cubic", 0, 99, chunk_size=16), count - 1)
@@ -0,0 +1,73 @@
+import os
+import subprocess
+import sys
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import interpolation_functions
+from curve_cache import CurveTableCache, evaluate_curve_table
+from curve_library import CurveLibrary, bake_library
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+@pytest.fixture
+def failing_function(monkeypatch):
+    """A registered function with no value at t = 0.5"""
+    monkeypatch.setitem(interpolation_functions.INTERPOLATION_FUNCTIONS, "Test Gap", lambda t: t / abs(t - 0.5))
+    monkeypatch.setattr(interpolation_functions, "FUNCTION_INFO", dict(interpolation_functions.FUNCTION_INFO))
+    return "Test Gap"
+
+def test_fallbacks_counted_on_every_lookup(failing_function):
+    cache = CurveTableCache()
+    table = cache.get(failing_function, 10)
+    assert table[5] == 0.5
+    assert cache.fallbacks == 1
+
+    cache.get(failing_function, 10)
+    assert (cache.hits, cache.fallbacks) == (1, 2)
+
+def test_analyzer_finds_where_a_function_fails(failing_function):
+    func = interpolation_functions.INTERPOLATION_FUNCTIONS[failing_function]
+    assert interpolation_functions.first_failure(func) == 0.5
+    assert interpolation_functions.first_failure(interpolation_functions.INTERPOLATION_FUNCTIONS["Linear"]) is None
+
+def test_library_leaves_fallback_rows_to_the_cache(failing_function, tmp_path):
+    bake_library(tmp_path, resolution=10)
+    cache = CurveTableCache()
+    cache.library = CurveLibrary.load(tmp_path)
+    assert cache.library.find("Ease Out Cubic", 10) is not None
+    assert cache.library.find(failing_function, 10) is None
+
+    cache.get(failing_function, 10)
+    cache.get(failing_function, 10)
+    assert cache.fallbacks == 2
+
+def test_library_find_strides_rows_and_matches_presets(tmp_path):
+    bake_library(tmp_path, resolution=12, presets={"default": {}, "reversed": {"reverse": True}})
+    library = CurveLibrary.load(tmp_path)
+
+    # Every 3rd entry of a 12 interval row is t = i / 4, exactly as evaluated
+    np.testing.assert_array_equal(library.find("Ease Out Cubic", 4), evaluate_curve_table("Ease Out Cubic", 4))
+    np.testing.assert_array_equal(library.find("Ease Out Cubic", 4, reverse=True),
+                                  evaluate_curve_table("Ease Out Cubic", 4, reverse=True))
+    assert library.find("Ease Out Cubic", 5) is None
+    assert library.find("Ease Out Cubic", 4, overshoot=2.0) is None
+
+    # Served straight from the mapped file
+    cache = CurveTableCache()
+    cache.library = library
+    assert np.shares_memory(cache.get("Ease Out Cubic", 6), library.data)
+
+def test_unchecked_library_reads_without_the_functions(tmp_path):
+    bake_library(tmp_path, resolution=10)
+    script = ("import sys, curve_library\n"
+              f"row = curve_library.CurveLibrary.load({str(tmp_path)!r}, check=False).table('Linear')\n"
+              "assert row[5] == 0.5\n"
+              "assert 'interpolation_functions' not in sys.modules and 'curve_cache' not in sys.modules\n")
+    subprocess.run([sys.executable, "-c", script], cwd=REPO_DIR, check=True)
+
+def test_overshoot_scales_the_part_past_one():
+    table = evaluate_curve_table("Back Out", 100)
+    assert table.max() > 1
+    assert evaluate_curve_table("Back Out", 100, overshoot=2.0).max() - 1 == pytest.approx(2 * (table.max() - 1))
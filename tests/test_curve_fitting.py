@@ -0,0 +1,34 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from curve_fitting import ADAPTIVE_CHECK_FACTOR, ADAPTIVE_RESOLUTION, adaptive_sample_indices, polyline_error
+from curve_cache import evaluate_curve_table
+from curve_kernel import BakeSettings, CurveBaker, keyframe_arrays
+
+def adaptive_bake(name, max_error):
+    baker = CurveBaker(BakeSettings(name, sampling_mode='ADAPTIVE', max_error=max_error))
+    keys, _ = baker.bake_fcurve(keyframe_arrays([0, 20], [0.0, 1.0]))
+    return baker, keys
+
+def test_adaptive_keys_checked_between_table_entries():
+    table = evaluate_curve_table("Vibrato", ADAPTIVE_RESOLUTION)
+    fine_table = evaluate_curve_table("Vibrato", ADAPTIVE_RESOLUTION * ADAPTIVE_CHECK_FACTOR)
+    indices = adaptive_sample_indices(table, 0.001, fine_table)
+    assert polyline_error(fine_table, indices, ADAPTIVE_CHECK_FACTOR) <= 0.001
+
+def test_smooth_curve_meets_max_error():
+    baker, _ = adaptive_bake("Ease Out Cubic", 0.001)
+    assert baker.counters["unmet_error"] == 0.0
+
+@pytest.mark.parametrize("name", ["Digital Noise", "Quantum Tunnel"])
+def test_unreachable_max_error_is_reported(name):
+    baker, keys = adaptive_bake(name, 0.001)
+
+    # The real error, measured between the keys on a much finer evaluation
+    t = np.linspace(0.0, 1.0, 64001)
+    fine = evaluate_curve_table(name, 64000)
+    fine[-1] = 1.0
+    error = np.max(np.abs(np.interp(t * 20, keys["co"][:, 0], keys["co"][:, 1]) - fine))
+    assert error > 0.001
+    assert baker.counters["unmet_error"] > 0.001
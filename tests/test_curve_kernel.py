@@ -0,0 +1,36 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import curve_kernel
+from curve_kernel import BakeSettings, CurveBaker, keyframe_arrays
+
+def bake(settings, frames, values, selected):
+    baker = CurveBaker(settings)
+    keys, segments = baker.bake_fcurve(keyframe_arrays(frames, values, selected))
+    return keys, segments, baker.counters
+
+@pytest.mark.parametrize("name", ["Ease Out Cubic", "Heartbeat ↺"])
+@pytest.mark.parametrize("sampling_mode", ['UNIFORM', 'ADAPTIVE'])
+def test_batched_segments_match_one_by_one(monkeypatch, name, sampling_mode):
+    rng = np.random.default_rng(1)
+    frames = np.cumsum(rng.integers(2, 30, 40)).astype(float)
+    values = rng.uniform(-5, 5, 40)
+    values[::7] = values[1::7][:len(values[::7])]  # some flat segments
+    selected = rng.random(40) < 0.8
+    settings = BakeSettings(name, samples=20, sampling_mode=sampling_mode, max_error=0.01)
+
+    batched = bake(settings, frames, values, selected)
+    monkeypatch.setattr(curve_kernel, "plan_samples", lambda *args: None)
+    one_by_one = bake(settings, frames, values, selected)
+
+    assert batched[1:] == one_by_one[1:]
+    for attr, array in batched[0].items():
+        np.testing.assert_array_equal(array, one_by_one[0][attr], err_msg=attr)
+
+def test_splice_replaces_ranges():
+    keys = keyframe_arrays([0, 1, 2, 3, 4, 5], [0, 1, 2, 3, 4, 5])
+    new_keys = keyframe_arrays([1.5, 3.25, 3.5], [10, 20, 30])
+    # keys 1 and 2 become one key, two keys go between 3 and 4 without removing any
+    spliced = curve_kernel.splice_keyframe_arrays(keys, [1, 4], [3, 4], new_keys, [1, 2])
+    np.testing.assert_array_equal(spliced["co"][:, 0], [0, 1.5, 3, 3.25, 3.5, 4, 5])
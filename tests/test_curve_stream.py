@@ -0,0 +1,33 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from curve_cache import evaluate_curve_table
+from curve_stream import export_curve, frame_count, stream_curve
+
+def test_chunks_join_up_to_one_pass():
+    chunks = list(stream_curve("Ease Out Cubic", 0, 100, 2.0, 7.0, chunk_size=7))
+    assert [len(frames) for frames, _ in chunks] == [7] * 14 + [3]
+
+    (whole_frames, whole_values), = stream_curve("Ease Out Cubic", 0, 100, 2.0, 7.0, chunk_size=1000)
+    np.testing.assert_array_equal(np.concatenate([frames for frames, _ in chunks]), whole_frames)
+    np.testing.assert_array_equal(np.concatenate([values for _, values in chunks]), whole_values)
+    np.testing.assert_allclose(whole_values, 2.0 + evaluate_curve_table("Ease Out Cubic", 100) * 5.0)
+
+def test_period_wraps_across_chunks():
+    frames, values = (np.concatenate(parts) for parts in zip(*stream_curve("Breath ↺", 0, 40, period=8, chunk_size=5)))
+    np.testing.assert_array_equal(frames, np.arange(41))
+    np.testing.assert_allclose(values[8:], values[:-8])
+
+def test_frame_count_keeps_an_end_frame_on_a_step():
+    assert frame_count(0, 1, 0.1) == 11
+    assert frame_count(0, 1.05, 0.1) == 11
+    assert frame_count(5, 4) == 0
+
+def test_export_writes_every_chunk(tmp_path):
+    path = tmp_path / "curve.npy"
+    assert export_curve(path, "Bounce Out", 0, 50, chunk_size=8) == 51
+    rows = np.load(path)
+    (frames, values), = stream_curve("Bounce Out", 0, 50)
+    np.testing.assert_array_equal(rows[:, 0], frames)
+    np.testing.assert_array_equal(rows[:, 1], values)
@@ -0,0 +1,22 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import node_compiler
+from node_compiler import T, UnsupportedExpression, evaluate_ir, make
+
+def test_round_halves_go_to_even():
+    ir = node_compiler.round_half_even(T)
+    t = np.array([-2.5, -1.5, -0.5, 0.5, 1.5, 2.5, 2.4, 2.6])
+    np.testing.assert_array_equal(evaluate_ir(ir, t), [round(value) for value in t])
+
+def test_verification_checks_round_ties(monkeypatch):
+    # Bit Crush is round(t*8)/8, halfway at odd sixteenths which the grid misses
+    t = np.arange(node_compiler.VERIFY_SAMPLES + 1) / node_compiler.VERIFY_SAMPLES
+    ties = node_compiler.round_tie_points(make("ROUND", make("MULTIPLY", T, node_compiler.const(8))), t)
+    assert 1 / 16 in ties and 15 / 16 in ties
+
+    monkeypatch.setattr(node_compiler, "compiled_functions", {})
+    monkeypatch.setattr(node_compiler, "round_half_even", lambda a: make("ROUND", a))
+    with pytest.raises(UnsupportedExpression):
+        node_compiler.compile_function("Bit Crush")
@@ -0,0 +1,48 @@
+import hashlib
+import os
+import pytest
+
+pytest.importorskip("PIL")
+pytest.importorskip("numpy")
+
+from generate_interp_previews import load_previous_atlas, stale_previews
+from interpolation_functions import INTERPOLATION_FUNCTIONS
+from interpolation_functions import code_fingerprint
+
+PREVIEW_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "interp_previews")
+
+def test_preview_manifest_up_to_date():
+    # Changing a function or the curve evaluation means rendering the previews again
+    assert stale_previews(PREVIEW_DIR) == []
+
+def test_atlas_tiles_match_manifest():
+    manifest, atlas = load_previous_atlas(PREVIEW_DIR)
+    assert manifest is not None
+    assert set(manifest["icons"]) == set(INTERPOLATION_FUNCTIONS)
+    assert tuple(manifest["size"]) == atlas.size
+
+    rects = [tuple(icon["rect"]) for icon in manifest["icons"].values()]
+    assert len(set(rects)) == len(rects)
+    for x, y, w, h in rects:
+        assert 0 <= x and x + w <= atlas.width and 0 <= y and y + h <= atlas.height
+
+    # Each tile's hash is of its pixels in the atlas
+    for name, icon in manifest["icons"].items():
+        x, y, w, h = icon["rect"]
+        tile = atlas.crop((x, y, x + w, y + h))
+        assert hashlib.sha1(tile.tobytes()).hexdigest()[:16] == icon["hash"], name
+
+def fingerprint(func):
+    digest = hashlib.sha1()
+    code_fingerprint(func, digest, set())
+    return digest.hexdigest()
+
+def test_fingerprint_reads_source_not_bytecode():
+    def doubled(t):
+        return t * 2
+
+    # Same source, different code object (as another Python version would compile it)
+    before = fingerprint(doubled)
+    doubled.__code__ = doubled.__code__.replace(co_consts=tuple(3 if const == 2 else const
+                                                               for const in doubled.__code__.co_consts))
+    assert fingerprint(doubled) == before
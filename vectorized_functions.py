@@ -0,0 +1,280 @@
+"""
+Vectorized Interpolation Functions
+NumPy twins of every curve in interpolation_functions.py
+
+Each entry takes an array of t values and returns an array of results,
+so a whole segment (or a whole preview) is evaluated in one call instead
+of calling a Python lambda once per sample.
+
+If you add a function to interpolation_functions.py, add its twin here too
+and run this file to check that both versions agree:
+
+    python vectorized_functions.py
+"""
+
+import sys
+import numpy as np
+
+# Works both inside the addon package and as a standalone script
+try:
+    from . import interpolation_functions
+except ImportError:
+    import interpolation_functions
+
+pi = np.pi
+sin = np.sin
+cos = np.cos
+exp = np.exp
+sqrt = np.sqrt
+floor = np.floor
+where = np.where
+
+# Helper functions that are reused (same as interpolation_functions.py)
+def noise(t):
+    """Simple pseudo-random noise based on sine"""
+    return sin(t * 12.9898) * 0.5 + 0.5
+
+def smoothstep(t):
+    return 3*t**2 - 2*t**3
+
+def bounce_out(t):
+    n1, d1 = 7.5625, 2.75
+    return np.select(
+        [t < 1/d1, t < 2/d1, t < 2.5/d1],
+        [n1*t*t, n1*(t-1.5/d1)**2 + 0.75, n1*(t-2.25/d1)**2 + 0.9375],
+        n1*(t-2.625/d1)**2 + 0.984375,
+    )
+
+# Piecewise curves use np.where / np.select: every branch is evaluated for
+# every t and the mask picks the right one, so branches that are invalid
+# outside their own range (sqrt of a negative...) are silenced by _guarded().
+_RAW_FUNCTIONS = {
+    # === SMOOTH & CLASSIC (15) ===
+    "Linear": lambda t: t + 0.0,
+    "Ease In Quad": lambda t: t**2,
+    "Ease Out Quad": lambda t: 1 - (1 - t)**2,
+    "Ease InOut Quad": lambda t: where(t<0.5, 2*t*t, 1-((-2*t+2)**2)/2),
+    "Ease In Cubic": lambda t: t**3,
+    "Ease Out Cubic": lambda t: 1 - (1 - t)**3,
+    "Ease InOut Cubic": lambda t: where(t<0.5, 4*t**3, 1-((-2*t+2)**3)/2),
+    "Ease In Quart": lambda t: t**4,
+    "Ease Out Quart": lambda t: 1 - (1 - t)**4,
+    "Ease InOut Quart": lambda t: where(t<0.5, 8*t**4, 1-((-2*t+2)**4)/2),
+    "Ease In Sine": lambda t: 1 - cos((t*pi)/2),
+    "Ease Out Sine": lambda t: sin((t*pi)/2),
+    "Ease InOut Sine": lambda t: -(cos(pi*t)-1)/2,
+    "Smoothstep": lambda t: 3*t**2 - 2*t**3,
+    "Smoother Step": lambda t: t**3 * (t * (t * 6 - 15) + 10),
+
+    # === ELASTIC & SPRINGY (12) ===
+    "Elastic Out": lambda t: 2**(-10*t)*sin((t*10 - 0.75)*2*pi/3)+1,
+    "Elastic In": lambda t: -2**(10*(t-1))*sin((t*10 - 10.75)*2*pi/3),
+    "Elastic InOut": lambda t: where(t<0.5, (-2**(10*(2*t-1))*sin((20*t-11.125)*pi/3))/2, (2**(-10*(2*t-1))*sin((20*t-11.125)*pi/3))/2+1),
+    "Rubberband": lambda t: 1 - cos(t*pi/2)*exp(-t*5),
+    "Spring Damped": lambda t: 1 - exp(-6*t)*cos(12*pi*t),
+    "Underdamped Spring": lambda t: 1 - exp(-3*t)*(cos(10*pi*t)+0.5*sin(10*pi*t)),
+    "Jelly Wobble": lambda t: sin(t**2*10*pi)*exp(-5*t)*(1-t) + t,
+    "Twang": lambda t: (1-t)**2 * sin(t*20*pi) * 0.3 + t,
+    "Vibrato": lambda t: t + 0.1*sin(50*pi*t)*exp(-8*t),
+    "String Pluck ↺": lambda t: sin(pi*t)*exp(-4*t**0.5),
+    "Suspension": lambda t: t - 0.15*sin(2*pi*t)*exp(-3*t),
+    "Springboard": lambda t: 1 - (1-t)*cos(15*pi*t)*exp(-5*t),
+
+    # === BOUNCY & OVERSHOOT (12) ===
+    "Back Out": lambda t: 1 + 2.70158*(t-1)**3 + 1.70158*(t-1)**2,
+    "Bounce Out": bounce_out,
+    "Overshoot": lambda t: t**3 - t*sin(t*pi),
+    "Recoil": lambda t: 1 - exp(-6*t)*cos(8*pi*t),
+    "Basketball Bounce ↺": lambda t: abs(sin(t*pi*4))*(1-t)**1.5,
+    "Trampolining ↺": lambda t: abs(sin(t*pi*2.5))*exp(-t*2),
+    "Pogo Stick": lambda t: 1 - abs(cos(t*pi*3))*(1-t)**2,
+    "Boing": lambda t: 1 - (1-t)**2 * abs(cos(t*pi*7)),
+    "Rubber Ball": lambda t: t + abs(sin(t*pi*6))*(1-t)**2*0.5,
+    "Yo-Yo": lambda t: t - 0.5*sin(t*pi*4)*(1-t),
+    "Slingshot": lambda t: t**2 * (3 - 2*t) + sin(t*pi*2)*0.1*(1-t),
+    "Catapult": lambda t: where(t<0.7, t, 0.7 + (t-0.7)*10 - 2*(t-0.7)**2),
+
+    # === EXPONENTIAL & POWER (10) ===
+    "Ease In Expo": lambda t: where(t==0, 0.0, 2**(10*(t-1))),
+    "Ease Out Expo": lambda t: where(t==1, 1.0, 1 - 2**(-10*t)),
+    "Ease InOut Expo": lambda t: where(t<0.5, (2**(20*t-10))/2, (2-2**(-20*t+10))/2),
+    "Ease In Circ": lambda t: 1 - sqrt(1 - t**2),
+    "Ease Out Circ": lambda t: sqrt(1 - (t-1)**2),
+    "Ease InOut Circ": lambda t: where(t<0.5, (1 - sqrt(1 - (2*t)**2))/2, (sqrt(1 - (-2*t+2)**2)+1)/2),
+    "Rocket Launch": lambda t: t**3 * exp(t*2),
+    "Parachute": lambda t: 1 - exp(-t*5),
+    "Gravity Fall": lambda t: 1 - (1-t)**2,
+    "Terminal Velocity": lambda t: 1 - exp(-t*3),
+
+    # === RHYTHMIC & WAVES (12) ===
+    "Sine Wave ↺": lambda t: 0.5*(1 - cos(2*pi*t)),
+    "Pulse ↺": lambda t: sin(8*pi*t)**2,
+    "Heartbeat ↺": lambda t: abs(sin(t*pi*2))**8 * (1 + sin(t*pi*4)*0.3),
+    "Breath ↺": lambda t: (sin(t*pi*2) + 1) / 2,
+    "Wave Crash": lambda t: sin(t*pi*0.5)**2 + 0.3*abs(sin(t*pi*8))*(1-t),
+    "Ripple": lambda t: t + sin(t*pi*8)*0.1*(1-t),
+    "Oscillate": lambda t: t + 0.1*sin(8*pi*t),
+    "Flutter": lambda t: t + sin(t*pi*20)*0.05*sin(t*pi),
+    "Shimmer": lambda t: t + sin(t*pi*15)*0.03*(sin(t*pi*3)+1),
+    "Tremolo": lambda t: t * (1 + 0.1*sin(t*pi*30)),
+    "Warble": lambda t: t + 0.08*sin(t**2*50),
+    "Gallop": lambda t: t + 0.15*abs(sin(t*pi*3))*sin(t*pi*9),
+
+    # === ORGANIC & NATURAL (10) ===
+    "Leaf Fall": lambda t: t + 0.1*sin(t*pi*3)*cos(t*pi*5),
+    "Butterfly": lambda t: t + 0.15*sin(t*pi*6)*sin(t*pi*2),
+    "Seaweed Sway": lambda t: t + 0.1*sin(t*pi*2)*cos(t*pi*1.3),
+    "Bird Hop": lambda t: t + abs(sin(t*pi*4))*0.2*(1-abs(2*t-1)),
+    "Fish Swim": lambda t: t + 0.15*sin(t*pi*8)*exp(-t*2),
+    "Snake Slither": lambda t: t + 0.1*sin(t*pi*10)*sin(t*pi*3),
+    "Jellyfish": lambda t: t + 0.2*sin(t*pi*4)**2*cos(t*pi*2),
+    "Muscle Twitch": lambda t: t + 0.1*abs(sin(t*pi*25))*exp(-t*8),
+    "Growing Vine": lambda t: t**1.5 + 0.05*sin(t*pi*20)*(1-t),
+    "Melting": lambda t: t**0.5 + (t**3)*0.5,
+
+    # === GLITCHY & DIGITAL (10) ===
+    "Stutter": lambda t: floor(t*10)/10,
+    "Pixelate": lambda t: floor(t*20)/20,
+    "Bit Crush": lambda t: np.round(t*8)/8,
+    "Glitch": lambda t: t + 0.05*floor(10*t)/10,
+    "Static": lambda t: t + (noise(t*50)-0.5)*0.1,
+    "Screen Tear": lambda t: where(t<0.5, t, 0.5 + (t-0.5)*1.2),
+    "Lag Spike": lambda t: where(t<0.8, t*0.9, 0.72 + (t-0.8)*5),
+    "Frame Drop": lambda t: t - 0.05*floor(t*15),
+    "Digital Noise": lambda t: t + (sin(t*1000)**2 - 0.5)*0.05,
+    "Packet Loss": lambda t: t * (1 + 0.1*floor(sin(t*50))),
+
+    # === EXTREME & WILD (10) ===
+    "Explosion": lambda t: t**5 * (10 - 9*t),
+    "Implosion": lambda t: 1 - (1-t)**5 * (10 - 9*(1-t)),
+    "Quantum Tunnel": lambda t: abs(sin(1/(t+0.01)))*0.3 + t*0.7,
+    "Wormhole": lambda t: t + sin(50*t)*cos(30*t)*0.1*(1-abs(2*t-1)),
+    "Black Hole": lambda t: 1 - exp(-t*5)*cos(t*20*pi),
+    "Time Warp": lambda t: t + 0.3*sin(t*pi)*sin(1/(t+0.1)),
+    "Chaos Theory": lambda t: t + sin(10*t)*cos(7*t)*sin(13*t)*0.1,
+    "Fractal": lambda t: t + 0.05*sin(t) + 0.025*sin(2*t) + 0.0125*sin(4*t),
+    "Lightning": lambda t: t + abs(noise(t*20)-0.5)*0.3*exp(-t*5),
+    "Earthquake": lambda t: t + (noise(t*15)-0.5)*0.15*abs(sin(t*pi*3)),
+
+    # === MECHANICAL & ROBOTIC (9) ===
+    "Gear Turn": lambda t: floor(t*8)/8 + (t*8 - floor(t*8))**2 * 0.125,
+    "Piston": lambda t: (floor(t*4)/4 + smoothstep((t*4)%1)*0.25),
+    "Ratchet": lambda t: where(t%0.1<0.05, t + abs(sin(t*pi*10))*0.05, t),
+    "Conveyor Belt": lambda t: t + 0.02*sin(t*pi*20),
+    "Pneumatic": lambda t: smoothstep(t) + 0.1*exp(-t*10)*sin(t*50*pi),
+    "Hydraulic": lambda t: t**2 * (3-2*t) * (1 + 0.05*sin(t*pi*15)),
+    "Motor Spin-Up": lambda t: 1 - exp(-t*5) * (1 + 0.1*sin(t*30*pi)),
+    "Clutch Engage": lambda t: where(t<0.3, 0.0, (t-0.3)/0.7),
+    "Brake": lambda t: where(t<0.7, t, 0.7 + (t-0.7)*0.3),
+
+    # === COMPLEX STORIES (40) ===
+    "Balloon Rise Fall ↺": lambda t: np.select(
+        [t<0.8, (1-(t-0.8)*5)>0],
+        [sin(t*pi*0.5)**2 * (1 + 0.1*sin(t*pi*4)), (1-(t-0.8)*5)**2],
+        0.0),
+    "Rocket Launch Crash ↺": lambda t: where(t<0.6, t**2*3, 1.8 - (t-0.6)**2*11),
+    "Jump and Land ↺": lambda t: where(t>0, (-4*(t-0.5)**2 + 1) * 1.2, 0.0),
+    "Throw and Catch ↺": lambda t: (-16*(t-0.5)**2 + 4) * 0.25 + 0.05*sin(t*pi*15)*(1-abs(2*t-1)),
+    "Toss Up Drop ↺": lambda t: where(t<0.5, t*2, 2*(1-t)),
+    "Peak and Plummet ↺": lambda t: where(t<0.5, smoothstep(t*2), 1-(t-0.5)*2),
+    "Climb and Slide ↺": lambda t: where(t<0.7, t**0.5, 0.7**0.5 * (1-(t-0.7)*3)),
+    "Inflate Deflate ↺": lambda t: sin(t*pi)**2,
+    "Swell and Pop ↺": lambda t: where(t<0.8, (1-cos(t*pi*1.2))/2, 0.1*exp(-(t-0.8)*20)),
+    "Rise Hover Fall ↺": lambda t: np.select([t<0.4, t<0.7], [smoothstep(t*2.5), 1.0], 1-(t-0.7)**2*10),
+    "Ocean Wave ↺": lambda t: 0.5*sin(t*pi*2) + 0.3*sin(t*pi*5) + 0.5,
+    "Tide In Out ↺": lambda t: 0.5 - 0.5*cos(t*pi*2) + 0.1*sin(t*pi*8),
+    "Breathing Cycle ↺": lambda t: 0.4 + 0.4*sin(t*pi*2) + 0.2*sin(t*pi*4),
+    "Circadian Rhythm ↺": lambda t: 0.5 + 0.5*sin(t*pi*2 - pi/2) + 0.1*noise(t*3),
+    "Seasons Cycle ↺": lambda t: 0.5 - 0.5*cos(t*pi*2) + 0.15*sin(t*pi*8),
+    "Day Night ↺": lambda t: where(t<0.5, 0.5 + 0.5*sin(t*pi*2), 0.5 - 0.5*sin((t-0.5)*pi*2)),
+    "Lunar Cycle ↺": lambda t: abs(sin(t*pi)) * (1 + 0.1*noise(t*10)),
+    "Pulse Wave ↺": lambda t: where((t*8)%1 < 0.3, 1.0, 0.2),
+    "Wind Up Release": lambda t: where(t<0.7, t**4, 1 + (t-0.7)**2*3),
+    "Charge Discharge": lambda t: where(t<0.6, t**3, 1 - (t-0.6)**0.5),
+    "Tension Snap": lambda t: where(t<0.8, t*0.2, 0.16 + (t-0.8)*4),
+    "Compress Explode ↺": lambda t: where(t<0.5, -t**2*0.3, (t-0.5)**2*4),
+    "Inhale Exhale ↺": lambda t: where(t<0.5, smoothstep(t*2), smoothstep(2-t*2)),
+    "Squeeze Release ↺": lambda t: where(t<0.5, 1-t, (t-0.5)*2),
+    "Build Crescendo": lambda t: where(t<0.7, t**2, 0.49 + (t-0.7)**3*5),
+    "Anticipation Strike": lambda t: where(t<0.3, -0.2*(1-t)**2, ((t-0.3)/0.7)**2),
+    "Recoil Forward": lambda t: where(t<0.2, -0.3*smoothstep((1-t)*2), ((t-0.2)/0.8)),
+    "Flower Bloom": lambda t: (t**0.5) * (1 + 0.05*sin(t*pi*10)),
+    "Seed Sprout": lambda t: where(t<0.2, 0.0, ((t-0.2)/0.8)**2),
+    "Tree Sway ↺": lambda t: 0.5 + 0.5*sin(t*pi*3) * cos(t*pi*1.7),
+    "Butterfly Flutter": lambda t: 0.5 + 0.5*sin(t*pi*8) + 0.2*abs(sin(t*pi*2)),
+    "Bird Take Off": lambda t: (1-exp(-t*5)) * (1 + 0.3*abs(sin(t*pi*15))),
+    "Firefly Blink ↺": lambda t: exp(-((t*10-5)**2)/2) + 0.3*exp(-((t*10-2)**2)/1),
+    "Spider Drop ↺": lambda t: np.select(
+        [t<0.3, t<0.6],
+        [0.0, smoothstep((t-0.3)*2.5)],
+        (0.75 - (t-0.6)*sin((t-0.6)*40))),
+    "Frog Jump ↺": lambda t: where((0.2<t) & (t<0.5), (-4*(t-0.3)**2 + 0.36)*5, 0.0),
+    "Joy to Sad": lambda t: 1 - t**2,
+    "Surprise Shock ↺": lambda t: np.select([t<0.3, t<0.5], [0.0, exp(-(t-0.3)*10)], 0.5*exp(-(t-0.5)*3)),
+    "Anticipation Peak": lambda t: where(t<0.5, t**3*2, 2 - (1-t)**2*2),
+    "Calm to Panic": lambda t: t + (t**2)*2 + abs(sin(t*pi*20))*t**2,
+    "Meditation Wave ↺": lambda t: 0.5 + 0.3*sin(t*pi*2) * exp(-t*0.5),
+    "Laughter Fit": lambda t: abs(sin(t*pi*12)) * (1-exp(-t*3)),
+}
+
+def _guarded(func):
+    """Wrap a raw vectorized curve so it always takes and returns float64 arrays"""
+    def evaluate(t):
+        t = np.asarray(t, dtype=np.float64)
+        with np.errstate(all='ignore'):
+            return np.broadcast_to(func(t), t.shape).astype(np.float64)
+    evaluate.__name__ = getattr(func, "__name__", "evaluate")
+    return evaluate
+
+# All vectorized functions, same keys as INTERPOLATION_FUNCTIONS
+VECTORIZED_FUNCTIONS = {name: _guarded(func) for name, func in _RAW_FUNCTIONS.items()}
+
+def check_vectorized_functions(samples=10001, tolerance=1e-9):
+    """Compare scalar and vectorized outputs on a dense grid over [0, 1]
+
+    Returns a dict of {name: problem description} for every function that is
+    missing a twin or disagrees with its scalar version. Empty means all good.
+    """
+    scalar_functions = interpolation_functions.INTERPOLATION_FUNCTIONS
+    t_values = np.linspace(0.0, 1.0, samples)
+    problems = {}
+
+    for name, func in scalar_functions.items():
+        vector_func = VECTORIZED_FUNCTIONS.get(name)
+        if vector_func is None:
+            problems[name] = "missing from VECTORIZED_FUNCTIONS"
+            continue
+
+        expected = np.empty(samples)
+        for i, t in enumerate(t_values.tolist()):
+            try:
+                expected[i] = func(t)
+            except Exception:
+                # The operator falls back to linear here, so NaN is accepted
+                expected[i] = np.nan
+
+        actual = vector_func(t_values)
+        if actual.shape != expected.shape:
+            problems[name] = f"wrong output shape {actual.shape}"
+            continue
+
+        same = np.isclose(actual, expected, rtol=tolerance, atol=tolerance, equal_nan=True)
+        if not same.all():
+            worst = int(np.argmax(np.where(same, 0.0, np.abs(actual - expected) + 1.0)))
+            problems[name] = (f"{np.count_nonzero(~same)} mismatches, e.g. t={t_values[worst]:.6f}: "
+                              f"scalar={expected[worst]!r} vector={actual[worst]!r}")
+
+    for name in VECTORIZED_FUNCTIONS:
+        if name not in scalar_functions:
+            problems[name] = "not in INTERPOLATION_FUNCTIONS"
+
+    return problems
+
+if __name__ == "__main__":
+    problems = check_vectorized_functions()
+    print(f"Checked {len(interpolation_functions.INTERPOLATION_FUNCTIONS)} functions")
+    for name, problem in problems.items():
+        print(f"✗ {name}: {problem}")
+    if problems:
+        sys.exit(1)
+    print("✓ All vectorized functions match their scalar versions")